@@ -0,0 +1,35 @@
+# Pre-fork settings for `gunicorn student_performance.wsgi -c gunicorn.conf.py`.
+# The master imports the app and loads the model once; forked workers share
+# those pages copy-on-write and memory-map the compiled model arrays.
+import logging
+import os
+
+os.environ.setdefault("MODEL_ARRAYS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_arrays"))
+
+preload_app = True
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+
+
+def when_ready(server):
+    from django.db import connections
+
+    from predictions.prefork import freeze_shared_state
+
+    # Warm-up opened a database connection in the master; workers open their own.
+    connections.close_all()
+    freeze_shared_state()
+
+
+def post_fork(server, worker):
+    from predictions.prefork import process_memory
+    from predictions.services import prime_connections
+
+    prime_connections()
+
+    usage = process_memory() or {}
+    logging.getLogger("gunicorn.error").info(
+        "Worker %s forked: RSS %.1f MiB, private %.1f MiB",
+        worker.pid,
+        usage.get("Rss", 0) / 1024,
+        usage.get("Private", 0) / 1024,
+    )
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import ContactMessage, ExamQuestion, ExamResult, ExamSubject, StudentPrediction
+from .models import ApiToken, ContactMessage, ExamAttempt, ExamQuestion, ExamResult, ExamSubject, StudentPrediction
 
 
 @admin.register(StudentPrediction)
@@ -28,14 +28,21 @@ class ContactMessageAdmin(admin.ModelAdmin):
 
 @admin.register(ExamQuestion)
 class ExamQuestionAdmin(admin.ModelAdmin):
-    list_display = ("text", "subject", "correct_option", "points", "is_active")
-    list_filter = ("is_active", "subject")
+    list_display = ("text", "subject", "correct_option", "points", "difficulty", "is_active")
+    list_filter = ("is_active", "difficulty", "subject")
     search_fields = ("text",)
 
 
 @admin.register(ExamSubject)
 class ExamSubjectAdmin(admin.ModelAdmin):
-    list_display = ("name", "time_limit_minutes", "pass_percentage", "negative_marking", "is_active")
+    list_display = (
+        "name",
+        "time_limit_minutes",
+        "pass_percentage",
+        "negative_marking",
+        "questions_per_attempt",
+        "is_active",
+    )
     list_filter = ("is_active",)
     search_fields = ("name",)
 
@@ -45,3 +52,19 @@ class ExamResultAdmin(admin.ModelAdmin):
     list_display = ("user", "subject", "score", "percentage", "passed", "created_at")
     list_filter = ("passed", "created_at", "subject")
     search_fields = ("user__username", "user__email", "subject__name")
+
+
+@admin.register(ExamAttempt)
+class ExamAttemptAdmin(admin.ModelAdmin):
+    list_display = ("user", "subject", "started_at", "deadline", "saved_at", "submitted_at")
+    list_filter = ("subject", "submitted_at")
+    search_fields = ("user__username", "token")
+    readonly_fields = ("token", "answers", "revision")
+
+
+@admin.register(ApiToken)
+class ApiTokenAdmin(admin.ModelAdmin):
+    list_display = ("user", "name", "is_active", "created_at")
+    list_filter = ("is_active",)
+    search_fields = ("user__username", "name")
+    readonly_fields = ("key",)
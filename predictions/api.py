@@ -0,0 +1,125 @@
+import json
+
+from django.conf import settings
+from django.db import transaction
+from django.http import JsonResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from .counters import record_predictions
+from .forms import clean_prediction_data
+from .models import ApiToken, StudentPrediction
+from .services import run_prediction, run_predictions
+from .utils import is_rate_limited
+
+
+def _token_user(request):
+    header = request.META.get("HTTP_AUTHORIZATION", "")
+    scheme, _, key = header.partition(" ")
+    if scheme.lower() not in {"token", "bearer"} or not key.strip():
+        return None
+    token = (
+        ApiToken.objects.select_related("user")
+        .filter(key=key.strip(), is_active=True, user__is_active=True)
+        .first()
+    )
+    return token.user if token else None
+
+
+def _csrf_failure(request):
+    # Session-authenticated callers still need a CSRF token, as the HTML form does.
+    check = CsrfViewMiddleware(lambda req: None)
+    check.process_request(request)
+    return check.process_view(request, None, (), {})
+
+
+def _error(message, status):
+    return JsonResponse({"error": message}, status=status)
+
+
+@csrf_exempt
+@require_POST
+def predict(request):
+    if request.META.get("HTTP_AUTHORIZATION"):
+        user = _token_user(request)
+        if user is None:
+            return _error("Invalid API token.", 401)
+        request.user = user
+    elif not request.user.is_authenticated:
+        return _error("Authentication required.", 401)
+    elif _csrf_failure(request) is not None:
+        return _error("CSRF verification failed.", 403)
+
+    if is_rate_limited(request, "api_predict", limit=settings.API_RATE_LIMIT, window=300):
+        return _error("Too many prediction requests. Please wait a few minutes.", 429)
+
+    try:
+        payload = json.loads(request.body or b"null")
+    except (ValueError, UnicodeDecodeError):
+        return _error("Request body must be JSON.", 400)
+
+    many = isinstance(payload, list)
+    items = payload if many else [payload]
+    if not items or not all(isinstance(item, dict) for item in items):
+        return _error("Send a JSON object or a non-empty array of objects.", 400)
+    if len(items) > settings.API_MAX_BATCH:
+        return _error(f"At most {settings.API_MAX_BATCH} records per request.", 400)
+    # Requests and records are limited separately, so a batch cannot multiply the request budget.
+    if is_rate_limited(
+        request, "api_predict_records", limit=settings.API_RECORD_RATE_LIMIT, window=300, cost=len(items)
+    ):
+        return _error("Too many records predicted. Please wait a few minutes.", 429)
+
+    persist = request.GET.get("persist") == "1"
+    cleaned_items = []
+    results = []
+    for index, item in enumerate(items):
+        cleaned, errors = clean_prediction_data(item)
+        if errors:
+            results.append({"index": index, "errors": errors})
+        else:
+            cleaned_items.append((index, cleaned))
+            results.append({"index": index})
+
+    version = None
+    try:
+        if not many and cleaned_items:
+            outcome = run_prediction(cleaned_items[0][1])
+        elif cleaned_items:
+            outcome = run_predictions([cleaned for _, cleaned in cleaned_items])
+    except Exception:
+        return _error("Prediction service unavailable. Please try again.", 503)
+
+    if cleaned_items:
+        version = outcome.model_version
+    for position, (index, _) in enumerate(cleaned_items):
+        results[index]["label"] = outcome.labels[position]
+        results[index]["confidence"] = outcome.confidences[position]
+        results[index]["model_version"] = version
+
+    if persist and cleaned_items:
+        with transaction.atomic():
+            records = StudentPrediction.objects.bulk_create(
+                [
+                    StudentPrediction(
+                        user=request.user,
+                        prediction=results[index]["label"],
+                        confidence=results[index]["confidence"],
+                        model_version=version,
+                        **cleaned,
+                    )
+                    for index, cleaned in cleaned_items
+                ]
+            )
+            record_predictions(records)
+        # MySQL does not return primary keys from bulk inserts.
+        for (index, _), record in zip(cleaned_items, records):
+            if record.pk is not None:
+                results[index]["id"] = record.pk
+
+    if not many:
+        result = results[0]
+        result.pop("index")
+        return JsonResponse(result, status=400 if "errors" in result else 200)
+    return JsonResponse({"model_version": version, "results": results})
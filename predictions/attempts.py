@@ -0,0 +1,210 @@
+from dataclasses import dataclass, field, replace
+from datetime import timedelta
+from functools import lru_cache
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models import F, Func, JSONField, Value
+from django.utils import timezone
+
+from .grading import OPTION_CODES, pack_ids, unpack_ids
+from .models import ExamAttempt
+
+# Cache entries outlive the deadline by this much, so late submissions still hit the cache.
+CACHE_SLACK_SECONDS = 3600
+
+
+@dataclass(frozen=True)
+class Attempt:
+    id: int
+    token: str
+    user_id: int
+    subject_id: int
+    # Drawn question ids, or None for the subject's whole bank.
+    question_ids: tuple
+    # {"<question_id>": option} as autosaved so far.
+    answers: dict
+    revision: int
+    started_at: float
+    deadline: float
+    # Answer changes (cleared ones as "") not yet written to the table, and when it was last written.
+    pending: dict = field(default_factory=dict)
+    flushed_at: float = 0.0
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.time())
+
+    def expired(self, grace=0):
+        return time.time() > self.deadline + grace
+
+
+def _from_row(row):
+    return Attempt(
+        id=row.pk,
+        token=row.token,
+        user_id=row.user_id,
+        subject_id=row.subject_id,
+        question_ids=tuple(unpack_ids(row.question_ids)) if row.question_ids else None,
+        answers=dict(row.answers),
+        revision=row.revision,
+        started_at=row.started_at.timestamp(),
+        deadline=row.deadline.timestamp(),
+        flushed_at=time.time(),
+    )
+
+
+class MergePatch(Func):
+    """RFC 7396 merge of a JSON object into a JSON column; null values delete keys."""
+
+    function = "JSON_MERGE_PATCH"
+    output_field = JSONField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, function="json_patch", **extra_context)
+
+
+def clean_answers(answers, question_ids=None):
+    """
+    ``{"<question_id>": option}`` from submitted answers. As in grading, only
+    exactly A-D is an answer; any other string (including "a" or "A ")
+    leaves the question unanswered. Raises ValueError on non-string options
+    and on questions outside ``question_ids`` when given.
+    """
+    if not isinstance(answers, dict):
+        raise ValueError("answers must be an object of question ids to options.")
+    allowed = None if question_ids is None else set(question_ids)
+    cleaned = {}
+    for question_id, option in answers.items():
+        question_id = str(question_id)
+        if not question_id.isdigit() or (allowed is not None and int(question_id) not in allowed):
+            raise ValueError(f"Unknown question {question_id}.")
+        option = "" if option is None else option
+        if not isinstance(option, str):
+            raise ValueError(f"Invalid option for question {question_id}.")
+        cleaned[question_id] = option if option in OPTION_CODES else ""
+    return cleaned
+
+
+class AttemptStore:
+    """
+    Exams in progress, read from a Django cache and written through to the
+    ExamAttempt table. Autosaves update the cached attempt and collect their
+    changes; every ``flush_seconds`` (and before submission) the collected
+    changes are merged into the row's answers by the database, so only the
+    changed keys are written and concurrent writers never overwrite each
+    other. A cache miss reloads the row, losing at most the changes since the
+    last flush. With ``alias=None`` there is no cache: every read loads the
+    row and every autosave is written.
+    """
+
+    def __init__(self, alias="default", flush_seconds=0):
+        self.alias = alias
+        self.flush_seconds = flush_seconds if alias else 0
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def _key(self, token):
+        # Versioned with the Attempt fields, so entries cached before a change reload.
+        return f"exam:attempt:2:{token}"
+
+    def _store(self, attempt):
+        if not self.alias:
+            return attempt
+        timeout = int(attempt.deadline - time.time()) + CACHE_SLACK_SECONDS
+        if timeout > 0:
+            self.cache.set(self._key(attempt.token), attempt, timeout)
+        return attempt
+
+    def start(self, user_id, subject, question_ids=None):
+        now = timezone.now()
+        row = ExamAttempt.objects.create(
+            user_id=user_id,
+            subject_id=subject.id,
+            token=uuid.uuid4().hex,
+            question_ids=b"" if question_ids is None else pack_ids(question_ids),
+            started_at=now,
+            deadline=now + timedelta(minutes=subject.time_limit_minutes),
+        )
+        return self._store(_from_row(row))
+
+    def load(self, token):
+        """The open attempt as stored in the table, refreshing the cache."""
+        row = ExamAttempt.objects.filter(token=token, submitted_at__isnull=True).first() if token else None
+        return self._store(_from_row(row)) if row else None
+
+    def get(self, token):
+        """The open attempt with ``token``, or ``None``."""
+        if not token:
+            return None
+        return (self.alias and self.cache.get(self._key(token))) or self.load(token)
+
+    def _write(self, attempt, changes):
+        patch = {question_id: option or None for question_id, option in changes.items()}
+        return ExamAttempt.objects.filter(pk=attempt.id, submitted_at__isnull=True).update(
+            answers=MergePatch("answers", Value(patch, output_field=JSONField())),
+            revision=F("revision") + 1,
+            saved_at=timezone.now(),
+        )
+
+    def save_answers(self, attempt, delta):
+        """
+        Apply cleaned answer changes to the cached attempt, writing them (with
+        any still pending) to the table once ``flush_seconds`` have passed
+        since the last write. Returns the updated attempt, or ``None`` once the
+        attempt has been submitted.
+        """
+        answers = {**attempt.answers, **delta}
+        answers = {question_id: option for question_id, option in answers.items() if option}
+        pending = {**attempt.pending, **delta}
+        flushed_at = attempt.flushed_at
+        if time.time() - flushed_at >= self.flush_seconds:
+            if not self._write(attempt, pending):
+                return None
+            pending, flushed_at = {}, time.time()
+        return self._store(
+            replace(attempt, answers=answers, pending=pending, flushed_at=flushed_at, revision=attempt.revision + 1)
+        )
+
+    def flush(self, attempt):
+        """Write pending changes and return the attempt as stored, or ``None`` once submitted."""
+        if attempt.pending:
+            self._write(attempt, attempt.pending)
+        return self.load(attempt.token)
+
+    def _forget(self, attempt):
+        if not self.alias:
+            return
+        key = self._key(attempt.token)
+        self.cache.delete(key)
+        # A concurrent reader may re-cache the row before this commits.
+        transaction.on_commit(lambda: self.cache.delete(key))
+
+    def finish(self, attempt):
+        """Close the attempt; False if it was already submitted. Call inside the result's transaction."""
+        closed = ExamAttempt.objects.filter(pk=attempt.id, submitted_at__isnull=True).update(
+            submitted_at=timezone.now()
+        )
+        self._forget(attempt)
+        return bool(closed)
+
+    def discard(self, attempt):
+        """Delete an open attempt that can no longer be graded."""
+        ExamAttempt.objects.filter(pk=attempt.id, submitted_at__isnull=True).delete()
+        self._forget(attempt)
+
+
+@lru_cache(maxsize=1)
+def get_attempts():
+    alias = settings.EXAM_ATTEMPT_CACHE_ALIAS
+    # A per-process cache would serve each worker its own stale copy of an
+    # attempt another worker has saved since; read the table instead.
+    if alias and isinstance(caches[alias], (LocMemCache, DummyCache)):
+        alias = None
+    return AttemptStore(alias, settings.EXAM_AUTOSAVE_FLUSH_SECONDS)
@@ -0,0 +1,155 @@
+from collections import Counter
+from concurrent.futures import Future
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from .inference import InferenceResult
+
+QUEUE_DELAY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 20, 50, 100, 250)
+
+
+class BatchStats:
+    """Batch-size distribution and queueing delay of a MicroBatcher."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self):
+        self.batches = 0
+        self.rows = 0
+        self.batch_sizes = Counter()
+        self.delay_buckets = [0] * (len(QUEUE_DELAY_BUCKETS_MS) + 1)
+        self.delay_total = 0.0
+        self.delay_max = 0.0
+
+    def reset(self):
+        with self._lock:
+            self._clear()
+
+    def record(self, delays):
+        with self._lock:
+            self.batches += 1
+            self.rows += len(delays)
+            self.batch_sizes[len(delays)] += 1
+            for delay in delays:
+                milliseconds = delay * 1000
+                bucket = 0
+                while bucket < len(QUEUE_DELAY_BUCKETS_MS) and milliseconds > QUEUE_DELAY_BUCKETS_MS[bucket]:
+                    bucket += 1
+                self.delay_buckets[bucket] += 1
+                self.delay_total += delay
+                self.delay_max = max(self.delay_max, delay)
+
+    def snapshot(self):
+        with self._lock:
+            labels = [f"<={bound}ms" for bound in QUEUE_DELAY_BUCKETS_MS] + [
+                f">{QUEUE_DELAY_BUCKETS_MS[-1]}ms"
+            ]
+            return {
+                "batches": self.batches,
+                "rows": self.rows,
+                "mean_batch_size": round(self.rows / self.batches, 2) if self.batches else 0,
+                "batch_sizes": dict(sorted(self.batch_sizes.items())),
+                "queue_delay_ms": {
+                    "mean": round(self.delay_total / self.rows * 1000, 3) if self.rows else 0,
+                    "max": round(self.delay_max * 1000, 3),
+                    "buckets": dict(zip(labels, self.delay_buckets)),
+                },
+            }
+
+
+class _Pending:
+    __slots__ = ("engine", "row", "future", "enqueued")
+
+    def __init__(self, engine, row):
+        self.engine = engine
+        self.row = row
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+
+
+class MicroBatcher:
+    """
+    Collects encoded rows from concurrent requests and scores them together.
+
+    A background thread flushes the queue once ``max_batch_size`` rows are
+    waiting or the oldest row has waited ``max_wait_ms``. Each row is scored by
+    the InferenceEngine that encoded it, so a model swap never mixes encodings.
+    """
+
+    def __init__(self, max_batch_size=32, max_wait_ms=2.0):
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000
+        self.stats = BatchStats()
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._worker = None
+
+    def _ensure_worker(self):
+        # Threads do not survive fork, so each worker process starts its own.
+        if self._pid == os.getpid() and self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._pid != os.getpid() or self._worker is None or not self._worker.is_alive():
+                self._pid = os.getpid()
+                self._queue = queue.SimpleQueue()
+                self._worker = threading.Thread(
+                    target=self._run, args=(self._queue,), name="prediction-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def submit(self, engine, row):
+        self._ensure_worker()
+        pending = _Pending(engine, row)
+        self._queue.put(pending)
+        return pending.future
+
+    def predict(self, engine, row, timeout=None):
+        return self.submit(engine, row).result(timeout=timeout)
+
+    def _run(self, pending_queue):
+        while True:
+            batch = [pending_queue.get()]
+            deadline = batch[0].enqueued + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    if remaining <= 0:
+                        batch.append(pending_queue.get_nowait())
+                    else:
+                        batch.append(pending_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            engines = {}
+            for pending in batch:
+                engines.setdefault(id(pending.engine), []).append(pending)
+            for group in engines.values():
+                self._flush(group)
+
+    def _flush(self, batch):
+        engine = batch[0].engine
+        started = time.perf_counter()
+        delays = [started - pending.enqueued for pending in batch]
+        try:
+            labels, confidences = engine.score(np.vstack([pending.row for pending in batch]))
+        except Exception as exc:
+            for pending in batch:
+                pending.future.set_exception(exc)
+            return
+        elapsed = time.perf_counter() - started
+        self.stats.record(delays)
+        for index, pending in enumerate(batch):
+            pending.future.set_result(
+                InferenceResult(
+                    labels=[labels[index]],
+                    confidences=[confidences[index]],
+                    timings={"queue": delays[index], "estimator": elapsed},
+                    model_version=engine.version,
+                )
+            )
@@ -0,0 +1,457 @@
+from dataclasses import dataclass
+from itertools import cycle
+import json
+import os
+import platform
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, RequestFactory, override_settings
+
+from .counters import reconcile
+from .models import ExamQuestion, ExamSubject, StudentPrediction
+from .pagination import encode_cursor
+from .ratelimit import ALGORITHMS, CacheRateLimitBackend, RateLimiter, SQLiteRateLimitBackend
+from .synthetic import random_form_batch
+
+BENCHMARK_SUBJECT = "Benchmark"
+USER_PASSWORD = "benchmark-password"
+
+
+@dataclass
+class Case:
+    name: str
+    factory: object
+    number: int = 20
+
+
+CASES = []
+
+
+def case(name, number=20):
+    def register(factory):
+        CASES.append(Case(name, factory, number))
+        return factory
+
+    return register
+
+
+class BenchmarkData:
+    """Seeds the (test) database and keeps handles the cases need."""
+
+    def __init__(self, rows, questions, users=100, seed=0, workdir="."):
+        self.rows = rows
+        self.workdir = workdir
+        self.question_count = questions
+        self.user_count = users
+        self.seed = seed
+        self.records = random_form_batch(2000, seed=seed)
+
+    def seed_database(self, batch_size=10000):
+        User = get_user_model()
+        self.staff = User.objects.create_user("bench-staff", password=USER_PASSWORD, is_staff=True)
+        User.objects.bulk_create(
+            [User(username=f"bench-user-{index}", password="!") for index in range(self.user_count)]
+        )
+        users = list(User.objects.filter(username__startswith="bench-user-").values_list("pk", flat=True))
+        # The busiest user owns a tenth of the rows, the rest are spread evenly.
+        self.heavy_user = User.objects.get(pk=users[0])
+
+        rng = random.Random(self.seed)
+        created = 0
+        while created < self.rows:
+            size = min(batch_size, self.rows - created)
+            batch = []
+            for offset in range(size):
+                index = created + offset
+                data = self.records[index % len(self.records)]
+                batch.append(
+                    StudentPrediction(
+                        user_id=users[0] if index % 10 == 0 else rng.choice(users),
+                        prediction="PASS" if rng.random() < 0.6 else "FAIL",
+                        confidence=round(rng.random(), 4),
+                        **data,
+                    )
+                )
+            StudentPrediction.objects.bulk_create(batch)
+            created += size
+
+        self.subject = ExamSubject.objects.create(name=BENCHMARK_SUBJECT, time_limit_minutes=600)
+        ExamQuestion.objects.bulk_create(
+            [
+                ExamQuestion(
+                    subject=self.subject,
+                    text=f"Benchmark question {index}",
+                    option_a="A",
+                    option_b="B",
+                    option_c="C",
+                    option_d="D",
+                    correct_option=rng.choice("ABCD"),
+                    points=rng.randint(1, 3),
+                )
+                for index in range(self.question_count)
+            ],
+            batch_size=1000,
+        )
+        # bulk_create skips the signals that maintain the counters.
+        reconcile()
+
+        answers = {}
+        for question in ExamQuestion.objects.filter(subject=self.subject).only("pk"):
+            answers[f"question_{question.pk}"] = rng.choice("ABCD")
+        self.exam_answers = answers
+
+    def client(self, user):
+        client = Client()
+        client.force_login(user)
+        return client
+
+
+@case("build_model_input", number=200)
+def bench_build_model_input(data):
+    from .services import build_model_input
+
+    records = cycle(data.records)
+    return lambda: build_model_input(next(records))
+
+
+@case("predict.single", number=200)
+def bench_predict_single(data):
+    from .services import get_prediction_cache, predict
+
+    records = cycle(data.records)
+    # Every call is a cache miss, so this times the model path.
+    return lambda: predict(next(records)), get_prediction_cache().clear
+
+
+@case("predict.single_cached", number=500)
+def bench_predict_cached(data):
+    from .services import predict
+
+    record = data.records[0]
+    predict(record)
+    return lambda: predict(record)
+
+
+@case("predict.batch_256", number=10)
+def bench_predict_batch_small(data):
+    from .services import get_engine, to_feature_record
+
+    records = [to_feature_record(record) for record in data.records[:256]]
+    return lambda: get_engine().run(records)
+
+
+@case("predict.batch_2000", number=5)
+def bench_predict_batch_large(data):
+    from .services import get_engine, to_feature_record
+
+    records = [to_feature_record(record) for record in data.records]
+    return lambda: get_engine().run(records)
+
+
+def _start_attempt(client, data):
+    from .attempts import get_attempts
+    from .question_sets import get_question_banks
+
+    attempt = get_attempts().start(data.heavy_user.pk, get_question_banks().get(data.subject.pk).subject)
+    session = client.session
+    session.update({"exam_attempt": attempt.token, "exam_submitted": False})
+    session.save()
+    return attempt
+
+
+@case("exam.page", number=10)
+def bench_exam_page(data):
+    client = data.client(data.heavy_user)
+    _start_attempt(client, data)
+
+    def page():
+        response = client.get("/exam/", {"subject": data.subject.pk})
+        assert response.status_code == 200, response.status_code
+
+    return page
+
+
+@case("exam.autosave", number=20)
+def bench_exam_autosave(data):
+    client = data.client(data.heavy_user)
+    attempt = _start_attempt(client, data)
+    answers = cycle(data.exam_answers.items())
+
+    def save():
+        name, option = next(answers)
+        body = json.dumps({"token": attempt.token, "answers": {name.removeprefix("question_"): option}})
+        response = client.post("/exam/autosave/", body, content_type="application/json")
+        assert response.status_code == 200, response.status_code
+
+    return save
+
+
+@case("exam.grade", number=10)
+def bench_exam_grade(data):
+    client = data.client(data.heavy_user)
+    payload = {"subject_id": data.subject.pk, **data.exam_answers}
+
+    def start_exam():
+        payload["exam_token"] = _start_attempt(client, data).token
+
+    # Banks larger than DATA_UPLOAD_MAX_NUMBER_FIELDS need the limit raised in production too.
+    @override_settings(DATA_UPLOAD_MAX_NUMBER_FIELDS=len(payload) + 100)
+    def grade():
+        response = client.post("/exam/", payload)
+        assert response.status_code == 302, response.status_code
+
+    return grade, start_exam
+
+
+@case("exam.start_sampled", number=10)
+def bench_exam_start_sampled(data):
+    from .question_sets import bump_versions
+
+    # 50 questions drawn from a 20,000 question bank, 10 of them hard.
+    subject = ExamSubject.objects.create(
+        name=f"{BENCHMARK_SUBJECT} (sampled)", time_limit_minutes=600, questions_per_attempt=50, hard_quota=10
+    )
+    rng = random.Random(data.seed)
+    ExamQuestion.objects.bulk_create(
+        [
+            ExamQuestion(
+                subject=subject,
+                text=f"Sampled question {index}",
+                option_a="A",
+                option_b="B",
+                option_c="C",
+                option_d="D",
+                correct_option=rng.choice("ABCD"),
+                difficulty=rng.choice(["easy", "medium", "medium", "hard"]),
+            )
+            for index in range(20000)
+        ],
+        batch_size=1000,
+    )
+    bump_versions([subject.pk])
+    client = data.client(data.heavy_user)
+
+    def reset():
+        session = client.session
+        session.pop("exam_attempt", None)
+        session["exam_submitted"] = False
+        session.save()
+
+    def start():
+        response = client.get("/exam/", {"subject": subject.pk, "start": "1"})
+        assert response.status_code == 200, response.status_code
+
+    return start, reset
+
+
+@case("grading.batch_5000", number=5)
+def bench_grading_batch(data):
+    from .question_sets import get_question_banks
+
+    answer_key = get_question_banks().get(data.subject.pk).question_set().grading_key
+    rng = random.Random(data.seed)
+    sheets = answer_key.empty(5000)
+    for row in sheets:
+        answer_key.encode_answers([rng.choice("ABCD-") for _ in range(len(answer_key))], out=row)
+
+    def grade():
+        answer_key.grade(sheets)
+
+    return grade
+
+
+@case("analytics.user", number=10)
+def bench_analytics(data):
+    client = data.client(data.heavy_user)
+
+    def view():
+        response = client.get("/analytics/")
+        assert response.status_code == 200, response.status_code
+
+    return view, cache.clear
+
+
+@case("analytics.user_filtered", number=10)
+def bench_analytics_filtered(data):
+    client = data.client(data.heavy_user)
+    today = time.strftime("%Y-%m-%d")
+
+    def view():
+        response = client.get("/analytics/", {"result": "pass", "start": "2000-01-01", "end": today})
+        assert response.status_code == 200, response.status_code
+
+    return view, cache.clear
+
+
+@case("dashboard", number=10)
+def bench_dashboard(data):
+    client = data.client(data.staff)
+
+    def view():
+        response = client.get("/superadmin/")
+        assert response.status_code == 200, response.status_code
+
+    return view, cache.clear
+
+
+def _deep_cursor(queryset):
+    """Cursor for the page a tenth of the way from the oldest row."""
+    queryset = queryset.order_by("created_at", "id").values_list("created_at", "id")
+    key = queryset[max(0, queryset.count() // 10)]
+    return encode_cursor("next", key)
+
+
+@case("records.first_page", number=20)
+def bench_records_first_page(data):
+    client = data.client(data.staff)
+
+    def view():
+        response = client.get("/records/")
+        assert response.status_code == 200, response.status_code
+
+    return view
+
+
+@case("records.deep_page", number=20)
+def bench_records_deep_page(data):
+    client = data.client(data.staff)
+    cursor = _deep_cursor(StudentPrediction.objects.all())
+
+    def view():
+        response = client.get("/records/", {"cursor": cursor})
+        assert response.status_code == 200, response.status_code
+
+    return view
+
+
+@case("history.deep_page", number=20)
+def bench_history_deep_page(data):
+    client = data.client(data.heavy_user)
+    cursor = _deep_cursor(StudentPrediction.objects.filter(user=data.heavy_user))
+
+    def view():
+        response = client.get("/history/", {"cursor": cursor})
+        assert response.status_code == 200, response.status_code
+
+    return view
+
+
+@case("rate_limit", number=2000)
+def bench_rate_limit(data):
+    from .utils import is_rate_limited
+
+    request = RequestFactory().post("/predict/")
+    request.user = data.heavy_user
+    return lambda: is_rate_limited(request, "benchmark", limit=10**9, window=300)
+
+
+def _rate_limit_case(backend, algorithm):
+    @case(f"rate_limit.{backend}_{algorithm}", number=2000)
+    def bench(data):
+        if backend == "sqlite":
+            store = SQLiteRateLimitBackend(os.path.join(data.workdir, f"ratelimit-{algorithm}.sqlite3"))
+        else:
+            store = CacheRateLimitBackend()
+        limiter = RateLimiter(store, algorithm)
+        keys = cycle([f"benchmark:{index}" for index in range(100)])
+        return lambda: limiter.hit(next(keys), 10**9, 300)
+
+    return bench
+
+
+for _algorithm in ALGORITHMS:
+    _rate_limit_case("sqlite", _algorithm)
+    if _algorithm != "token_bucket":
+        _rate_limit_case("cache", _algorithm)
+
+
+def _summary(samples, number):
+    ordered = sorted(samples)
+    median = statistics.median(ordered)
+    return {
+        "number": number,
+        "samples": len(ordered),
+        "min_ms": round(ordered[0] * 1000, 4),
+        "median_ms": round(median * 1000, 4),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 4),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 4),
+        "max_ms": round(ordered[-1] * 1000, 4),
+        "ops_per_sec": round(1 / median, 2) if median else None,
+    }
+
+
+def run_case(benchmark, data, repeat=3, warmup=1):
+    made = benchmark.factory(data)
+    step, prepare = made if isinstance(made, tuple) else (made, None)
+    for _ in range(warmup):
+        if prepare:
+            prepare()
+        step()
+    samples = []
+    for _ in range(repeat):
+        for _ in range(benchmark.number):
+            if prepare:
+                prepare()
+            started = time.perf_counter()
+            step()
+            samples.append(time.perf_counter() - started)
+    return _summary(samples, benchmark.number)
+
+
+def environment():
+    import numpy
+    import sklearn
+    import django
+
+    from .services import model_version
+
+    return {
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "numpy": numpy.__version__,
+        "sklearn": sklearn.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "model_version": model_version(),
+        "compile_model": settings.COMPILE_MODEL,
+        "prediction_batching": settings.PREDICTION_BATCHING,
+    }
+
+
+def compare(results, baseline, threshold, metric="median_ms"):
+    """
+    Compare ``results`` with ``baseline``; returns one row per shared case and
+    whether it is slower than the baseline by more than ``threshold``.
+    """
+    rows = []
+    for name, current in results["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get(metric):
+            continue
+        ratio = current[metric] / previous[metric]
+        rows.append(
+            {
+                "name": name,
+                "baseline": previous[metric],
+                "current": current[metric],
+                "ratio": round(ratio, 3),
+                "regressed": ratio > 1 + threshold,
+            }
+        )
+    return rows
+
+
+def load(path):
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def dump(results, path):
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(results, handle, indent=2, sort_keys=True)
+        handle.write("\n")
@@ -0,0 +1,176 @@
+import numpy as np
+from scipy.special import expit, softmax
+
+
+class CompiledTrees:
+    """
+    A set of fitted decision trees flattened into contiguous node arrays.
+
+    Leaves point back at themselves, so walking every tree for ``depth`` steps
+    lands each row on its leaf without per-node Python branching.
+    """
+
+    def __init__(self, trees, normalize=False, scale=None):
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        depth = 0
+        offset = 0
+        for tree in trees:
+            count = tree.node_count
+            left = tree.children_left.astype(np.intp)
+            right = tree.children_right.astype(np.intp)
+            leaf = left == -1
+            own = np.arange(count, dtype=np.intp)
+            value = tree.value[:, 0, :].astype(np.float64)
+            if normalize:
+                totals = value.sum(axis=1, keepdims=True)
+                totals[totals == 0.0] = 1.0
+                value = value / totals
+            if scale is not None:
+                value = scale * value
+            features.append(np.where(leaf, 0, tree.feature).astype(np.intp))
+            thresholds.append(np.where(leaf, np.inf, tree.threshold))
+            lefts.append(np.where(leaf, own, left) + offset)
+            rights.append(np.where(leaf, own, right) + offset)
+            values.append(value)
+            roots.append(offset)
+            depth = max(depth, tree.max_depth)
+            offset += count
+        self.feature = np.ascontiguousarray(np.concatenate(features))
+        self.threshold = np.ascontiguousarray(np.concatenate(thresholds))
+        # Interleaved children: index ``2 * node + went_right``.
+        self.children = np.ascontiguousarray(
+            np.column_stack([np.concatenate(lefts), np.concatenate(rights)]).ravel()
+        )
+        self.value = np.ascontiguousarray(np.concatenate(values))
+        self.roots = np.array(roots, dtype=np.intp)
+        self.depth = depth
+
+    @property
+    def left(self):
+        return self.children[0::2]
+
+    @property
+    def right(self):
+        return self.children[1::2]
+
+    def leaf_values(self, X):
+        """Return the leaf value of every tree for every row: ``(n, trees, outputs)``."""
+        # sklearn trees compare float32 inputs against float64 thresholds.
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        flat = X.ravel()
+        row_offsets = (np.arange(X.shape[0], dtype=np.intp) * X.shape[1])[:, None]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], self.roots.size)).copy()
+        for _ in range(self.depth):
+            went_right = flat[row_offsets + self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.children[2 * nodes + went_right]
+        return self.value[nodes]
+
+
+class CompiledGradientBoosting:
+    def __init__(self, estimator):
+        init = estimator.init_
+        if init != "zero" and type(init).__name__ != "DummyClassifier":
+            raise ValueError("Only constant init estimators can be compiled.")
+        stages, per_stage = estimator.estimators_.shape
+        self.classes_ = estimator.classes_
+        self.stages = stages
+        self.per_stage = per_stage
+        self.learning_rate = float(estimator.learning_rate)
+        # Leaf values are pre-multiplied by the learning rate, as predict_stages does.
+        self.trees = CompiledTrees(
+            (tree.tree_ for tree in estimator.estimators_.ravel()), scale=self.learning_rate
+        )
+        probe = np.zeros((1, estimator.n_features_in_), dtype=np.float32)
+        self.init_raw = estimator._raw_predict_init(probe)[0].astype(np.float64)
+
+    def decision_function(self, X):
+        leaves = self.trees.leaf_values(X)[:, :, 0].reshape(-1, self.stages, self.per_stage)
+        terms = np.empty((self.stages + 1, leaves.shape[0], self.per_stage), dtype=np.float64)
+        terms[0] = self.init_raw
+        terms[1:] = leaves.transpose(1, 0, 2)
+        # cumsum adds strictly stage by stage, the same order as sklearn's
+        # predict_stages, so the sums match bit for bit (np.sum may go pairwise).
+        return np.cumsum(terms, axis=0)[-1]
+
+    def predict_proba(self, X):
+        raw = self.decision_function(X)
+        if self.per_stage == 1:
+            positive = expit(raw[:, 0])
+            return np.column_stack([1 - positive, positive])
+        return softmax(raw, axis=1)
+
+
+class CompiledForest:
+    def __init__(self, estimator):
+        if estimator.n_outputs_ != 1:
+            raise ValueError("Multi-output forests cannot be compiled.")
+        self.classes_ = estimator.classes_
+        self.count = len(estimator.estimators_)
+        self.trees = CompiledTrees((tree.tree_ for tree in estimator.estimators_), normalize=True)
+
+    def predict_proba(self, X):
+        leaves = self.trees.leaf_values(X)
+        proba = np.zeros((leaves.shape[0], leaves.shape[2]), dtype=np.float64)
+        for index in range(self.count):
+            proba += leaves[:, index, :]
+        proba /= self.count
+        return proba
+
+
+class CompiledLinear:
+    def __init__(self, estimator):
+        self.classes_ = estimator.classes_
+        self.weights = np.ascontiguousarray(estimator.coef_.T, dtype=np.float64)
+        self.intercept = np.asarray(estimator.intercept_, dtype=np.float64)
+        multi_class = getattr(estimator, "multi_class", "auto")
+        self.ovr = multi_class in ("ovr", "warn") or (
+            multi_class in ("auto", "deprecated")
+            and (self.classes_.size <= 2 or getattr(estimator, "solver", "") == "liblinear")
+        )
+
+    def decision_function(self, X):
+        return np.asarray(X, dtype=np.float64) @ self.weights + self.intercept
+
+    def predict_proba(self, X):
+        decision = self.decision_function(X)
+        if decision.shape[1] == 1:
+            if self.ovr:
+                positive = expit(decision[:, 0])
+                return np.column_stack([1 - positive, positive])
+            decision = np.column_stack([-decision[:, 0], decision[:, 0]])
+            return softmax(decision, axis=1)
+        if self.ovr:
+            proba = expit(decision)
+            return proba / proba.sum(axis=1, keepdims=True)
+        return softmax(decision, axis=1)
+
+
+COMPILERS = {
+    "GradientBoostingClassifier": CompiledGradientBoosting,
+    "RandomForestClassifier": CompiledForest,
+    "ExtraTreesClassifier": CompiledForest,
+    "LogisticRegression": CompiledLinear,
+}
+
+
+def compile_estimator(estimator):
+    """Build the flat-array evaluator for ``estimator`` or raise ``ValueError``."""
+    name = type(estimator).__name__
+    compiler = COMPILERS.get(name)
+    if compiler is None:
+        raise ValueError(f"No compiled evaluator for '{name}'.")
+    return compiler(estimator)
+
+
+def max_difference(compiled, estimator, X, single_rows=32):
+    """
+    Largest absolute probability gap between ``compiled`` and ``estimator``, over
+    the whole batch and over the first ``single_rows`` rows scored one at a time.
+    """
+    expected = estimator.predict_proba(X)
+    difference = float(np.max(np.abs(compiled.predict_proba(X) - expected), initial=0.0))
+    for index in range(min(single_rows, len(X))):
+        row = X[index : index + 1]
+        gap = np.max(np.abs(compiled.predict_proba(row) - estimator.predict_proba(row)))
+        difference = max(difference, float(gap))
+    return difference
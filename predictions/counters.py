@@ -0,0 +1,181 @@
+from collections import Counter as Tally
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .models import ContactMessage, Counter, DailyPredictionRollup, StudentPrediction
+
+PREDICTIONS = "predictions"
+USERS = "users"
+CONTACT_MESSAGES = "contact_messages"
+ROLLUP_FIELDS = {"PASS": "pass_count", "FAIL": "fail_count"}
+# Cache version numbers and processing watermarks kept in the same table;
+# they don't count rows, so reconcile() leaves them alone.
+VERSION_PREFIX = "version:"
+WATERMARK_PREFIX = "watermark:"
+
+
+def prediction_label(label):
+    return f"predictions:{label}"
+
+
+def user_predictions(user_id):
+    return f"user:{user_id}:predictions"
+
+
+def prediction_deltas(rows, sign=1):
+    """Counter changes for ``(user_id, label)`` pairs being added (or removed with sign=-1)."""
+    deltas = Tally()
+    for user_id, label in rows:
+        deltas[PREDICTIONS] += sign
+        deltas[prediction_label(label)] += sign
+        if user_id is not None:
+            deltas[user_predictions(user_id)] += sign
+    return deltas
+
+
+def increment(deltas):
+    """
+    Apply ``{key: delta}`` with one ``UPDATE ... SET value = value + delta``
+    per key, creating missing rows, in the caller's transaction. Writers of
+    counted rows use increment_on_commit() instead.
+    """
+    now = timezone.now()
+    for key, delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        if Counter.objects.filter(key=key).update(value=F("value") + delta, updated_at=now):
+            continue
+        try:
+            with transaction.atomic():
+                Counter.objects.create(key=key, value=delta)
+        except IntegrityError:
+            # Another writer created the row first.
+            Counter.objects.filter(key=key).update(value=F("value") + delta, updated_at=now)
+
+
+def increment_on_commit(deltas):
+    """
+    increment() once the caller's transaction commits (at once outside one).
+    The counter rows are then locked for a single autocommitted UPDATE rather
+    than for the rest of the writer's transaction, so concurrent inserts
+    don't queue behind each other; a rolled-back write never counts. If the
+    process dies in between, or an update fails (it is logged), reconcile()
+    repairs the drift.
+    """
+    transaction.on_commit(partial(increment, deltas), robust=True)
+
+
+def rollup_deltas(rows, sign=1):
+    """Daily rollup changes for ``(user_id, label, created_at)`` triples."""
+    deltas = Tally()
+    for user_id, label, created_at in rows:
+        field = ROLLUP_FIELDS.get(label)
+        if user_id is not None and field and created_at is not None:
+            deltas[(user_id, timezone.localdate(created_at), field)] += sign
+    return deltas
+
+
+def apply_rollups(deltas):
+    for (user_id, day, field), delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        rows = DailyPredictionRollup.objects.filter(user_id=user_id, day=day)
+        if rows.update(**{field: F(field) + delta}):
+            continue
+        try:
+            with transaction.atomic():
+                DailyPredictionRollup.objects.create(user_id=user_id, day=day, **{field: max(delta, 0)})
+        except IntegrityError:
+            rows.update(**{field: F(field) + delta})
+
+
+def record_predictions(records, sign=1):
+    """
+    Count predictions saved (or deleted) without signals, e.g. by
+    bulk_create. Counters and rollups are updated once the transaction
+    commits, as increment_on_commit() describes.
+    """
+    records = list(records)
+    counts = prediction_deltas(((record.user_id, record.prediction) for record in records), sign)
+    rollups = rollup_deltas(((record.user_id, record.prediction, record.created_at) for record in records), sign)
+
+    def apply():
+        increment(counts)
+        apply_rollups(rollups)
+
+    transaction.on_commit(apply, robust=True)
+
+
+def get_counts(keys):
+    values = dict(Counter.objects.filter(key__in=keys).values_list("key", "value"))
+    return {key: values.get(key, 0) for key in keys}
+
+
+def get_count(key):
+    return get_counts([key])[key]
+
+
+def actual_counts():
+    """Every counter recomputed from the source tables."""
+    counts = {
+        PREDICTIONS: StudentPrediction.objects.count(),
+        USERS: get_user_model().objects.count(),
+        CONTACT_MESSAGES: ContactMessage.objects.count(),
+    }
+    for label, total in StudentPrediction.objects.values_list("prediction").annotate(total=Count("id")).order_by():
+        counts[prediction_label(label)] = total
+    for user_id, total in (
+        StudentPrediction.objects.filter(user__isnull=False)
+        .values_list("user_id")
+        .annotate(total=Count("id"))
+        .order_by()
+    ):
+        counts[user_predictions(user_id)] = total
+    return counts
+
+
+def reconcile(dry_run=False):
+    """
+    Compare stored counters with the source tables and, unless ``dry_run``,
+    correct the drifted ones. Returns ``{key: (stored, actual)}`` for each drift.
+    """
+    with transaction.atomic():
+        actual = actual_counts()
+        stored = dict(
+            Counter.objects.exclude(key__startswith=VERSION_PREFIX)
+            .exclude(key__startswith=WATERMARK_PREFIX)
+            .select_for_update()
+            .values_list("key", "value")
+        )
+        drift = {
+            key: (stored.get(key, 0), actual.get(key, 0))
+            for key in set(actual) | set(stored)
+            if stored.get(key, 0) != actual.get(key, 0)
+        }
+        if drift and not dry_run:
+            increment({key: value - current for key, (current, value) in drift.items()})
+    return drift
+
+
+def rebuild_rollups(user_ids=None, chunk_size=5000):
+    """Recompute daily rollups from StudentPrediction. Returns the number of rows written."""
+    predictions = StudentPrediction.objects.filter(user__isnull=False, prediction__in=ROLLUP_FIELDS)
+    rollups = DailyPredictionRollup.objects.all()
+    if user_ids:
+        predictions = predictions.filter(user_id__in=user_ids)
+        rollups = rollups.filter(user_id__in=user_ids)
+    totals = rollup_deltas(
+        predictions.values_list("user_id", "prediction", "created_at").order_by().iterator(chunk_size=chunk_size)
+    )
+    days = {}
+    for (user_id, day, field), count in totals.items():
+        row = days.setdefault((user_id, day), DailyPredictionRollup(user_id=user_id, day=day))
+        setattr(row, field, count)
+    with transaction.atomic():
+        rollups.delete()
+        DailyPredictionRollup.objects.bulk_create(days.values(), batch_size=1000)
+    return len(days)
@@ -0,0 +1,132 @@
+import numpy as np
+
+
+def _unwrap(transformer):
+    steps = getattr(transformer, "steps", None)
+    if steps is None:
+        return [transformer]
+    return [step for _, step in steps if step not in (None, "passthrough")]
+
+
+class FeatureEncoder:
+    """
+    Pandas-free replacement for a fitted ColumnTransformer made of scalers and
+    one-hot encoders. Index tables and scaler arrays are extracted once, the
+    default features are encoded into a template row, and each record only
+    writes its own columns into a preallocated float64 row or batch.
+    """
+
+    def __init__(self, width, numeric, categorical, defaults, dynamic):
+        self.width = width
+        # numeric: feature -> output column, with matching mean/scale arrays.
+        self.numeric_features = [name for name, _, _, _ in numeric]
+        self.numeric_columns = np.array([column for _, column, _, _ in numeric], dtype=np.intp)
+        self.numeric_mean = np.array([mean for _, _, mean, _ in numeric], dtype=np.float64)
+        self.numeric_scale = np.array([scale for _, _, _, scale in numeric], dtype=np.float64)
+        # categorical: feature -> {category: output column}.
+        self.categorical = categorical
+        self.dynamic = list(dynamic)
+        dynamic_numeric = [
+            index for index, name in enumerate(self.numeric_features) if name in self.dynamic
+        ]
+        self.dynamic_numeric = [self.numeric_features[index] for index in dynamic_numeric]
+        self._dynamic_columns = self.numeric_columns[dynamic_numeric]
+        self._dynamic_mean = self.numeric_mean[dynamic_numeric]
+        self._dynamic_scale = self.numeric_scale[dynamic_numeric]
+        self.dynamic_categorical = [name for name in dynamic if name in categorical]
+        self.template = self._encode_template(defaults, set(dynamic))
+
+    @classmethod
+    def from_column_transformer(cls, transformer, defaults, dynamic):
+        numeric = []
+        categorical = {}
+        for name, fitted, columns in transformer.transformers_:
+            if fitted == "drop":
+                continue
+            if isinstance(fitted, str):
+                raise ValueError(f"Unsupported transformer '{fitted}' for '{name}'.")
+            output = transformer.output_indices_[name]
+            steps = _unwrap(fitted)
+            if len(steps) != 1:
+                raise ValueError(f"Unsupported transformer chain for '{name}'.")
+            step = steps[0]
+            kind = type(step).__name__
+            if kind == "StandardScaler":
+                mean = step.mean_ if step.with_mean else np.zeros(len(columns))
+                scale = step.scale_ if step.with_std else np.ones(len(columns))
+                for offset, column in enumerate(columns):
+                    numeric.append((column, output.start + offset, mean[offset], scale[offset]))
+            elif kind == "OneHotEncoder":
+                if step.drop_idx_ is not None or step.handle_unknown != "ignore":
+                    raise ValueError(f"Unsupported one-hot settings for '{name}'.")
+                position = output.start
+                for column, categories in zip(columns, step.categories_):
+                    categorical[column] = {
+                        category: position + index for index, category in enumerate(categories)
+                    }
+                    position += len(categories)
+            else:
+                raise ValueError(f"Unsupported transformer '{kind}' for '{name}'.")
+        width = max(indices.stop for indices in transformer.output_indices_.values())
+        return cls(width, numeric, categorical, defaults, dynamic)
+
+    @property
+    def features(self):
+        return self.numeric_features + list(self.categorical)
+
+    def _encode_template(self, defaults, dynamic):
+        row = np.zeros(self.width, dtype=np.float64)
+        for index, name in enumerate(self.numeric_features):
+            if name in dynamic:
+                continue
+            if name not in defaults:
+                raise ValueError(f"Missing model features: {[name]}")
+            row[self.numeric_columns[index]] = (
+                float(defaults[name]) - self.numeric_mean[index]
+            ) / self.numeric_scale[index]
+        for name, table in self.categorical.items():
+            if name in dynamic:
+                continue
+            if name not in defaults:
+                raise ValueError(f"Missing model features: {[name]}")
+            column = table.get(defaults[name])
+            if column is not None:
+                row[column] = 1.0
+        return row
+
+    def encode(self, record, out=None):
+        """Encode one record of dynamic features into ``out`` (or a new row)."""
+        if out is None:
+            out = np.empty(self.width, dtype=np.float64)
+        self.encode_many([record], out=out.reshape(1, -1))
+        return out
+
+    def encode_many(self, records, out=None):
+        """Encode a sequence of records into an ``(n, width)`` float64 batch."""
+        count = len(records)
+        if out is None:
+            out = np.empty((count, self.width), dtype=np.float64)
+        batch = out[:count]
+        batch[:] = self.template
+        if self.dynamic_numeric:
+            names = self.dynamic_numeric
+            values = np.array(
+                [[record[name] for name in names] for record in records], dtype=np.float64
+            ).reshape(count, len(names))
+            values -= self._dynamic_mean
+            values /= self._dynamic_scale
+            batch[:, self._dynamic_columns] = values
+        for name in self.dynamic_categorical:
+            table = self.categorical[name]
+            for row, record in enumerate(records):
+                column = table.get(record[name])
+                if column is not None:
+                    batch[row, column] = 1.0
+        return batch
+
+    def max_difference(self, transformer, frame, records):
+        """Largest absolute gap between this encoder and ``transformer`` on ``frame``."""
+        expected = transformer.transform(frame)
+        if hasattr(expected, "toarray"):
+            expected = expected.toarray()
+        return float(np.max(np.abs(self.encode_many(records) - expected), initial=0.0))
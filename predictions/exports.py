@@ -0,0 +1,209 @@
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+import csv
+import json
+import zlib
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import ExamResult, StudentPrediction
+from .pagination import keyset_chunks
+
+FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+# Spreadsheets evaluate text cells starting with these as formulas; CSV
+# exports quote them with a leading apostrophe. NDJSON stays raw.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+# Output column -> values() lookup.
+PREDICTION_COLUMNS = {
+    "id": "id",
+    "created_at": "created_at",
+    "username": "user__username",
+    **{
+        field: field
+        for field in (
+            "full_name",
+            "age",
+            "gender",
+            "school",
+            "address",
+            "family_size",
+            "parental_status",
+            "mother_education",
+            "father_education",
+            "guardian",
+            "family_support",
+            "internet_access",
+            "study_time",
+            "travel_time",
+            "failures",
+            "absences",
+            "g1",
+            "g2",
+            "activities",
+            "health",
+            "prediction",
+            "confidence",
+            "model_version",
+        )
+    },
+}
+
+EXAM_RESULT_COLUMNS = {
+    "id": "id",
+    "created_at": "created_at",
+    "username": "user__username",
+    "subject": "subject__name",
+    **{
+        field: field
+        for field in ("score", "total_questions", "correct_count", "wrong_count", "percentage", "passed")
+    },
+}
+
+
+class ExportError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Export:
+    model: type
+    columns: dict
+
+
+EXPORTS = {
+    "predictions": Export(StudentPrediction, PREDICTION_COLUMNS),
+    "exam-results": Export(ExamResult, EXAM_RESULT_COLUMNS),
+}
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _date(value, name):
+    if not value:
+        return None
+    day = parse_date(value) if isinstance(value, str) else value
+    if day is None:
+        raise ExportError(f"{name} must be a YYYY-MM-DD date.")
+    return day
+
+
+def filtered_queryset(kind, result="", start=None, end=None, user=None, subject=None):
+    """
+    Rows of ``kind`` matching the analytics filters: PASS/FAIL result, a
+    local-day date range, and optionally a username and (for exam results)
+    a subject id or name.
+    """
+    if kind not in EXPORTS:
+        raise ExportError(f"Unknown export '{kind}'; choose from {', '.join(EXPORTS)}.")
+    export = EXPORTS[kind]
+    queryset = export.model.objects.all()
+
+    result = (result or "").upper()
+    if result:
+        if result not in {"PASS", "FAIL"}:
+            raise ExportError("result must be PASS or FAIL.")
+        if export.model is StudentPrediction:
+            queryset = queryset.filter(prediction=result)
+        else:
+            queryset = queryset.filter(passed=result == "PASS")
+
+    start, end = _date(start, "start"), _date(end, "end")
+    if start:
+        queryset = queryset.filter(created_at__gte=_start_of_day(start))
+    if end:
+        queryset = queryset.filter(created_at__lt=_start_of_day(end + timedelta(days=1)))
+
+    if user:
+        user_id = get_user_model().objects.filter(username=user).values_list("pk", flat=True).first()
+        if user_id is None:
+            raise ExportError(f"User '{user}' not found.")
+        queryset = queryset.filter(user_id=user_id)
+
+    if subject:
+        if export.model is not ExamResult:
+            raise ExportError("subject only applies to exam results.")
+        queryset = queryset.filter(subject_id=subject) if str(subject).isdigit() else queryset.filter(
+            subject__name=subject
+        )
+    return queryset.values(*export.columns.values())
+
+
+def _rows(kind, queryset, chunk_size):
+    columns = list(EXPORTS[kind].columns.values())
+    position = columns.index("created_at")
+    zone = timezone.get_current_timezone()
+    for chunk in keyset_chunks(queryset, chunk_size=chunk_size):
+        rows = []
+        for row in chunk:
+            values = [row[column] for column in columns]
+            values[position] = values[position].astimezone(zone).isoformat()
+            rows.append(values)
+        yield rows
+
+
+class _Buffer:
+    """File-like sink for ``csv.writer`` that hands back what was written."""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, value):
+        self.parts.append(value)
+
+    def drain(self):
+        data, self.parts = "".join(self.parts), []
+        return data
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _text_chunks(kind, queryset, fmt, chunk_size):
+    header = list(EXPORTS[kind].columns)
+    if fmt == "csv":
+        buffer = _Buffer()
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+        yield buffer.drain()
+        for rows in _rows(kind, queryset, chunk_size):
+            writer.writerows([_csv_cell(value) for value in row] for row in rows)
+            yield buffer.drain()
+    else:
+        for rows in _rows(kind, queryset, chunk_size):
+            yield "".join(json.dumps(dict(zip(header, row)), separators=(",", ":")) + "\n" for row in rows)
+
+
+def render_chunks(kind, queryset, fmt="csv", chunk_size=2000):
+    """
+    Iterator over the export as text, one piece per database chunk. Only one
+    chunk of rows is held in memory at a time. Arguments are checked here so
+    errors surface before a response starts streaming.
+    """
+    if fmt not in FORMATS:
+        raise ExportError(f"Unknown format '{fmt}'; choose from {', '.join(FORMATS)}.")
+    if chunk_size <= 0:
+        raise ExportError("chunk size must be positive.")
+    return _text_chunks(kind, queryset, fmt, chunk_size)
+
+
+def gzip_chunks(chunks, level=6):
+    """Compress text ``chunks`` into a gzip stream as they arrive."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def filename(kind, fmt, gzipped=False):
+    stamp = timezone.localtime().strftime("%Y%m%d-%H%M%S")
+    return f"{kind}-{stamp}.{fmt}" + (".gz" if gzipped else "")
@@ -195,6 +195,29 @@ class StudentPredictionForm(forms.Form):
     )
 
 
+_prediction_fields = None
+
+
+def clean_prediction_data(data):
+    """
+    Apply StudentPredictionForm's field rules to one mapping of raw values and
+    return ``(cleaned_data, errors)``. Binding a form per record deep-copies every
+    field, which dominates bulk validation; the form has no form-level clean
+    hooks, so running the fields directly gives the same result.
+    """
+    global _prediction_fields
+    if _prediction_fields is None:
+        _prediction_fields = StudentPredictionForm().fields
+    cleaned = {}
+    errors = {}
+    for name, field in _prediction_fields.items():
+        try:
+            cleaned[name] = field.clean(data.get(name, ""))
+        except ValidationError as exc:
+            errors[name] = exc.messages
+    return cleaned, errors
+
+
 class RegisterForm(UserCreationForm):
     full_name = forms.CharField(
         label="Full Name",
@@ -291,7 +314,18 @@ class ContactForm(forms.ModelForm):
 class ExamSubjectForm(forms.ModelForm):
     class Meta:
         model = ExamSubject
-        fields = ("name", "description", "time_limit_minutes", "pass_percentage", "negative_marking", "is_active")
+        fields = (
+            "name",
+            "description",
+            "time_limit_minutes",
+            "pass_percentage",
+            "negative_marking",
+            "questions_per_attempt",
+            "easy_quota",
+            "medium_quota",
+            "hard_quota",
+            "is_active",
+        )
         widgets = {
             "name": forms.TextInput(attrs={"class": "input", "placeholder": "e.g., Mathematics"}),
             "description": forms.Textarea(
@@ -300,6 +334,10 @@ class ExamSubjectForm(forms.ModelForm):
             "time_limit_minutes": forms.NumberInput(attrs={"class": "input", "min": 5, "max": 120}),
             "pass_percentage": forms.NumberInput(attrs={"class": "input", "min": 0, "max": 100}),
             "negative_marking": forms.NumberInput(attrs={"class": "input", "min": 0, "step": "0.25"}),
+            "questions_per_attempt": forms.NumberInput(attrs={"class": "input", "min": 0}),
+            "easy_quota": forms.NumberInput(attrs={"class": "input", "min": 0, "aria-label": "Easy"}),
+            "medium_quota": forms.NumberInput(attrs={"class": "input", "min": 0, "aria-label": "Medium"}),
+            "hard_quota": forms.NumberInput(attrs={"class": "input", "min": 0, "aria-label": "Hard"}),
         }
 
 
@@ -315,6 +353,7 @@ class ExamQuestionForm(forms.ModelForm):
             "option_d",
             "correct_option",
             "points",
+            "difficulty",
             "is_active",
         )
         widgets = {
@@ -325,5 +364,6 @@ class ExamQuestionForm(forms.ModelForm):
             "option_c": forms.TextInput(attrs={"class": "input", "placeholder": "Option C"}),
             "option_d": forms.TextInput(attrs={"class": "input", "placeholder": "Option D"}),
             "correct_option": forms.Select(attrs={"class": "input"}),
+            "difficulty": forms.Select(attrs={"class": "input"}),
             "points": forms.NumberInput(attrs={"class": "input", "min": 1}),
         }
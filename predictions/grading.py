@@ -0,0 +1,161 @@
+from dataclasses import dataclass
+
+# Answers are encoded as small integers; anything else counts as unanswered.
+OPTION_CODES = {"A": 1, "B": 2, "C": 3, "D": 4}
+UNANSWERED = 0
+BLANK_MARKS = frozenset("-_. ")
+OPTIONS = {code: option for option, code in OPTION_CODES.items()}
+# Stored answers: one byte per question, the option code plus this flag when correct.
+CORRECT_FLAG = 0x80
+ID_DTYPE = "<u4"
+
+
+@dataclass(frozen=True)
+class Grade:
+    score: float
+    total_questions: int
+    correct_count: int
+    wrong_count: int
+    percentage: float
+    passed: bool
+    question_ids: bytes = b""
+    answers: bytes = b""
+
+    def as_result_fields(self):
+        return {
+            "score": self.score,
+            "total_questions": self.total_questions,
+            "correct_count": self.correct_count,
+            "wrong_count": self.wrong_count,
+            "percentage": self.percentage,
+            "passed": self.passed,
+            "question_ids": self.question_ids,
+            "answers": self.answers,
+        }
+
+
+def pack_ids(question_ids):
+    import numpy as np
+
+    return np.array(question_ids, dtype=ID_DTYPE).tobytes()
+
+
+def unpack_ids(data):
+    import numpy as np
+
+    return np.frombuffer(data, dtype=ID_DTYPE).tolist()
+
+
+def unpack_answers(question_ids, answers):
+    """``[(question_id, option or "", correct), ...]`` from a stored attempt, in the order shown."""
+    ids = unpack_ids(question_ids)
+    return [
+        (question_id, OPTIONS.get(byte & ~CORRECT_FLAG, ""), bool(byte & CORRECT_FLAG))
+        for question_id, byte in zip(ids, bytes(answers))
+    ]
+
+
+class AnswerKey:
+    """
+    A subject's answer key as arrays, in question order: one option code and
+    one point value per question. ``grade`` scores a whole matrix of encoded
+    submissions (one row each) with NumPy.
+    """
+
+    def __init__(self, question_ids, correct_options, points, negative_marking=0, pass_percentage=40):
+        import numpy as np
+
+        self.question_ids = tuple(question_ids)
+        self.index = {question_id: position for position, question_id in enumerate(self.question_ids)}
+        self.packed_ids = pack_ids(self.question_ids)
+        # A key outside A-D can never be matched, so it never counts as correct.
+        self.codes = np.array([OPTION_CODES.get(option, -1) for option in correct_options], dtype=np.int8)
+        self.points = np.array(points, dtype=np.float64)
+        self.total_marks = int(sum(points))
+        self.negative_marking = float(negative_marking)
+        self.pass_percentage = pass_percentage
+
+    @classmethod
+    def from_question_set(cls, question_set):
+        subject = question_set.subject
+        options, points = zip(*question_set.answer_key.values()) if question_set.answer_key else ((), ())
+        return cls(
+            question_set.answer_key.keys(),
+            options,
+            points,
+            negative_marking=subject.negative_marking,
+            pass_percentage=subject.pass_percentage,
+        )
+
+    def __len__(self):
+        return len(self.question_ids)
+
+    def empty(self, rows=1):
+        import numpy as np
+
+        return np.zeros((rows, len(self.question_ids)), dtype=np.int8)
+
+    def encode_post(self, data, prefix="question_"):
+        """One submission row from form data with ``question_<id>`` fields."""
+        row = self.empty(1)
+        for position, question_id in enumerate(self.question_ids):
+            row[0, position] = OPTION_CODES.get(data.get(f"{prefix}{question_id}"), UNANSWERED)
+        return row
+
+    def encode_answers(self, answers, out=None):
+        """
+        Encode one submission given as ``{question_id: option}`` or as a
+        positional string/sequence in question order (OMR style, where
+        ``-``, ``_``, ``.`` and space mean unanswered). Options are compared
+        exactly, as the exam form always has: anything but "A"-"D" is
+        unanswered.
+        """
+        row = self.empty(1)[0] if out is None else out
+        if isinstance(answers, dict):
+            for question_id, option in answers.items():
+                position = self.index.get(int(question_id))
+                if position is not None:
+                    row[position] = OPTION_CODES.get(option, UNANSWERED) if isinstance(option, str) else UNANSWERED
+        else:
+            for position, option in enumerate(list(answers)[: len(self.question_ids)]):
+                row[position] = UNANSWERED if option in BLANK_MARKS else OPTION_CODES.get(option, UNANSWERED)
+        return row
+
+    def grade(self, submissions):
+        """
+        Grade an ``(n, questions)`` array of option codes. Scores are summed
+        question by question in key order, as the exam view always has, so
+        negative marking that is not exact in binary (0.1, 0.33...) rounds to
+        the same stored values.
+        """
+        import numpy as np
+
+        submissions = np.atleast_2d(submissions)
+        count = len(self.question_ids)
+        if count == 0:
+            return [Grade(0.0, 0, 0, 0, 0, 0 >= self.pass_percentage) for _ in range(submissions.shape[0])]
+
+        correct = submissions == self.codes
+        correct_counts = correct.sum(axis=1)
+        deltas = np.where(correct, self.points, -self.negative_marking)
+        scores = np.add.accumulate(deltas, axis=1)[:, -1]
+        packed = submissions.astype(np.uint8) | np.where(correct, CORRECT_FLAG, 0).astype(np.uint8)
+
+        grades = []
+        total = self.total_marks
+        for score, correct_count, answers in zip(scores.tolist(), correct_counts.tolist(), packed):
+            score = max(0, score)
+            percentage = round((score / total) * 100, 2) if total else 0
+            grades.append(
+                Grade(
+                    score=round(float(score), 2),
+                    total_questions=count,
+                    correct_count=correct_count,
+                    wrong_count=count - correct_count,
+                    percentage=percentage,
+                    passed=percentage >= self.pass_percentage,
+                    question_ids=self.packed_ids,
+                    answers=answers.tobytes(),
+                )
+            )
+        return grades
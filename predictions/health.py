@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+
+from .services import get_registry, retry_warm_up, warm_up_errors
+
+
+@never_cache
+def healthz(request):
+    """Liveness: the process is up and serving requests."""
+    return JsonResponse({"status": "ok"})
+
+
+def _database_reachable():
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    except DatabaseError:
+        return False
+    return True
+
+
+@never_cache
+def readyz(request):
+    """
+    Readiness: the model is loaded, warm-up has run and the database answers.
+    With LOAD_MODEL_ON_STARTUP off the model loads on the first prediction, so
+    only the database is required. A warm-up that could not open its
+    connections is retried here, and its errors reported until it succeeds.
+    """
+    registry = get_registry()
+    checks = {"database": _database_reachable()}
+    if settings.LOAD_MODEL_ON_STARTUP:
+        checks["model"] = registry.loaded
+        checks["warm_up"] = retry_warm_up()
+    ready = all(checks.values())
+    body = {
+        "status": "ok" if ready else "unavailable",
+        "checks": checks,
+        "model_version": registry.current().version if registry.loaded else None,
+    }
+    if settings.LOAD_MODEL_ON_STARTUP and not checks["warm_up"]:
+        body["errors"] = warm_up_errors()
+    return JsonResponse(body, status=200 if ready else 503)
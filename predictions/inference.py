@@ -0,0 +1,163 @@
+from dataclasses import dataclass, field
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from .compiled import compile_estimator, max_difference
+from .encoder import FeatureEncoder
+
+logger = logging.getLogger(__name__)
+
+PASS_LABEL = "PASS"
+FAIL_LABEL = "FAIL"
+COMPILED_TOLERANCE = 1e-9
+
+
+@dataclass
+class InferenceResult:
+    labels: list
+    confidences: list
+    timings: dict = field(default_factory=dict)
+    model_version: str = None
+
+    @property
+    def label(self):
+        return self.labels[0]
+
+    @property
+    def confidence(self):
+        return self.confidences[0]
+
+
+def _label_for(raw_value):
+    return PASS_LABEL if int(raw_value) == 1 else FAIL_LABEL
+
+
+class InferenceEngine:
+    """
+    Splits a fitted pipeline into its preprocessing steps and final estimator so
+    the features are transformed once and label plus confidence come from a
+    single probability pass.
+    """
+
+    def __init__(
+        self, model, features, defaults, dynamic, compile=True, compiled_max_batch=256, version=None
+    ):
+        self.model = model
+        self.version = version
+        self.features = list(features)
+        self.defaults = dict(defaults)
+        self.dynamic = list(dynamic)
+        steps = getattr(model, "steps", None)
+        if steps and len(steps) > 1:
+            self.preprocess = model[:-1]
+            self.estimator = steps[-1][1]
+        else:
+            self.preprocess = None
+            self.estimator = model
+        self.has_proba = hasattr(self.estimator, "predict_proba")
+        self.classes = np.asarray(getattr(self.estimator, "classes_", [0, 1]))
+        self.encoder = self._compile_encoder()
+        self.compiled = self._compile_estimator() if compile and self.has_proba else None
+        # Past a few hundred rows sklearn's Cython loops beat the NumPy evaluator.
+        self.compiled_max_batch = compiled_max_batch
+
+    def _compile_encoder(self):
+        steps = getattr(self.preprocess, "steps", [])
+        if len(steps) != 1 or not hasattr(steps[0][1], "output_indices_"):
+            return None
+        transformer = steps[0][1]
+        try:
+            encoder = FeatureEncoder.from_column_transformer(
+                transformer, self.defaults, self.dynamic
+            )
+            probe = self._probe_records(encoder)
+            difference = encoder.max_difference(transformer, self.frame(probe), probe)
+        except (ValueError, KeyError, TypeError) as exc:
+            logger.warning("Feature encoder unavailable, using pandas path: %s", exc)
+            return None
+        if difference != 0.0:
+            logger.warning("Feature encoder differs from pipeline by %s, using pandas path.", difference)
+            return None
+        return encoder
+
+    def _compile_estimator(self):
+        width = getattr(self.estimator, "n_features_in_", None)
+        if width is None:
+            return None
+        try:
+            compiled = compile_estimator(self.estimator)
+        except ValueError as exc:
+            logger.info("Using the native estimator: %s", exc)
+            return None
+        probe = np.random.default_rng(0).normal(scale=2.0, size=(256, width))
+        if self.encoder is not None:
+            probe = np.vstack([probe, self.encoder.encode_many(self._probe_records(self.encoder))])
+        difference = max_difference(compiled, self.estimator, probe)
+        same_labels = np.array_equal(
+            compiled.predict_proba(probe).argmax(axis=1),
+            self.estimator.predict_proba(probe).argmax(axis=1),
+        )
+        if difference > COMPILED_TOLERANCE or not same_labels:
+            logger.warning("Compiled estimator differs by %s, using the native estimator.", difference)
+            return None
+        return compiled
+
+    def _probe_records(self, encoder):
+        tables = {name: list(encoder.categorical[name]) for name in encoder.dynamic_categorical}
+        size = max([len(values) for values in tables.values()] + [2])
+        records = []
+        for index in range(size):
+            record = {name: index for name in encoder.dynamic_numeric}
+            record.update({name: values[index % len(values)] for name, values in tables.items()})
+            records.append(record)
+        return records
+
+    def frame(self, records):
+        rows = []
+        for record in records:
+            payload = self.defaults.copy()
+            payload.update(record)
+            rows.append(payload)
+        missing = [name for name in self.features if name not in rows[0]] if rows else []
+        if missing:
+            raise ValueError(f"Missing model features: {missing}")
+        return pd.DataFrame(rows, columns=self.features)
+
+    def transform(self, inputs):
+        if self.preprocess is None:
+            return inputs
+        return self.preprocess.transform(inputs)
+
+    def score(self, features):
+        if self.has_proba:
+            scorer = self.estimator
+            if self.compiled is not None and len(features) <= self.compiled_max_batch:
+                scorer = self.compiled
+            proba = scorer.predict_proba(features)
+            best = proba.argmax(axis=1)
+            raw = self.classes[best]
+            confidences = [float(value) for value in proba[np.arange(len(best)), best]]
+        else:
+            raw = self.estimator.predict(features)
+            confidences = [None] * len(raw)
+        return [_label_for(value) for value in raw], confidences
+
+    def encode(self, records):
+        """Turn feature records into the matrix the final estimator consumes."""
+        if self.encoder is not None:
+            return self.encoder.encode_many(records)
+        return self.transform(self.frame(records))
+
+    def run(self, records):
+        started = time.perf_counter()
+        features = self.encode(records)
+        encoded = time.perf_counter()
+        labels, confidences = self.score(features)
+        finished = time.perf_counter()
+        timings = {"encode": encoded - started, "estimator": finished - encoded}
+        return InferenceResult(
+            labels=labels, confidences=confidences, timings=timings, model_version=self.version
+        )
@@ -0,0 +1,145 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger("predictions.timing")
+
+# Upper bounds of the latency buckets, in milliseconds.
+BUCKET_BOUNDS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_request_stages = ContextVar("request_stages", default=None)
+
+
+class Histogram:
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, milliseconds):
+        self.buckets[bisect_left(BUCKET_BOUNDS_MS, milliseconds)] += 1
+        self.count += 1
+        self.total += milliseconds
+        if milliseconds > self.max:
+            self.max = milliseconds
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of observations."""
+        if not self.count:
+            return 0
+        target = fraction * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= target:
+                return BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else self.max
+        return self.max
+
+    def snapshot(self):
+        labels = [f"<={bound}" for bound in BUCKET_BOUNDS_MS] + [f">{BUCKET_BOUNDS_MS[-1]}"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 4) if self.count else 0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max, 4),
+            "buckets_ms": {label: count for label, count in zip(labels, self.buckets) if count},
+        }
+
+
+class Metrics:
+    """In-process latency histograms keyed by stage name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, name, seconds):
+        milliseconds = seconds * 1000
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(milliseconds)
+        stages = _request_stages.get()
+        if stages is not None:
+            stages[name] = stages.get(name, 0.0) + seconds
+
+    def snapshot(self):
+        with self._lock:
+            return {name: histogram.snapshot() for name, histogram in sorted(self._histograms.items())}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+metrics = Metrics()
+
+
+def enabled():
+    return settings.INSTRUMENTATION_ENABLED
+
+
+@contextmanager
+def stage(name):
+    if not enabled():
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.observe(name, time.perf_counter() - started)
+
+
+def record_timings(prefix, timings):
+    if enabled():
+        for name, seconds in timings.items():
+            metrics.observe(f"{prefix}.{name}", seconds)
+
+
+class RequestTimingMiddleware:
+    """
+    Times each request, collects the stages recorded while it ran and writes
+    them as one JSON line to the ``predictions.timing`` logger.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not enabled():
+            return self.get_response(request)
+        stages = {}
+        token = _request_stages.set(stages)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_stages.reset(token)
+        elapsed = time.perf_counter() - started
+        match = getattr(request, "resolver_match", None)
+        view_name = match.view_name if match else "unresolved"
+        metrics.observe(f"request.{view_name}", elapsed)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                json.dumps(
+                    {
+                        "view": view_name,
+                        "method": request.method,
+                        "status": response.status_code,
+                        "total_ms": round(elapsed * 1000, 3),
+                        "stages_ms": {name: round(value * 1000, 3) for name, value in stages.items()},
+                    }
+                )
+            )
+        return response
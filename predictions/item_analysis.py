@@ -0,0 +1,228 @@
+from dataclasses import dataclass
+from datetime import timedelta
+import math
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from . import counters
+from .grading import CORRECT_FLAG, ID_DTYPE, OPTION_CODES
+from .models import Counter, ExamQuestion, ExamResult, QuestionStat
+
+# Highest ExamResult id already folded into QuestionStat.
+WATERMARK = f"{counters.WATERMARK_PREFIX}item_analysis"
+OPTION_FIELDS = ("blank_count", "option_a_count", "option_b_count", "option_c_count", "option_d_count")
+SUM_FIELDS = ("attempts", "correct", "score_sum", "score_squares", "correct_score_sum") + OPTION_FIELDS
+FLOAT_FIELDS = frozenset({"score_sum", "score_squares", "correct_score_sum"})
+# Most attempts a page view may fold in; the management command does the rest.
+VIEW_REFRESH_MAX = 500
+
+# Review flags.
+EASY_ABOVE = 0.9
+HARD_BELOW = 0.2
+DISCRIMINATION_BELOW = 0.1
+
+
+def _advance(current, new):
+    """Move the watermark from ``current`` to ``new``; False if another run already moved it."""
+    if Counter.objects.filter(key=WATERMARK, value=current).update(value=new, updated_at=timezone.now()):
+        return True
+    if current:
+        return False
+    try:
+        with transaction.atomic():
+            Counter.objects.create(key=WATERMARK, value=new)
+    except IntegrityError:
+        return False
+    return True
+
+
+def aggregate(rows):
+    """
+    Per-question sums for ``(percentage, question_ids, answers)`` attempts,
+    as ``(question_ids, {field: array})``. Every answer of every attempt is
+    flattened into one array and grouped with ``bincount``.
+    """
+    import numpy as np
+
+    id_parts, answer_parts, lengths, percentages = [], [], [], []
+    for percentage, question_ids, answers in rows:
+        if not answers:
+            # Attempts graded before answers were stored.
+            continue
+        answer_parts.append(np.frombuffer(answers, dtype=np.uint8))
+        id_parts.append(np.frombuffer(question_ids, dtype=ID_DTYPE))
+        lengths.append(len(answers))
+        percentages.append(percentage)
+    if not answer_parts:
+        return [], {}
+
+    answers = np.concatenate(answer_parts)
+    unique, groups = np.unique(np.concatenate(id_parts), return_inverse=True)
+    count = len(unique)
+    scores = np.repeat(np.array(percentages, dtype=np.float64), lengths)
+    correct = (answers & CORRECT_FLAG) > 0
+    options = np.minimum(answers & ~np.uint8(CORRECT_FLAG), len(OPTION_CODES))
+
+    sums = {
+        "attempts": np.bincount(groups, minlength=count),
+        "correct": np.bincount(groups, weights=correct, minlength=count),
+        "score_sum": np.bincount(groups, weights=scores, minlength=count),
+        "score_squares": np.bincount(groups, weights=scores * scores, minlength=count),
+        "correct_score_sum": np.bincount(groups, weights=scores * correct, minlength=count),
+    }
+    chosen = np.bincount(groups * len(OPTION_FIELDS) + options, minlength=count * len(OPTION_FIELDS))
+    for position, field in enumerate(OPTION_FIELDS):
+        sums[field] = chosen[position :: len(OPTION_FIELDS)]
+    return unique.tolist(), sums
+
+
+def _apply(question_ids, sums):
+    # Questions deleted since the attempt have nothing to attach their sums to.
+    live = ExamQuestion.objects.only("pk").in_bulk(question_ids)
+    stats = QuestionStat.objects.in_bulk([question_id for question_id in question_ids if question_id in live])
+    created, updated = [], []
+    columns = {field: values.tolist() for field, values in sums.items()}
+    for position, question_id in enumerate(question_ids):
+        if question_id not in live:
+            continue
+        stat = stats.get(question_id)
+        if stat is None:
+            stat = QuestionStat(question_id=question_id)
+            created.append(stat)
+        else:
+            updated.append(stat)
+        for field in SUM_FIELDS:
+            value = columns[field][position]
+            setattr(stat, field, getattr(stat, field) + (value if field in FLOAT_FIELDS else int(value)))
+    QuestionStat.objects.bulk_create(created, batch_size=1000)
+    QuestionStat.objects.bulk_update(updated, SUM_FIELDS, batch_size=500)
+
+
+def refresh(max_results=None, chunk_size=5000, settle_seconds=30):
+    """
+    Fold attempts past the watermark into QuestionStat, oldest first, and
+    return how many were processed. Attempts younger than ``settle_seconds``
+    wait for the next run, so a lower id still committing is not skipped.
+    Each chunk moves the watermark with a compare-and-set in the same
+    transaction as its sums, so concurrent runs never count an attempt twice.
+    """
+    processed = 0
+    cutoff = timezone.now() - timedelta(seconds=settle_seconds)
+    while max_results is None or processed < max_results:
+        size = chunk_size if max_results is None else min(chunk_size, max_results - processed)
+        with transaction.atomic():
+            watermark = counters.get_count(WATERMARK)
+            rows = list(
+                ExamResult.objects.filter(pk__gt=watermark)
+                .order_by("pk")
+                .values_list("pk", "created_at", "percentage", "question_ids", "answers")[:size]
+            )
+            settled = []
+            for row in rows:
+                if row[1] >= cutoff:
+                    break
+                settled.append(row)
+            if not settled or not _advance(watermark, settled[-1][0]):
+                break
+            _apply(*aggregate(row[2:] for row in settled))
+        processed += len(settled)
+        if len(settled) < size:
+            break
+    return processed
+
+
+def pending():
+    return ExamResult.objects.filter(pk__gt=counters.get_count(WATERMARK)).exists()
+
+
+def rebuild(**options):
+    """Drop every sum and fold all attempts in again."""
+    with transaction.atomic():
+        QuestionStat.objects.all().delete()
+        Counter.objects.filter(key=WATERMARK).update(value=0, updated_at=timezone.now())
+    return refresh(**options)
+
+
+@dataclass(frozen=True)
+class ItemStatistics:
+    question_id: int
+    text: str
+    correct_option: str
+    attempts: int
+    difficulty: float
+    discrimination: float
+    # Share of attempts choosing each of A-D, then leaving it blank.
+    choices: tuple
+    flags: tuple
+
+    @property
+    def choice_rows(self):
+        """``(label, share, is_key)`` for A-D and blank."""
+        labels = (*OPTION_CODES, "Blank")
+        return tuple((label, share, label == self.correct_option) for label, share in zip(labels, self.choices))
+
+
+def report(subject_id, limit=100):
+    """
+    Item statistics for the subject's analysed questions, weakest
+    discrimination first: difficulty is the share answering correctly,
+    discrimination the point-biserial correlation between answering
+    correctly and the attempt's percentage. Returns ``(items, analysed)``.
+    """
+    import numpy as np
+
+    rows = list(
+        QuestionStat.objects.filter(question__subject_id=subject_id, attempts__gt=0).values_list(
+            "question_id", "question__correct_option", *SUM_FIELDS
+        )
+    )
+    if not rows:
+        return [], 0
+    question_ids, keys, *columns = zip(*rows)
+    sums = dict(zip(SUM_FIELDS, (np.array(column, dtype=np.float64) for column in columns)))
+
+    attempts = sums["attempts"]
+    correct = sums["correct"]
+    wrong = attempts - correct
+    difficulty = correct / attempts
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = sums["score_sum"] / attempts
+        spread = np.sqrt(np.maximum(sums["score_squares"] / attempts - mean * mean, 0))
+        mean_correct = sums["correct_score_sum"] / correct
+        mean_wrong = (sums["score_sum"] - sums["correct_score_sum"]) / wrong
+        discrimination = (mean_correct - mean_wrong) / spread * np.sqrt(difficulty * (1 - difficulty))
+    # Undefined when everyone (or no one) got it right, or every score was equal.
+    discrimination[(correct == 0) | (wrong == 0) | (spread == 0)] = np.nan
+    choices = np.stack([sums[field] for field in OPTION_FIELDS[1:] + OPTION_FIELDS[:1]], axis=1) / attempts[:, None]
+
+    order = np.argsort(np.where(np.isnan(discrimination), np.inf, discrimination), kind="stable")[:limit]
+    texts = dict(ExamQuestion.objects.filter(pk__in=[question_ids[i] for i in order]).values_list("pk", "text"))
+    items = []
+    for i in order.tolist():
+        shares = tuple(round(share, 3) for share in choices[i].tolist())
+        r = None if math.isnan(discrimination[i]) else round(float(discrimination[i]), 3)
+        flags = []
+        if difficulty[i] >= EASY_ABOVE:
+            flags.append("Too easy")
+        elif difficulty[i] <= HARD_BELOW:
+            flags.append("Too hard")
+        if r is not None and r < DISCRIMINATION_BELOW:
+            flags.append("Low discrimination")
+        key_position = OPTION_CODES.get(keys[i], 0) - 1
+        for option, code in OPTION_CODES.items():
+            if code - 1 != key_position and key_position >= 0 and shares[code - 1] > shares[key_position]:
+                flags.append(f"{option} chosen over the key")
+        items.append(
+            ItemStatistics(
+                question_id=question_ids[i],
+                text=texts.get(question_ids[i], ""),
+                correct_option=keys[i],
+                attempts=int(attempts[i]),
+                difficulty=round(float(difficulty[i]), 3),
+                discrimination=r,
+                choices=shares,
+                flags=tuple(flags),
+            )
+        )
+    return items, len(rows)
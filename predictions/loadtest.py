@@ -0,0 +1,267 @@
+from collections import defaultdict
+from http.cookies import SimpleCookie
+from io import BytesIO
+from urllib.parse import urlencode, urlsplit
+import random
+import re
+import sys
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.urls import Resolver404, resolve
+
+from .models import ExamQuestion, ExamSubject
+from .synthetic import random_form_data
+
+LOADTEST_SUBJECT = "Load Test"
+STAFF_USERNAME = "loadtest-staff"
+PASSWORD = "Load-test-Pa55word!"
+RATE_LIMIT_MARKER = b"Too many"
+TOKEN_PATTERN = re.compile(rb'name="(csrfmiddlewaretoken|exam_token)" value="([^"]+)"')
+
+
+class Sample:
+    __slots__ = ("name", "seconds", "status", "rate_limited")
+
+    def __init__(self, name, seconds, status, rate_limited=False):
+        self.name = name
+        self.seconds = seconds
+        self.status = status
+        self.rate_limited = rate_limited
+
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status_code = status
+        self.headers = headers
+        self.content = body
+
+    def hidden(self, name):
+        for field, value in TOKEN_PATTERN.findall(self.content):
+            if field.decode() == name:
+                return value.decode()
+        return None
+
+
+class WSGIClient:
+    """
+    Minimal cookie-keeping client that calls a WSGI application directly, so
+    requests go through the same handler and middleware stack a server uses.
+    Every call is timed and recorded under its resolved URL name.
+    """
+
+    def __init__(self, application, samples, remote_addr="127.0.0.1"):
+        self.application = application
+        self.samples = samples
+        self.remote_addr = remote_addr
+        self.cookies = {}
+        self.host = next((host for host in settings.ALLOWED_HOSTS if "*" not in host), "localhost").lstrip(".")
+
+    def _environ(self, method, path, body=b"", content_type=""):
+        parts = urlsplit(path)
+        environ = {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": parts.path,
+            "QUERY_STRING": parts.query,
+            "SERVER_NAME": self.host,
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "HTTP_HOST": self.host,
+            "REMOTE_ADDR": self.remote_addr,
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.input": BytesIO(body),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+            "CONTENT_LENGTH": str(len(body)),
+            "CONTENT_TYPE": content_type,
+        }
+        if self.cookies:
+            environ["HTTP_COOKIE"] = "; ".join(f"{key}={value}" for key, value in self.cookies.items())
+        return environ
+
+    def request(self, method, path, data=None):
+        body = urlencode(data or {}, doseq=True).encode() if method == "POST" else b""
+        environ = self._environ(method, path, body, "application/x-www-form-urlencoded" if body else "")
+        try:
+            name = f"{method} {resolve(environ['PATH_INFO']).view_name}"
+        except Resolver404:
+            name = f"{method} unresolved"
+
+        captured = {}
+
+        def start_response(status, headers, exc_info=None):
+            captured["status"] = int(status.split(" ", 1)[0])
+            captured["headers"] = headers
+
+        started = time.perf_counter()
+        try:
+            chunks = self.application(environ, start_response)
+            try:
+                content = b"".join(chunks)
+            finally:
+                if hasattr(chunks, "close"):
+                    chunks.close()
+        except Exception:
+            self.samples.append(Sample(name, time.perf_counter() - started, 0))
+            raise
+        elapsed = time.perf_counter() - started
+
+        headers = captured.get("headers", [])
+        for header, value in headers:
+            if header.lower() == "set-cookie":
+                for key, morsel in SimpleCookie(value).items():
+                    if morsel["max-age"] == "0":
+                        self.cookies.pop(key, None)
+                    else:
+                        self.cookies[key] = morsel.value
+        status = captured.get("status", 0)
+        limited = status == 429 or (method == "POST" and status == 200 and RATE_LIMIT_MARKER in content)
+        self.samples.append(Sample(name, elapsed, status, limited))
+        return Response(status, dict(headers), content)
+
+    def get(self, path, data=None):
+        if data:
+            path = f"{path}?{urlencode(data)}"
+        return self.request("GET", path)
+
+    def post(self, path, data):
+        return self.request("POST", path, data)
+
+    def submit(self, form_path, data, action=None):
+        """GET a form page, then POST ``data`` with its CSRF token."""
+        page = self.get(form_path)
+        token = page.hidden("csrfmiddlewaretoken")
+        return self.post(action or form_path, {**data, "csrfmiddlewaretoken": token or ""})
+
+    def follow(self, response):
+        location = response.headers.get("Location")
+        if response.status_code in (301, 302) and location:
+            return self.get(urlsplit(location).path)
+        return response
+
+
+def student_journey(client, rng, index):
+    username = f"load-{index}-{rng.getrandbits(32):08x}"
+    response = client.submit(
+        "/register/",
+        {
+            "full_name": f"Load Student {index}",
+            "email": f"{username}@example.com",
+            "username": username,
+            "password1": PASSWORD,
+            "password2": PASSWORD,
+        },
+    )
+    if response.status_code != 302:
+        return
+    client.follow(response)
+
+    response = client.submit("/predict/", random_form_data(rng, index))
+    client.follow(response)
+
+    client.get("/exam/instructions/")
+    subject = ExamSubject.objects.filter(name=LOADTEST_SUBJECT).values_list("pk", flat=True).first()
+    page = client.get("/exam/", {"subject": subject, "start": "1"})
+    if page.status_code != 200:
+        return
+    answers = {
+        f"question_{pk.decode()}": rng.choice("ABCD") for pk in sorted(set(re.findall(rb'name="question_(\d+)"', page.content)))
+    }
+    response = client.post(
+        "/exam/",
+        {
+            **answers,
+            "subject_id": subject,
+            "exam_token": page.hidden("exam_token") or "",
+            "csrfmiddlewaretoken": page.hidden("csrfmiddlewaretoken") or "",
+        },
+    )
+    client.follow(response)
+    client.get("/logout/")
+
+
+def staff_journey(client, rng, index):
+    response = client.submit("/login/", {"username": STAFF_USERNAME, "password": PASSWORD})
+    if response.status_code != 302:
+        return
+    for path in ("/superadmin/", "/superadmin/users/", "/records/", "/superadmin/"):
+        client.get(path)
+    client.get("/logout/")
+
+
+JOURNEYS = {"student": student_journey, "staff": staff_journey}
+
+
+def seed_database(questions=20, seed=0):
+    rng = random.Random(seed)
+    get_user_model().objects.create_user(STAFF_USERNAME, password=PASSWORD, is_staff=True)
+    subject = ExamSubject.objects.create(name=LOADTEST_SUBJECT)
+    ExamQuestion.objects.bulk_create(
+        [
+            ExamQuestion(
+                subject=subject,
+                text=f"Load test question {index}",
+                option_a="A",
+                option_b="B",
+                option_c="C",
+                option_d="D",
+                correct_option=rng.choice("ABCD"),
+            )
+            for index in range(questions)
+        ]
+    )
+
+
+def run_worker(worker, mix, duration, iterations, seed):
+    """Run journeys until ``duration`` seconds pass or ``iterations`` are done."""
+    from django.db import close_old_connections
+
+    from student_performance.wsgi import application
+
+    rng = random.Random(seed * 1000 + worker)
+    names, weights = zip(*mix.items())
+    samples = []
+    failures = 0
+    deadline = time.monotonic() + duration if duration else None
+    done = 0
+    while (iterations is None or done < iterations) and (deadline is None or time.monotonic() < deadline):
+        # A distinct address per virtual user keeps per-IP limits realistic.
+        address = f"10.{worker % 250}.{(done // 250) % 250}.{done % 250 + 1}"
+        client = WSGIClient(application, samples, remote_addr=address)
+        journey = JOURNEYS[rng.choices(names, weights)[0]]
+        try:
+            journey(client, rng, f"{worker}-{done}")
+        except Exception:
+            failures += 1
+        done += 1
+    close_old_connections()
+    return samples, failures, done
+
+
+def summarize(samples, elapsed):
+    by_name = defaultdict(list)
+    for sample in samples:
+        by_name[sample.name].append(sample)
+
+    def percentile(ordered, fraction):
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+    report = {}
+    for name, group in sorted(by_name.items()):
+        ordered = sorted(sample.seconds for sample in group)
+        report[name] = {
+            "requests": len(group),
+            "throughput_rps": round(len(group) / elapsed, 2) if elapsed else None,
+            "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2),
+            "errors": sum(1 for sample in group if sample.status == 0 or sample.status >= 500),
+            "client_errors": sum(1 for sample in group if 400 <= sample.status < 500 and sample.status != 429),
+            "rate_limited": sum(1 for sample in group if sample.rate_limited),
+        }
+    return report
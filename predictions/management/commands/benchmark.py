@@ -0,0 +1,122 @@
+from pathlib import Path
+import fnmatch
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from predictions import benchmarks
+from predictions.ratelimit import get_rate_limiter
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "baseline.json"
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway SQLite test database with synthetic data and time the hot paths. "
+        "Writes JSON results and fails when a case is slower than the stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000, help="StudentPrediction rows to seed.")
+        parser.add_argument("--questions", type=int, default=2000, help="Questions in the benchmark exam.")
+        parser.add_argument("--repeat", type=int, default=3, help="Timed rounds per case.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--only", action="append", default=[], metavar="PATTERN", help="Run matching cases only.")
+        parser.add_argument("--output", help="Write results JSON to this path.")
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON to compare against.")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.25,
+            help="Allowed slowdown of a case's median against the baseline (0.25 = 25%%).",
+        )
+        parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline.")
+        parser.add_argument("--list", action="store_true", help="List the cases and exit.")
+
+    def handle(self, *args, **options):
+        if options["list"]:
+            for case in benchmarks.CASES:
+                self.stdout.write(case.name)
+            return
+        if connection.vendor != "sqlite":
+            raise CommandError("Benchmarks run against SQLite; set USE_SQLITE=1.")
+
+        cases = [
+            case
+            for case in benchmarks.CASES
+            if not options["only"] or any(fnmatch.fnmatch(case.name, pattern) for pattern in options["only"])
+        ]
+        if not cases:
+            raise CommandError("No benchmark matches --only.")
+
+        workdir = tempfile.TemporaryDirectory(prefix="benchmark-")
+        rate_limit_db = override_settings(RATE_LIMIT_DB_PATH=str(Path(workdir.name) / "ratelimit.sqlite3"))
+        rate_limit_db.enable()
+        get_rate_limiter.cache_clear()
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            data = benchmarks.BenchmarkData(
+                options["rows"], options["questions"], seed=options["seed"], workdir=workdir.name
+            )
+            started = time.perf_counter()
+            data.seed_database()
+            self.stdout.write(f"Seeded {options['rows']} predictions in {time.perf_counter() - started:.1f}s.")
+
+            results = {
+                "environment": benchmarks.environment(),
+                "parameters": {
+                    "rows": options["rows"],
+                    "questions": options["questions"],
+                    "repeat": options["repeat"],
+                    "seed": options["seed"],
+                },
+                "results": {},
+            }
+            self.stdout.write(f"{'CASE':<32} {'MEDIAN ms':>11} {'P95 ms':>11} {'OPS/S':>11}")
+            for case in cases:
+                summary = benchmarks.run_case(case, data, repeat=options["repeat"])
+                results["results"][case.name] = summary
+                self.stdout.write(
+                    f"{case.name:<32} {summary['median_ms']:>11.3f} {summary['p95_ms']:>11.3f} "
+                    f"{summary['ops_per_sec'] or 0:>11.1f}"
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+            rate_limit_db.disable()
+            get_rate_limiter.cache_clear()
+            workdir.cleanup()
+
+        if options["output"]:
+            benchmarks.dump(results, options["output"])
+            self.stdout.write(f"Results written to {options['output']}.")
+
+        baseline_path = Path(options["baseline"])
+        if options["save_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            benchmarks.dump(results, baseline_path)
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {baseline_path}."))
+            return
+        if not baseline_path.exists():
+            self.stdout.write(f"No baseline at {baseline_path}; run with --save-baseline to create one.")
+            return
+
+        baseline = benchmarks.load(baseline_path)
+        if baseline.get("parameters") != results["parameters"]:
+            self.stdout.write(self.style.WARNING("Baseline was recorded with different parameters."))
+        rows = benchmarks.compare(results, baseline, options["threshold"])
+        regressions = [row for row in rows if row["regressed"]]
+        for row in rows:
+            line = f"{row['name']:<32} {row['baseline']:>11.3f} -> {row['current']:>11.3f} ms  x{row['ratio']:.2f}"
+            self.stdout.write(self.style.ERROR(line) if row["regressed"] else line)
+        if regressions:
+            names = ", ".join(row["name"] for row in regressions)
+            raise CommandError(
+                f"{len(regressions)} benchmark(s) exceeded the {options['threshold']:.0%} threshold: {names}"
+            )
+        self.stdout.write(self.style.SUCCESS("No benchmark regressed past the threshold."))
@@ -0,0 +1,63 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from predictions.compiled import compile_estimator, max_difference
+from predictions.services import get_engine, to_feature_record
+from predictions.synthetic import random_form_batch
+
+
+def _per_call(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat
+
+
+class Command(BaseCommand):
+    help = "Compile the model's estimator to flat arrays, check it against sklearn and benchmark both."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5000, help="Synthetic rows used for the equality check.")
+        parser.add_argument("--batch-size", type=int, default=256, help="Rows per call in the batch benchmark.")
+        parser.add_argument("--repeat", type=int, default=200, help="Calls per benchmark.")
+        parser.add_argument("--tolerance", type=float, default=1e-9)
+
+    def handle(self, *args, **options):
+        engine = get_engine()
+        try:
+            compiled = compile_estimator(engine.estimator)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        records = [to_feature_record(row) for row in random_form_batch(options["rows"])]
+        features = engine.encode(records)
+        difference = max_difference(compiled, engine.estimator, features)
+        same_labels = np.array_equal(
+            compiled.predict_proba(features).argmax(axis=1),
+            engine.estimator.predict_proba(features).argmax(axis=1),
+        )
+        exact = np.array_equal(compiled.predict_proba(features), engine.estimator.predict_proba(features))
+        self.stdout.write(f"Estimator: {type(engine.estimator).__name__}")
+        self.stdout.write(f"Rows checked: {len(records)}")
+        self.stdout.write(f"Max probability difference: {difference:.3e} ({'bit-for-bit' if exact else 'within tolerance'})")
+
+        single = features[:1]
+        batch = features[: options["batch_size"]]
+        repeat = options["repeat"]
+        timings = [
+            ("single row", _per_call(lambda: engine.estimator.predict_proba(single), repeat),
+             _per_call(lambda: compiled.predict_proba(single), repeat)),
+            (f"batch of {len(batch)}", _per_call(lambda: engine.estimator.predict_proba(batch), repeat),
+             _per_call(lambda: compiled.predict_proba(batch), repeat)),
+        ]
+        for name, native, flat in timings:
+            self.stdout.write(
+                f"{name:>16}: sklearn {native * 1e6:9.1f} us  compiled {flat * 1e6:9.1f} us  "
+                f"({native / flat:.1f}x)"
+            )
+
+        if difference > options["tolerance"] or not same_labels:
+            raise CommandError("Compiled estimator does not match the original model.")
+        self.stdout.write(self.style.SUCCESS("Compiled estimator matches the original model."))
@@ -0,0 +1,21 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from predictions.models import ApiToken
+
+
+class Command(BaseCommand):
+    help = "Create an API token for a user of the JSON prediction API."
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument("--name", default="", help="Label for the token, e.g. the integration using it.")
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['username']}' not found.")
+        token = ApiToken.objects.create(user=user, name=options["name"])
+        self.stdout.write(token.key)
@@ -0,0 +1,187 @@
+from datetime import timedelta
+import re
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from predictions import views
+from predictions.attempts import get_attempts
+from predictions.models import ExamQuestion, ExamSubject
+from predictions.pagination import encode_cursor
+from predictions.question_sets import get_question_banks
+
+# Tables that are small by design; scanning them is fine.
+SMALL_TABLES = {"predictions_examsubject", "predictions_counter", "django_content_type", "django_site"}
+
+
+def _explain_sqlite(cursor, sql):
+    cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+    details = [row[-1] for row in cursor.fetchall()]
+    flags = []
+    for detail in details:
+        scan = re.match(r"SCAN (\w+)", detail)
+        if scan and "INDEX" not in detail and scan.group(1) not in SMALL_TABLES:
+            flags.append(f"full scan of {scan.group(1)}")
+        if "USE TEMP B-TREE" in detail:
+            flags.append("filesort (" + detail.split("USE TEMP B-TREE FOR ", 1)[-1].lower() + ")")
+    return details, flags
+
+
+def _explain_mysql(cursor, sql):
+    cursor.execute(f"EXPLAIN {sql}")
+    columns = [column[0].lower() for column in cursor.description]
+    details = []
+    flags = []
+    for values in cursor.fetchall():
+        row = dict(zip(columns, values))
+        extra = row.get("extra") or ""
+        table = row.get("table") or ""
+        details.append(
+            f"{table}: type={row.get('type')} key={row.get('key')} rows={row.get('rows')} {extra}".strip()
+        )
+        if row.get("type") == "ALL" and table not in SMALL_TABLES:
+            flags.append(f"full scan of {table}")
+        if "Using filesort" in extra:
+            flags.append(f"filesort on {table}")
+        if "Using temporary" in extra:
+            flags.append(f"temporary table on {table}")
+    return details, flags
+
+
+EXPLAINERS = {"sqlite": _explain_sqlite, "mysql": _explain_mysql}
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the list views with real querysets, EXPLAIN every SELECT they run and flag full table "
+        "scans and filesorts. Runs inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Student username to render student pages as (default: any non-staff user).")
+        parser.add_argument("--staff-user", help="Staff username for staff pages (default: any staff user).")
+        parser.add_argument("--view", action="append", default=[], help="Only explain these views.")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print plans for unflagged queries too.")
+        parser.add_argument("--fail-on-flags", action="store_true", help="Exit non-zero when any query is flagged.")
+
+    def _user(self, username, staff):
+        User = get_user_model()
+        if username:
+            user = User.objects.filter(username=username).first()
+            if user is None:
+                raise CommandError(f"User '{username}' does not exist.")
+            return user
+        user = User.objects.filter(is_staff=staff, is_active=True).order_by("pk").first()
+        if user is None:
+            # Rolled back with everything else.
+            user = User.objects.create_user(f"explain-{uuid.uuid4().hex[:8]}", is_staff=staff)
+        return user
+
+    def _subject(self):
+        subject = ExamSubject.objects.filter(is_active=True, questions__is_active=True).first()
+        if subject is None:
+            subject = ExamSubject.objects.create(name=f"explain-{uuid.uuid4().hex[:8]}")
+            ExamQuestion.objects.create(
+                subject=subject, text="?", option_a="A", option_b="B", option_c="C", option_d="D", correct_option="A"
+            )
+        return subject
+
+    def _request(self, path, user, data=None, session=None):
+        request = RequestFactory().get(path, data or {})
+        request.user = user
+        request.session = SessionStore()
+        request.session.update(session or {})
+        request._messages = FallbackStorage(request)
+        return request
+
+    def _scenarios(self, student, staff, subject):
+        today = timezone.localdate()
+        attempt = get_attempts().start(student.pk, get_question_banks().get(subject.pk).subject)
+        exam_session = {"exam_attempt": attempt.token}
+        # Any key works: the plan of a deep page does not depend on its depth.
+        cursor = encode_cursor("next", [timezone.now() - timedelta(days=365), 1])
+        return [
+            ("records", views.records, self._request("/records/", staff)),
+            ("records (deep page)", views.records, self._request("/records/", staff, {"cursor": cursor})),
+            ("student_history", views.student_history, self._request("/history/", student)),
+            (
+                "student_history (deep page)",
+                views.student_history,
+                self._request("/history/", student, {"cursor": cursor}),
+            ),
+            ("analytics", views.analytics, self._request("/analytics/", student)),
+            (
+                "analytics (filtered)",
+                views.analytics,
+                self._request(
+                    "/analytics/",
+                    student,
+                    {"result": "PASS", "start": str(today - timedelta(days=30)), "end": str(today)},
+                ),
+            ),
+            ("dashboard", views.dashboard, self._request("/superadmin/", staff)),
+            ("exam", views.exam, self._request("/exam/", student, {"subject": subject.pk}, exam_session)),
+            ("exam_history", views.exam_history, self._request("/exam/history/", student)),
+            ("exam_management", views.exam_management, self._request("/superadmin/exams/", staff)),
+            ("user_management", views.user_management, self._request("/superadmin/users/", staff)),
+            (
+                "user_management (deep page)",
+                views.user_management,
+                self._request("/superadmin/users/", staff, {"cursor": cursor}),
+            ),
+        ]
+
+    def handle(self, *args, **options):
+        explain = EXPLAINERS.get(connection.vendor)
+        if explain is None:
+            raise CommandError(f"EXPLAIN parsing is not implemented for {connection.vendor}.")
+
+        flagged = 0
+        with transaction.atomic():
+            student = self._user(options["user"], staff=False)
+            staff = self._user(options["staff_user"], staff=True)
+            subject = self._subject()
+            for name, view, request in self._scenarios(student, staff, subject):
+                if options["view"] and name.split(" ")[0] not in options["view"]:
+                    continue
+                with CaptureQueriesContext(connection) as captured:
+                    response = view(request)
+                    if hasattr(response, "render"):
+                        response.render()
+                selects = [
+                    query["sql"]
+                    for query in captured.captured_queries
+                    if query["sql"].lstrip().upper().startswith("SELECT")
+                ]
+                self.stdout.write(
+                    self.style.MIGRATE_HEADING(f"{name}: {len(selects)} SELECTs, HTTP {response.status_code}")
+                )
+                with connection.cursor() as cursor:
+                    for sql in selects:
+                        details, flags = explain(cursor, sql)
+                        if flags:
+                            flagged += 1
+                            self.stdout.write(self.style.WARNING(f"  ! {', '.join(flags)}"))
+                        elif not options["verbose_plans"]:
+                            continue
+                        else:
+                            self.stdout.write("  ok")
+                        self.stdout.write(f"    {sql[:300]}")
+                        for detail in details:
+                            self.stdout.write(f"      {detail}")
+            transaction.set_rollback(True)
+
+        if flagged:
+            message = f"{flagged} queries use a full scan or filesort."
+            if options["fail_on_flags"]:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS("No full scans or filesorts."))
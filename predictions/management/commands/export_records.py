@@ -0,0 +1,58 @@
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from predictions.exports import EXPORTS, FORMATS, ExportError, filtered_queryset, gzip_chunks, render_chunks
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream predictions or exam results to CSV or NDJSON, optionally gzipped, in constant memory. "
+        "Filters match the analytics page."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=list(EXPORTS))
+        parser.add_argument("--format", choices=list(FORMATS), default="csv")
+        parser.add_argument("--output", default="-", help="Output path, or '-' for stdout.")
+        parser.add_argument("--gzip", action="store_true", help="Compress the output with gzip.")
+        parser.add_argument("--result", choices=["PASS", "FAIL", "pass", "fail"], default="")
+        parser.add_argument("--start", help="First day to include (YYYY-MM-DD, local time).")
+        parser.add_argument("--end", help="Last day to include (YYYY-MM-DD, local time).")
+        parser.add_argument("--user", help="Only this username's rows.")
+        parser.add_argument("--subject", help="Exam subject id or name (exam-results only).")
+        parser.add_argument("--chunk-size", type=int, default=settings.EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            queryset = filtered_queryset(
+                options["kind"],
+                result=options["result"],
+                start=options["start"],
+                end=options["end"],
+                user=options["user"],
+                subject=options["subject"],
+            )
+            chunks = render_chunks(options["kind"], queryset, options["format"], options["chunk_size"])
+        except ExportError as exc:
+            raise CommandError(str(exc))
+
+        chunks = gzip_chunks(chunks) if options["gzip"] else (chunk.encode() for chunk in chunks)
+        target = sys.stdout.buffer if options["output"] == "-" else open(options["output"], "wb")
+        started = time.perf_counter()
+        written = 0
+        try:
+            for chunk in chunks:
+                target.write(chunk)
+                written += len(chunk)
+        finally:
+            if target is not sys.stdout.buffer:
+                target.close()
+            else:
+                target.flush()
+        if options["output"] != "-":
+            self.stderr.write(
+                f"Wrote {written / 1e6:.1f} MB to {options['output']} in {time.perf_counter() - started:.1f}s."
+            )
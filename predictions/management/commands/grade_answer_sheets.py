@@ -0,0 +1,146 @@
+from itertools import islice
+import csv
+import sys
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from predictions.models import ExamResult, ExamSubject
+from predictions.question_sets import get_question_banks
+
+OUTPUT_COLUMNS = ["score", "total_questions", "correct_count", "wrong_count", "percentage", "passed", "error"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Grade scanned (OMR) or exported answer sheets from a CSV in vectorized batches and save them as "
+        "ExamResults. Rows carry a username and either an 'answers' string in question order "
+        "(A-D, with -, . or a space for unanswered) or one question_<id> column per question."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("subject", help="Exam subject id or name.")
+        parser.add_argument("input", help="Input CSV path, or '-' for stdin.")
+        parser.add_argument("--user-column", default="username")
+        parser.add_argument("--answers-column", default="answers", help="Positional answer string column.")
+        parser.add_argument("--output", help="Write input rows plus grading columns to this CSV ('-' for stdout).")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Sheets graded and saved per batch.")
+        parser.add_argument("--dry-run", action="store_true", help="Grade without saving results.")
+
+    def _question_set(self, subject):
+        subject_id = subject if subject.isdigit() else (
+            ExamSubject.objects.filter(name=subject).values_list("pk", flat=True).first()
+        )
+        bank = get_question_banks().get(subject_id) if subject_id else None
+        if bank is None:
+            raise CommandError(f"No active exam subject '{subject}'.")
+        if not bank.size:
+            raise CommandError(f"Subject '{bank.subject.name}' has no active questions.")
+        if bank.samples:
+            raise CommandError(
+                f"Subject '{bank.subject.name}' draws {bank.subject.questions_per_attempt} random questions per "
+                "attempt; answer sheets need a subject that serves every question."
+            )
+        return bank.question_set()
+
+    def _answers(self, row, answer_key, positional, question_columns):
+        if positional:
+            # Spaces are blank marks; short sheets had their trailing blanks trimmed.
+            sheet = (row.get(positional) or "").upper()
+            if len(sheet) > len(answer_key):
+                raise ValueError(f"expected {len(answer_key)} answers, got {len(sheet)}")
+            return sheet
+        return {
+            question_id: (row.get(column) or "").strip().upper() for question_id, column in question_columns
+        }
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] <= 0:
+            raise CommandError("--chunk-size must be positive.")
+        question_set = self._question_set(options["subject"])
+        answer_key = question_set.grading_key
+        User = get_user_model()
+
+        source = sys.stdin if options["input"] == "-" else open(options["input"], newline="", encoding="utf-8")
+        target = None
+        try:
+            reader = csv.DictReader(source)
+            header = reader.fieldnames or []
+            if options["user_column"] not in header:
+                raise CommandError(f"CSV has no '{options['user_column']}' column.")
+            positional = options["answers_column"] if options["answers_column"] in header else None
+            question_columns = [
+                (question_id, f"question_{question_id}")
+                for question_id in answer_key.question_ids
+                if f"question_{question_id}" in header
+            ]
+            if not positional and not question_columns:
+                raise CommandError(
+                    f"CSV needs an '{options['answers_column']}' column or question_<id> columns."
+                )
+
+            writer = None
+            if options["output"]:
+                target = sys.stdout if options["output"] == "-" else open(
+                    options["output"], "w", newline="", encoding="utf-8"
+                )
+                writer = csv.writer(target)
+                writer.writerow(header + OUTPUT_COLUMNS)
+
+            started = time.perf_counter()
+            total = graded = errors = 0
+            while chunk := list(islice(reader, options["chunk_size"])):
+                usernames = {row.get(options["user_column"], "").strip() for row in chunk}
+                user_ids = dict(User.objects.filter(username__in=usernames).values_list("username", "pk"))
+
+                sheets = answer_key.empty(len(chunk))
+                owners = [None] * len(chunk)
+                problems = [""] * len(chunk)
+                for position, row in enumerate(chunk):
+                    owners[position] = user_ids.get(row.get(options["user_column"], "").strip())
+                    if owners[position] is None:
+                        problems[position] = "unknown user"
+                        continue
+                    try:
+                        answer_key.encode_answers(
+                            self._answers(row, answer_key, positional, question_columns), out=sheets[position]
+                        )
+                    except ValueError as exc:
+                        problems[position] = str(exc)
+
+                grades = answer_key.grade(sheets)
+                results = [
+                    ExamResult(user_id=owner, subject_id=question_set.subject.id, **grade.as_result_fields())
+                    for owner, grade, problem in zip(owners, grades, problems)
+                    if not problem
+                ]
+                if results and not options["dry_run"]:
+                    with transaction.atomic():
+                        ExamResult.objects.bulk_create(results, batch_size=1000)
+
+                if writer:
+                    for row, grade, problem in zip(chunk, grades, problems):
+                        fields = grade.as_result_fields()
+                        values = [""] * 6 if problem else [fields[column] for column in OUTPUT_COLUMNS[:-1]]
+                        writer.writerow([row.get(column, "") for column in header] + values + [problem])
+                total += len(chunk)
+                graded += len(results)
+                errors += len(chunk) - len(results)
+                if options["verbosity"] > 1:
+                    self.stderr.write(f"{total} sheets, {total / (time.perf_counter() - started):.0f} sheets/sec")
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if target is not None and target is not sys.stdout:
+                target.close()
+
+        elapsed = time.perf_counter() - started
+        rate = total / elapsed if elapsed else 0
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"Graded {graded} of {total} sheets for {question_set.subject.name} ({errors} rejected, "
+                f"{0 if options['dry_run'] else graded} saved) in {elapsed:.2f}s, {rate:.0f} sheets/sec."
+            )
+        )
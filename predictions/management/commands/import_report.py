@@ -0,0 +1,118 @@
+from collections import defaultdict
+import json
+import os
+import subprocess
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter so nothing is already imported.
+PROBE = """
+import importlib, json, os, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+for name in sys.argv[1:]:
+    importlib.import_module(name)
+print(json.dumps({"seconds": time.perf_counter() - started}))
+"""
+
+
+def parse_importtime(output):
+    """Return ``(module, self_us, cumulative_us, depth)`` rows from ``-X importtime`` output."""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        except ValueError:
+            continue
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Report per-module import cost of a cold start (django.setup() plus --module) and fail when it "
+        "exceeds --max-seconds or imports a --forbid package."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--module",
+            action="append",
+            default=[],
+            help="Module to import after django.setup(); defaults to the URLconf, which every command's checks load.",
+        )
+        parser.add_argument("--top", type=int, default=20, help="Modules to list by self time.")
+        parser.add_argument("--runs", type=int, default=3, help="Cold starts to measure; the fastest is reported.")
+        parser.add_argument("--max-seconds", type=float, help="Fail when the fastest cold start is slower than this.")
+        parser.add_argument(
+            "--forbid",
+            default="numpy,pandas,scipy,sklearn",
+            help="Comma-separated packages that must not be imported at startup ('' to allow all).",
+        )
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+
+    def _measure(self, modules):
+        environment = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE, *modules],
+            capture_output=True,
+            text=True,
+            env=environment,
+        )
+        if completed.returncode != 0:
+            raise CommandError(f"Import failed:\n{completed.stderr[-2000:]}")
+        seconds = json.loads(completed.stdout.strip().splitlines()[-1])["seconds"]
+        return seconds, parse_importtime(completed.stderr)
+
+    def handle(self, *args, **options):
+        modules = options["module"] or [os.environ.get("ROOT_URLCONF", "student_performance.urls")]
+        runs = [self._measure(modules) for _ in range(max(1, options["runs"]))]
+        seconds, rows = min(runs, key=lambda run: run[0])
+
+        packages = defaultdict(int)
+        for name, self_us, _, _ in rows:
+            packages[name.split(".")[0]] += self_us
+        imported = {name.split(".")[0] for name, _, _, _ in rows}
+        forbidden = sorted(imported & {name.strip() for name in options["forbid"].split(",") if name.strip()})
+
+        report = {
+            "modules": modules,
+            "seconds": round(seconds, 4),
+            "imported_modules": len(rows),
+            "packages_ms": {
+                name: round(total / 1000, 2)
+                for name, total in sorted(packages.items(), key=lambda item: item[1], reverse=True)
+            },
+            "slowest_ms": [
+                {"module": name, "self_ms": round(self_us / 1000, 2), "cumulative_ms": round(cumulative / 1000, 2)}
+                for name, self_us, cumulative, _ in sorted(rows, key=lambda row: row[1], reverse=True)[: options["top"]]
+            ],
+            "forbidden": forbidden,
+        }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.stdout.write(
+                f"Cold start ({', '.join(modules)}): {seconds:.3f}s, {len(rows)} modules imported "
+                f"(fastest of {len(runs)})."
+            )
+            self.stdout.write(f"\n{'PACKAGE':<32} {'SELF ms':>10}")
+            for name, total in list(report["packages_ms"].items())[:15]:
+                self.stdout.write(f"{name:<32} {total:>10.2f}")
+            self.stdout.write(f"\n{'MODULE':<48} {'SELF ms':>10} {'CUMUL ms':>10}")
+            for row in report["slowest_ms"]:
+                self.stdout.write(f"{row['module']:<48} {row['self_ms']:>10.2f} {row['cumulative_ms']:>10.2f}")
+
+        problems = []
+        if forbidden:
+            problems.append(f"heavy packages imported at startup: {', '.join(forbidden)}")
+        if options["max_seconds"] is not None and seconds > options["max_seconds"]:
+            problems.append(f"cold start took {seconds:.3f}s, over the {options['max_seconds']:.3f}s budget")
+        if problems:
+            raise CommandError("; ".join(problems))
@@ -0,0 +1,50 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from predictions import item_analysis
+from predictions.models import ExamSubject
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold new exam attempts into the per-question item statistics shown on exam management, "
+        "and optionally print a subject's report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rebuild", action="store_true", help="Drop the statistics and process every attempt.")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Attempts processed per transaction.")
+        parser.add_argument("--subject", help="Print the item report for this subject id or name.")
+        parser.add_argument("--limit", type=int, default=50, help="Questions in the printed report.")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] <= 0:
+            raise CommandError("--chunk-size must be positive.")
+        started = time.perf_counter()
+        refresh = item_analysis.rebuild if options["rebuild"] else item_analysis.refresh
+        processed = refresh(chunk_size=options["chunk_size"], settle_seconds=settings.ITEM_ANALYSIS_SETTLE_SECONDS)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed {processed} attempts in {elapsed:.2f}s"
+                f" ({processed / elapsed if elapsed else 0:.0f} attempts/sec)."
+            )
+        )
+
+        if options["subject"]:
+            subject = options["subject"]
+            subject = ExamSubject.objects.filter(**{"pk" if subject.isdigit() else "name": subject}).first()
+            if subject is None:
+                raise CommandError(f"No exam subject '{options['subject']}'.")
+            items, analysed = item_analysis.report(subject.pk, limit=options["limit"])
+            self.stdout.write(f"{subject.name}: {analysed} questions analysed, weakest discrimination first.")
+            self.stdout.write(f"{'id':>8} {'n':>8} {'p':>6} {'r_pb':>6}   A    B    C    D  blank  flags")
+            for item in items:
+                discrimination = "-" if item.discrimination is None else f"{item.discrimination:.2f}"
+                shares = " ".join(f"{share:4.0%}" for share in item.choices)
+                self.stdout.write(
+                    f"{item.question_id:>8} {item.attempts:>8} {item.difficulty:>6.2f} {discrimination:>6} "
+                    f"{shares}  {', '.join(item.flags)}"
+                )
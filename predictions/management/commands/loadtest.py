@@ -0,0 +1,140 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import json
+import multiprocessing
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import override_settings
+
+from predictions import loadtest
+from predictions.ratelimit import get_rate_limiter
+from predictions.services import get_engine
+
+
+def _parse_mix(value):
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in loadtest.JOURNEYS:
+            raise CommandError(f"Unknown journey '{name}'. Choose from: {', '.join(loadtest.JOURNEYS)}.")
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise CommandError(f"Invalid weight in --mix item '{item}'.")
+    return mix
+
+
+def _process_worker(arguments):
+    return loadtest.run_worker(*arguments)
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the WSGI application in-process from many threads or processes with scripted user "
+        "journeys and report throughput and latency percentiles per URL name."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=8, help="Concurrent virtual users.")
+        parser.add_argument("--mode", choices=["thread", "process"], default="thread")
+        parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run; 0 to rely on --iterations.")
+        parser.add_argument("--iterations", type=int, help="Journeys per virtual user.")
+        parser.add_argument("--mix", default="student=9,staff=1", help="Journey weights, e.g. student=9,staff=1.")
+        parser.add_argument("--questions", type=int, default=20, help="Questions in the load test exam.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--fast-passwords",
+            action="store_true",
+            help="Hash passwords with MD5 so register/login do not dominate the run.",
+        )
+        parser.add_argument("--output", help="Write the report as JSON to this path.")
+
+    def handle(self, *args, **options):
+        mix = _parse_mix(options["mix"])
+        if not options["duration"] and not options["iterations"]:
+            raise CommandError("Give --duration or --iterations.")
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency must be at least 1.")
+
+        overrides = {}
+        if options["fast_passwords"]:
+            overrides["PASSWORD_HASHERS"] = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+        with tempfile.TemporaryDirectory() as directory:
+            # Fresh rate-limit counters for every run.
+            overrides["RATE_LIMIT_DB_PATH"] = str(Path(directory) / "ratelimit.sqlite3")
+            with override_settings(**overrides):
+                get_rate_limiter.cache_clear()
+                report = self._run_in_test_database(directory, options, mix)
+            get_rate_limiter.cache_clear()
+
+        self._print(report)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                json.dump(report, handle, indent=2)
+                handle.write("\n")
+            self.stdout.write(f"Report written to {options['output']}.")
+
+    def _run_in_test_database(self, directory, options, mix):
+        if connection.vendor == "sqlite":
+            # A file, not the shared in-memory database, so threads and processes can write concurrently.
+            connection.settings_dict.setdefault("TEST", {})["NAME"] = str(Path(directory) / "loadtest.sqlite3")
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            loadtest.seed_database(questions=options["questions"], seed=options["seed"])
+            return self._run(options, mix)
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def _run(self, options, mix):
+        jobs = [
+            (worker, mix, options["duration"], options["iterations"], options["seed"])
+            for worker in range(options["concurrency"])
+        ]
+        # Load the model up front so the first journeys do not pay for it.
+        get_engine()
+        started = time.perf_counter()
+        if options["mode"] == "process":
+            # Children inherit the test database settings and the loaded model through fork.
+            connections.close_all()
+            with multiprocessing.get_context("fork").Pool(options["concurrency"]) as pool:
+                outcomes = pool.map(_process_worker, jobs)
+        else:
+            with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+                outcomes = list(executor.map(lambda job: loadtest.run_worker(*job), jobs))
+        elapsed = time.perf_counter() - started
+
+        samples = [sample for worker_samples, _, _ in outcomes for sample in worker_samples]
+        return {
+            "mode": options["mode"],
+            "concurrency": options["concurrency"],
+            "mix": mix,
+            "elapsed_seconds": round(elapsed, 2),
+            "journeys": sum(done for _, _, done in outcomes),
+            "failed_journeys": sum(failures for _, failures, _ in outcomes),
+            "requests": len(samples),
+            "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else None,
+            "urls": loadtest.summarize(samples, elapsed),
+        }
+
+    def _print(self, report):
+        self.stdout.write(
+            f"{report['journeys']} journeys, {report['requests']} requests in {report['elapsed_seconds']}s "
+            f"({report['throughput_rps']} req/s, {report['mode']} x{report['concurrency']})."
+        )
+        self.stdout.write(
+            f"{'URL':<42} {'REQS':>6} {'RPS':>8} {'P50 ms':>9} {'P95 ms':>9} {'P99 ms':>9} {'ERR':>5} {'4XX':>5} {'429':>5}"
+        )
+        for name, row in report["urls"].items():
+            self.stdout.write(
+                f"{name:<42} {row['requests']:>6} {row['throughput_rps']:>8.1f} {row['p50_ms']:>9.1f} "
+                f"{row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['errors']:>5} {row['client_errors']:>5} "
+                f"{row['rate_limited']:>5}"
+            )
+        if report["failed_journeys"]:
+            self.stdout.write(self.style.WARNING(f"{report['failed_journeys']} journeys raised an exception."))
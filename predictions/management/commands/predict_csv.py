@@ -0,0 +1,185 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import csv
+import sys
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from predictions.counters import record_predictions
+from predictions.forms import StudentPredictionForm, clean_prediction_data
+from predictions.models import StudentPrediction
+from predictions.services import FORM_FEATURE_MAP, get_engine, to_feature_record
+
+FEATURE_ALIASES = {field: feature for feature, field in FORM_FEATURE_MAP.items()}
+OUTPUT_COLUMNS = ["prediction", "confidence", "error"]
+
+
+def _init_worker():
+    import django
+
+    django.setup()
+
+
+def score_chunk(rows, mapping):
+    """
+    Validate ``rows`` and score the valid ones in one batch. Returns
+    ``(cleaned_data or None, error, label, confidence, model_version)`` per row.
+    """
+    results = []
+    valid = []
+    for row in rows:
+        cleaned, errors = clean_prediction_data({field: row.get(column, "") for field, column in mapping.items()})
+        if errors:
+            message = "; ".join(f"{name}: {' '.join(messages)}" for name, messages in errors.items())
+            results.append([None, message, None, None, None])
+        else:
+            valid.append(len(results))
+            results.append([cleaned, "", None, None, None])
+
+    if valid:
+        outcome = get_engine().run([to_feature_record(results[index][0]) for index in valid])
+        for position, index in enumerate(valid):
+            results[index][2] = outcome.labels[position]
+            results[index][3] = outcome.confidences[position]
+            results[index][4] = outcome.model_version
+    return results
+
+
+class Command(BaseCommand):
+    help = "Stream a CSV of students through the model in vectorized chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("input", help="Input CSV path, or '-' for stdin.")
+        parser.add_argument("--output", help="Write input rows plus prediction columns to this CSV ('-' for stdout).")
+        parser.add_argument("--save", action="store_true", help="Store valid rows as StudentPrediction records.")
+        parser.add_argument("--user", help="Username that owns saved predictions.")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument("--workers", type=int, default=0, help="Score chunks in a process pool of this size.")
+        parser.add_argument(
+            "--map",
+            action="append",
+            default=[],
+            metavar="FIELD=COLUMN",
+            help="Read a form field from a differently named CSV column.",
+        )
+
+    def _mapping(self, header, overrides):
+        mapping = {}
+        for field in StudentPredictionForm.base_fields:
+            if field in header:
+                mapping[field] = field
+            elif FEATURE_ALIASES.get(field) in header:
+                mapping[field] = FEATURE_ALIASES[field]
+        for item in overrides:
+            field, _, column = item.partition("=")
+            if field not in StudentPredictionForm.base_fields or not column:
+                raise CommandError(f"Invalid --map value '{item}'.")
+            mapping[field] = column
+        missing = [
+            field for field in StudentPredictionForm.base_fields
+            if field not in mapping or mapping[field] not in header
+        ]
+        if missing:
+            raise CommandError(f"CSV is missing columns for: {', '.join(missing)}")
+        return mapping
+
+    def _chunks(self, reader, size):
+        while True:
+            chunk = list(islice(reader, size))
+            if not chunk:
+                return
+            yield chunk
+
+    def _scored_chunks(self, chunks, mapping, workers):
+        if workers <= 0:
+            for chunk in chunks:
+                yield chunk, score_chunk(chunk, mapping)
+            return
+        # Keep a bounded number of chunks in flight so memory does not grow with the file.
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            in_flight = []
+            for chunk in chunks:
+                in_flight.append((chunk, pool.submit(score_chunk, chunk, mapping)))
+                if len(in_flight) >= workers * 2:
+                    chunk, future = in_flight.pop(0)
+                    yield chunk, future.result()
+            for chunk, future in in_flight:
+                yield chunk, future.result()
+
+    def handle(self, *args, **options):
+        if not options["output"] and not options["save"]:
+            raise CommandError("Nothing to do: pass --output and/or --save.")
+        if options["chunk_size"] <= 0:
+            raise CommandError("--chunk-size must be positive.")
+
+        owner = None
+        if options["user"]:
+            try:
+                owner = get_user_model().objects.get(username=options["user"])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"User '{options['user']}' not found.")
+
+        source = sys.stdin if options["input"] == "-" else open(options["input"], newline="", encoding="utf-8")
+        target = None
+        try:
+            reader = csv.DictReader(source)
+            header = reader.fieldnames or []
+            mapping = self._mapping(header, options["map"])
+            writer = None
+            if options["output"]:
+                target = sys.stdout if options["output"] == "-" else open(
+                    options["output"], "w", newline="", encoding="utf-8"
+                )
+                writer = csv.writer(target)
+                writer.writerow(header + OUTPUT_COLUMNS)
+
+            get_engine()
+            started = time.perf_counter()
+            total = invalid = saved = 0
+            chunks = self._chunks(reader, options["chunk_size"])
+            for chunk, results in self._scored_chunks(chunks, mapping, options["workers"]):
+                records = []
+                for row, (cleaned, error, label, confidence, version) in zip(chunk, results):
+                    if writer:
+                        writer.writerow(
+                            [row.get(column, "") for column in header]
+                            + [label or "", "" if confidence is None else f"{confidence:.6f}", error]
+                        )
+                    if cleaned is None:
+                        invalid += 1
+                    elif options["save"]:
+                        records.append(
+                            StudentPrediction(
+                                user=owner,
+                                prediction=label,
+                                confidence=confidence,
+                                model_version=version,
+                                **cleaned,
+                            )
+                        )
+                if records:
+                    with transaction.atomic():
+                        StudentPrediction.objects.bulk_create(records, batch_size=1000)
+                        record_predictions(records)
+                    saved += len(records)
+                total += len(chunk)
+                if options["verbosity"] > 1:
+                    elapsed = time.perf_counter() - started
+                    self.stderr.write(f"{total} rows, {total / elapsed:.0f} rows/sec")
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if target is not None and target is not sys.stdout:
+                target.close()
+
+        elapsed = time.perf_counter() - started
+        rate = total / elapsed if elapsed else 0
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"Scored {total - invalid} of {total} rows ({invalid} invalid, {saved} saved) "
+                f"in {elapsed:.2f}s, {rate:.0f} rows/sec."
+            )
+        )
@@ -0,0 +1,85 @@
+import multiprocessing
+from pathlib import Path
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+
+from predictions.ratelimit import ALGORITHMS, CacheRateLimitBackend, RateLimiter, SQLiteRateLimitBackend
+
+
+def _hammer(arguments):
+    backend_name, path, algorithm, key, limit, window, checks = arguments
+    backend = (
+        SQLiteRateLimitBackend(path)
+        if backend_name == "sqlite"
+        else CacheRateLimitBackend(settings.RATE_LIMIT_CACHE_ALIAS)
+    )
+    limiter = RateLimiter(backend, algorithm)
+    allowed = 0
+    started = time.perf_counter()
+    for _ in range(checks):
+        if not limiter.hit(key, limit, window).limited:
+            allowed += 1
+    return allowed, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure rate-limiter throughput from several processes hitting one key, and check that "
+        "exactly --limit requests were let through."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=4)
+        parser.add_argument("--checks", type=int, default=5000, help="Checks per process.")
+        parser.add_argument("--limit", type=int, default=1000)
+        parser.add_argument("--backend", choices=["sqlite", "cache", "all"], default="all")
+        parser.add_argument("--algorithm", choices=[*ALGORITHMS, "all"], default="all")
+
+    def handle(self, *args, **options):
+        backends = ["sqlite", "cache"] if options["backend"] == "all" else [options["backend"]]
+        algorithms = ALGORITHMS if options["algorithm"] == "all" else [options["algorithm"]]
+        total = options["processes"] * options["checks"]
+        # A long window keeps the run inside one window; the token bucket then barely refills.
+        window = 86400
+
+        self.stdout.write(
+            f"{options['processes']} processes x {options['checks']} checks, limit {options['limit']}.\n"
+            f"{'BACKEND':<8} {'ALGORITHM':<13} {'CHECKS/S':>10} {'US/CHECK':>9} {'ALLOWED':>8}  ACCURATE"
+        )
+        # Each process has its own LocMemCache, so there the limit is multiplied by --processes.
+        per_process_cache = isinstance(caches[settings.RATE_LIMIT_CACHE_ALIAS], LocMemCache)
+        failures = []
+        context = multiprocessing.get_context("fork")
+        with tempfile.TemporaryDirectory() as directory:
+            for backend in backends:
+                for algorithm in algorithms:
+                    if backend == "cache" and algorithm == "token_bucket":
+                        continue
+                    path = str(Path(directory) / f"{algorithm}.sqlite3")
+                    jobs = [
+                        (backend, path, algorithm, "bench", options["limit"], window, options["checks"])
+                    ] * options["processes"]
+                    started = time.perf_counter()
+                    with context.Pool(options["processes"]) as pool:
+                        outcomes = pool.map(_hammer, jobs)
+                    elapsed = time.perf_counter() - started
+                    allowed = sum(count for count, _ in outcomes)
+                    busy = sum(seconds for _, seconds in outcomes)
+                    expected = min(options["limit"], total)
+                    accurate = allowed == expected if algorithm != "token_bucket" else expected <= allowed <= expected + 1
+                    note = "yes" if accurate else "NO"
+                    if not accurate and backend == "cache" and per_process_cache:
+                        note = "no (LocMemCache is per process)"
+                    elif not accurate:
+                        failures.append(f"{backend}/{algorithm} allowed {allowed}, expected {expected}")
+                    self.stdout.write(
+                        f"{backend:<8} {algorithm:<13} {total / elapsed:>10.0f} {busy / total * 1e6:>9.1f} "
+                        f"{allowed:>8}  {note}"
+                    )
+        if failures:
+            raise CommandError("; ".join(failures))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from predictions.counters import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-user daily PASS/FAIL rollups that power the analytics page."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, action="append", dest="users", help="Only rebuild this user id.")
+
+    def handle(self, *args, **options):
+        written = rebuild_rollups(user_ids=options["users"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} daily rollup rows."))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from predictions.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = "Recount the dashboard counters from the source tables and fix any drift. Safe to run from cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Report drift without correcting it.")
+
+    def handle(self, *args, **options):
+        drift = reconcile(dry_run=options["dry_run"])
+        for key, (stored, actual) in sorted(drift.items()):
+            self.stdout.write(f"{key:<40} {stored:>12} -> {actual:>12}")
+        verb = "found" if options["dry_run"] else "corrected"
+        self.stdout.write(self.style.SUCCESS(f"{len(drift)} drifted counter(s) {verb}."))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from predictions.services import get_registry
+
+
+class Command(BaseCommand):
+    help = "Copy a trained model artifact into the model registry, optionally making it active."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Pickled scikit-learn pipeline to register.")
+        parser.add_argument("--activate", action="store_true", help="Serve this artifact from now on.")
+
+    def handle(self, *args, **options):
+        registry = get_registry()
+        try:
+            target = registry.register(options["path"])
+            if options["activate"]:
+                registry.activate(target.name)
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+        except Exception as exc:
+            raise CommandError(f"Could not load the artifact: {exc}")
+        state = "active" if options["activate"] else "registered"
+        self.stdout.write(self.style.SUCCESS(f"{target.name} {state}."))
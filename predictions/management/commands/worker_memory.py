@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from predictions.prefork import process_memory, server_processes
+
+
+def _mib(kib):
+    return f"{kib / 1024:9.1f}"
+
+
+class Command(BaseCommand):
+    help = "Report RSS, PSS, shared and private memory for each app server worker."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--master", type=int, help="PID of the server master; defaults to every gunicorn/uwsgi/daphne process.")
+
+    def handle(self, *args, **options):
+        processes = server_processes(master=options["master"])
+        if not processes:
+            raise CommandError("No app server processes found.")
+
+        pids = {pid for pid, _ in processes}
+        self.stdout.write(f"{'PID':>8} {'PPID':>8} {'ROLE':<7} {'RSS MiB':>9} {'PSS MiB':>9} {'SHARED':>9} {'PRIVATE':>9}")
+        workers = []
+        for pid, parent in processes:
+            usage = process_memory(pid)
+            if usage is None:
+                continue
+            role = "worker" if parent in pids else "master"
+            if role == "worker":
+                workers.append(usage)
+            self.stdout.write(
+                f"{pid:>8} {parent or 0:>8} {role:<7} {_mib(usage.get('Rss', 0))} {_mib(usage.get('Pss', 0))} "
+                f"{_mib(usage['Shared'])} {_mib(usage['Private'])}"
+            )
+        if workers:
+            private = sum(usage["Private"] for usage in workers) / len(workers)
+            pss = sum(usage.get("Pss", 0) for usage in workers)
+            self.stdout.write(
+                f"{len(workers)} workers: {private / 1024:.1f} MiB private each on average, "
+                f"{pss / 1024:.1f} MiB PSS in total."
+            )
@@ -0,0 +1,66 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def assign_default_subject(apps, schema_editor):
+    ExamSubject = apps.get_model("predictions", "ExamSubject")
+    ExamQuestion = apps.get_model("predictions", "ExamQuestion")
+    ExamResult = apps.get_model("predictions", "ExamResult")
+    if not ExamQuestion.objects.filter(subject__isnull=True).exists() and not ExamResult.objects.filter(
+        subject__isnull=True
+    ).exists():
+        return
+    subject, _ = ExamSubject.objects.get_or_create(name="General")
+    ExamQuestion.objects.filter(subject__isnull=True).update(subject=subject)
+    ExamResult.objects.filter(subject__isnull=True).update(subject=subject)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0003_examquestion_examresult'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamSubject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=120, unique=True)),
+                ('description', models.TextField(blank=True)),
+                ('time_limit_minutes', models.PositiveSmallIntegerField(default=15)),
+                ('pass_percentage', models.PositiveSmallIntegerField(default=40)),
+                ('negative_marking', models.FloatField(default=0)),
+                ('is_active', models.BooleanField(default=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AlterField(
+            model_name='examresult',
+            name='score',
+            field=models.FloatField(),
+        ),
+        migrations.AddField(
+            model_name='examquestion',
+            name='subject',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='questions', to='predictions.examsubject'),
+        ),
+        migrations.AddField(
+            model_name='examresult',
+            name='subject',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='results', to='predictions.examsubject'),
+        ),
+        migrations.RunPython(assign_default_subject, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='examquestion',
+            name='subject',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='questions', to='predictions.examsubject'),
+        ),
+        migrations.AlterField(
+            model_name='examresult',
+            name='subject',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='predictions.examsubject'),
+        ),
+    ]
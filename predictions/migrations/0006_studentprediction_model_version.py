@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-18 09:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0005_apitoken'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprediction',
+            name='model_version',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
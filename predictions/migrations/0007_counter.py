@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def initialize_counters(apps, schema_editor):
+    Counter = apps.get_model("predictions", "Counter")
+    StudentPrediction = apps.get_model("predictions", "StudentPrediction")
+    ContactMessage = apps.get_model("predictions", "ContactMessage")
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+
+    counts = {
+        "predictions": StudentPrediction.objects.count(),
+        "users": User.objects.count(),
+        "contact_messages": ContactMessage.objects.count(),
+    }
+    for label, total in StudentPrediction.objects.values_list("prediction").annotate(total=Count("id")).order_by():
+        counts[f"predictions:{label}"] = total
+    for user_id, total in (
+        StudentPrediction.objects.filter(user__isnull=False).values_list("user_id").annotate(total=Count("id")).order_by()
+    ):
+        counts[f"user:{user_id}:predictions"] = total
+    Counter.objects.bulk_create([Counter(key=key, value=value) for key, value in counts.items()], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('predictions', '0006_studentprediction_model_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Counter',
+            fields=[
+                ('key', models.CharField(max_length=100, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(initialize_counters, migrations.RunPython.noop),
+    ]
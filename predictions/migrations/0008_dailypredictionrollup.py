@@ -0,0 +1,50 @@
+# Generated by Django 5.1.15 on 2026-10-18 09:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def build_rollups(apps, schema_editor):
+    StudentPrediction = apps.get_model("predictions", "StudentPrediction")
+    DailyPredictionRollup = apps.get_model("predictions", "DailyPredictionRollup")
+    fields = {"PASS": "pass_count", "FAIL": "fail_count"}
+    days = {}
+    rows = (
+        StudentPrediction.objects.filter(user__isnull=False, prediction__in=fields)
+        .values_list("user_id", "prediction", "created_at")
+        .order_by()
+        .iterator(chunk_size=5000)
+    )
+    for user_id, label, created_at in rows:
+        day = timezone.localdate(created_at)
+        row = days.setdefault((user_id, day), DailyPredictionRollup(user_id=user_id, day=day))
+        setattr(row, fields[label], getattr(row, fields[label]) + 1)
+    DailyPredictionRollup.objects.bulk_create(days.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0007_counter'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyPredictionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('pass_count', models.PositiveIntegerField(default=0)),
+                ('fail_count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_prediction_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-day'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'day'), name='unique_rollup_user_day')],
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
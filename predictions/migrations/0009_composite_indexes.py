@@ -0,0 +1,39 @@
+# Generated by Django 5.1.15 on 2026-10-18 09:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0008_dailypredictionrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='examquestion',
+            index=models.Index(fields=['subject', 'is_active'], name='question_subject_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='examresult',
+            index=models.Index(fields=['-created_at'], name='examresult_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='examresult',
+            index=models.Index(fields=['user', '-created_at'], name='examresult_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentprediction',
+            index=models.Index(fields=['-created_at'], name='prediction_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentprediction',
+            index=models.Index(fields=['user', '-created_at'], name='prediction_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentprediction',
+            index=models.Index(fields=['user', 'prediction', '-created_at'], name='prediction_user_label_idx'),
+        ),
+    ]
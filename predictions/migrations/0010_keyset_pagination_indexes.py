@@ -0,0 +1,44 @@
+# Generated by Django 5.1.15 on 2026-10-18 09:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+# The user model belongs to another app, so the index behind the user
+# management page's (date_joined, id) keyset is created here by hand.
+USER_JOINED_INDEX = models.Index(fields=["-date_joined", "-id"], name="user_joined_id_idx")
+
+
+def add_user_index(apps, schema_editor):
+    schema_editor.add_index(apps.get_model(settings.AUTH_USER_MODEL), USER_JOINED_INDEX)
+
+
+def remove_user_index(apps, schema_editor):
+    schema_editor.remove_index(apps.get_model(settings.AUTH_USER_MODEL), USER_JOINED_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0009_composite_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='studentprediction',
+            name='prediction_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='studentprediction',
+            name='prediction_user_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='studentprediction',
+            index=models.Index(fields=['-created_at', '-id'], name='prediction_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentprediction',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='prediction_user_created_id_idx'),
+        ),
+        migrations.RunPython(add_user_index, remove_user_index),
+    ]
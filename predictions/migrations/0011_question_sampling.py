@@ -0,0 +1,46 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0010_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='examquestion',
+            name='question_subject_active_idx',
+        ),
+        migrations.AddField(
+            model_name='examquestion',
+            name='difficulty',
+            field=models.CharField(choices=[('easy', 'Easy'), ('medium', 'Medium'), ('hard', 'Hard')], default='medium', max_length=6),
+        ),
+        migrations.AddField(
+            model_name='examsubject',
+            name='easy_quota',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='examsubject',
+            name='hard_quota',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='examsubject',
+            name='medium_quota',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='examsubject',
+            name='questions_per_attempt',
+            field=models.PositiveIntegerField(default=0, help_text='Questions drawn at random for each attempt; 0 serves every active question.'),
+        ),
+        migrations.AddIndex(
+            model_name='examquestion',
+            index=models.Index(fields=['subject', 'is_active', 'difficulty'], name='question_subject_pool_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.15 on 2026-10-18 10:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0011_question_sampling'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionStat',
+            fields=[
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='predictions.examquestion')),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('correct', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0)),
+                ('score_squares', models.FloatField(default=0)),
+                ('correct_score_sum', models.FloatField(default=0)),
+                ('blank_count', models.PositiveIntegerField(default=0)),
+                ('option_a_count', models.PositiveIntegerField(default=0)),
+                ('option_b_count', models.PositiveIntegerField(default=0)),
+                ('option_c_count', models.PositiveIntegerField(default=0)),
+                ('option_d_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='examresult',
+            name='answers',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.AddField(
+            model_name='examresult',
+            name='question_ids',
+            field=models.BinaryField(default=b''),
+        ),
+    ]
@@ -1,4 +1,7 @@
+import secrets
+
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
 
 
@@ -32,10 +35,16 @@ class StudentPrediction(models.Model):
     health = models.PositiveSmallIntegerField()
     prediction = models.CharField(max_length=10)
     confidence = models.FloatField(null=True, blank=True)
+    model_version = models.CharField(max_length=64, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="prediction_created_id_idx"),
+            models.Index(fields=["user", "-created_at", "-id"], name="prediction_user_created_id_idx"),
+            models.Index(fields=["user", "prediction", "-created_at"], name="prediction_user_label_idx"),
+        ]
 
     def __str__(self):
         return f"{self.full_name} - {self.prediction}"
@@ -55,12 +64,26 @@ class ContactMessage(models.Model):
         return f"{self.name} - {self.email}"
 
 
+DIFFICULTY_CHOICES = [
+    ("easy", "Easy"),
+    ("medium", "Medium"),
+    ("hard", "Hard"),
+]
+
+
 class ExamSubject(models.Model):
     name = models.CharField(max_length=120, unique=True)
     description = models.TextField(blank=True)
     time_limit_minutes = models.PositiveSmallIntegerField(default=15)
     pass_percentage = models.PositiveSmallIntegerField(default=40)
     negative_marking = models.FloatField(default=0)
+    questions_per_attempt = models.PositiveIntegerField(
+        default=0,
+        help_text="Questions drawn at random for each attempt; 0 serves every active question.",
+    )
+    easy_quota = models.PositiveSmallIntegerField(default=0)
+    medium_quota = models.PositiveSmallIntegerField(default=0)
+    hard_quota = models.PositiveSmallIntegerField(default=0)
     is_active = models.BooleanField(default=True)
 
     class Meta:
@@ -69,6 +92,20 @@ class ExamSubject(models.Model):
     def __str__(self):
         return self.name
 
+    @property
+    def difficulty_quotas(self):
+        return {"easy": self.easy_quota, "medium": self.medium_quota, "hard": self.hard_quota}
+
+    def clean(self):
+        quota_total = sum(self.difficulty_quotas.values())
+        if quota_total and not self.questions_per_attempt:
+            raise ValidationError("Set questions per attempt to use difficulty quotas.")
+        if quota_total > self.questions_per_attempt:
+            raise ValidationError(
+                f"Difficulty quotas add up to {quota_total}, more than the {self.questions_per_attempt} "
+                "questions per attempt."
+            )
+
 
 class ExamQuestion(models.Model):
     OPTION_CHOICES = [
@@ -90,8 +127,15 @@ class ExamQuestion(models.Model):
     option_d = models.CharField(max_length=255)
     correct_option = models.CharField(max_length=1, choices=OPTION_CHOICES)
     points = models.PositiveSmallIntegerField(default=1)
+    difficulty = models.CharField(max_length=6, choices=DIFFICULTY_CHOICES, default="medium")
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            # Covers the per-subject id pool (id is the implicit last column).
+            models.Index(fields=["subject", "is_active", "difficulty"], name="question_subject_pool_idx"),
+        ]
+
     def __str__(self):
         return self.text[:60]
 
@@ -113,10 +157,139 @@ class ExamResult(models.Model):
     wrong_count = models.PositiveIntegerField()
     percentage = models.FloatField()
     passed = models.BooleanField(default=False)
+    # The attempt's questions in the order shown, as little-endian uint32 ids,
+    # and one byte per question: the chosen option code, with the high bit
+    # set when it was correct (see predictions.grading).
+    question_ids = models.BinaryField(default=b"", editable=False)
+    answers = models.BinaryField(default=b"", editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at"], name="examresult_created_idx"),
+            models.Index(fields=["user", "-created_at"], name="examresult_user_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user} - {self.percentage:.1f}%"
+
+
+class ExamAttempt(models.Model):
+    """
+    An exam in progress, written through from the cache-backed attempt store
+    (see predictions.attempts) so it survives a cache flush or a browser crash.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="exam_attempts",
+    )
+    subject = models.ForeignKey(
+        ExamSubject,
+        on_delete=models.CASCADE,
+        related_name="attempts",
+    )
+    token = models.CharField(max_length=32, unique=True)
+    # The drawn questions as little-endian uint32 ids; empty for the whole bank.
+    question_ids = models.BinaryField(default=b"", editable=False)
+    # {question_id: option} as autosaved so far.
+    answers = models.JSONField(default=dict, blank=True)
+    revision = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField()
+    deadline = models.DateTimeField()
+    saved_at = models.DateTimeField(null=True, blank=True)
+    submitted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["user", "-started_at"], name="attempt_user_started_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} - {self.subject} ({self.token[:8]})"
+
+
+class ApiToken(models.Model):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="api_tokens",
+    )
+    name = models.CharField(max_length=100, blank=True)
+    key = models.CharField(max_length=64, unique=True, editable=False)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def save(self, *args, **kwargs):
+        if not self.key:
+            self.key = secrets.token_hex(20)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.user} - {self.name or self.key[:8]}"
+
+
+class Counter(models.Model):
+    """Running total maintained on write (see predictions.counters)."""
+
+    key = models.CharField(max_length=100, primary_key=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.key} = {self.value}"
+
+
+class DailyPredictionRollup(models.Model):
+    """PASS/FAIL predictions per user per local day, maintained on write."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="daily_prediction_rollups",
+    )
+    day = models.DateField()
+    pass_count = models.PositiveIntegerField(default=0)
+    fail_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-day"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "day"], name="unique_rollup_user_day"),
+        ]
+
+    def __str__(self):
+        return f"{self.user} {self.day}: {self.pass_count} pass, {self.fail_count} fail"
+
+
+class QuestionStat(models.Model):
+    """
+    Running item-analysis sums for one question over the attempts processed
+    so far (see predictions.item_analysis).
+    """
+
+    question = models.OneToOneField(
+        ExamQuestion,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    correct = models.PositiveIntegerField(default=0)
+    score_sum = models.FloatField(default=0)
+    score_squares = models.FloatField(default=0)
+    correct_score_sum = models.FloatField(default=0)
+    blank_count = models.PositiveIntegerField(default=0)
+    option_a_count = models.PositiveIntegerField(default=0)
+    option_b_count = models.PositiveIntegerField(default=0)
+    option_c_count = models.PositiveIntegerField(default=0)
+    option_d_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.question_id}: {self.correct}/{self.attempts}"
@@ -0,0 +1,163 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from dataclasses import dataclass
+from datetime import datetime
+import binascii
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.http import urlencode
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class KeysetPage:
+    """
+    One page of a keyset-paginated list. ``next_url`` and ``previous_url``
+    are ``None`` at either end.
+    """
+
+    object_list: list
+    limit: int
+    next_url: str | None
+    previous_url: str | None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_other_pages(self):
+        return bool(self.next_url or self.previous_url)
+
+
+def _dump(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def encode_cursor(direction, values):
+    payload = json.dumps([direction, *[_dump(value) for value in values]], separators=(",", ":"))
+    return urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, fields):
+    try:
+        payload = json.loads(urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        direction, *values = payload
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise InvalidCursor(cursor) from exc
+    if direction not in ("next", "prev") or len(values) != len(fields):
+        raise InvalidCursor(cursor)
+    try:
+        # The first field is a datetime, the last the primary key.
+        values[0] = datetime.fromisoformat(values[0])
+        values[-1] = int(values[-1])
+    except (TypeError, ValueError) as exc:
+        raise InvalidCursor(cursor) from exc
+    return direction, values
+
+
+def _after(fields, values):
+    """
+    Rows strictly after ``values`` in descending ``fields`` order. The leading
+    ``<=`` keeps the index range bounded; the OR only breaks ties.
+    """
+    (first, *rest), (value, *rest_values) = fields, values
+    if not rest:
+        return Q(**{f"{first}__lt": value})
+    return Q(**{f"{first}__lte": value}) & (
+        Q(**{f"{first}__lt": value}) | (Q(**{first: value}) & _after(rest, rest_values))
+    )
+
+
+def _before(fields, values):
+    (first, *rest), (value, *rest_values) = fields, values
+    if not rest:
+        return Q(**{f"{first}__gt": value})
+    return Q(**{f"{first}__gte": value}) & (
+        Q(**{f"{first}__gt": value}) | (Q(**{first: value}) & _before(rest, rest_values))
+    )
+
+
+def page_size(request, default=None):
+    limit = default or settings.PAGINATION_PAGE_SIZE
+    try:
+        limit = int(request.GET.get("limit", limit))
+    except ValueError:
+        pass
+    return max(1, min(limit, settings.PAGINATION_MAX_PAGE_SIZE))
+
+
+def _url(request, cursor, limit):
+    query = {key: value for key, value in request.GET.items() if key not in ("cursor", "limit")}
+    query["cursor"] = cursor
+    if limit != settings.PAGINATION_PAGE_SIZE:
+        query["limit"] = limit
+    return f"{request.path}?{urlencode(query)}"
+
+
+def paginate(request, queryset, fields=("created_at", "id"), limit=None):
+    """
+    Newest-first page of ``queryset`` after (or before) the ``cursor`` query
+    parameter. Seeks on ``fields`` instead of using OFFSET and never counts,
+    so every page costs one indexed range read of ``limit + 1`` rows however
+    deep it is. A malformed cursor falls back to the first page.
+    """
+    limit = limit or page_size(request)
+    direction, values = "next", None
+    if request.GET.get("cursor"):
+        try:
+            direction, values = decode_cursor(request.GET["cursor"], fields)
+        except InvalidCursor:
+            pass
+
+    if direction == "prev" and values is not None:
+        queryset = queryset.filter(_before(fields, values)).order_by(*fields)
+    else:
+        if values is not None:
+            queryset = queryset.filter(_after(fields, values))
+        queryset = queryset.order_by(*[f"-{field}" for field in fields])
+
+    rows = list(queryset[: limit + 1])
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == "prev" and values is not None:
+        rows.reverse()
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, values is not None
+
+    def key(row):
+        return [getattr(row, field) for field in fields]
+
+    return KeysetPage(
+        object_list=rows,
+        limit=limit,
+        next_url=_url(request, encode_cursor("next", key(rows[-1])), limit) if rows and has_next else None,
+        previous_url=(
+            _url(request, encode_cursor("prev", key(rows[0])), limit) if rows and has_previous else None
+        ),
+    )
+
+
+def keyset_chunks(queryset, fields=("created_at", "id"), chunk_size=2000):
+    """
+    Yield ``queryset.values()`` rows oldest first in lists of ``chunk_size``.
+    Each chunk is its own short indexed query that seeks past the previous
+    chunk's last key, so memory stays flat on backends whose drivers buffer a
+    whole result set (MySQL) and no long read transaction is held open.
+    The values must include ``fields``.
+    """
+    queryset = queryset.order_by(*fields)
+    chunk = list(queryset[:chunk_size])
+    while chunk:
+        yield chunk
+        if len(chunk) < chunk_size:
+            return
+        last = chunk[-1]
+        chunk = list(queryset.filter(_before(fields, [last[field] for field in fields]))[:chunk_size])
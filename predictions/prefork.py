@@ -0,0 +1,125 @@
+from pathlib import Path
+import gc
+import logging
+import os
+import shutil
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SERVER_NAMES = ("gunicorn", "uwsgi", "daphne")
+MEMORY_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def _array_owners(compiled):
+    owners = {"estimator": compiled}
+    trees = getattr(compiled, "trees", None)
+    if trees is not None:
+        owners["trees"] = trees
+    return owners
+
+
+def map_compiled_arrays(compiled, directory):
+    """
+    Replace the NumPy arrays of a compiled estimator with read-only memory maps
+    of ``.npy`` files in ``directory``, writing them first if needed. Pages of a
+    mapped file live in the page cache once, so every worker that maps the same
+    model version shares them instead of holding a private copy, including
+    workers that reload a model after fork.
+    """
+    directory = Path(directory)
+    owners = _array_owners(compiled)
+    if not directory.exists():
+        staging = directory.with_name(f"{directory.name}.tmp{os.getpid()}")
+        staging.mkdir(parents=True, exist_ok=True)
+        for prefix, owner in owners.items():
+            for name, value in vars(owner).items():
+                if isinstance(value, np.ndarray):
+                    np.save(staging / f"{prefix}.{name}.npy", value)
+        try:
+            os.rename(staging, directory)
+        except OSError:
+            # Another worker published the same version first.
+            shutil.rmtree(staging, ignore_errors=True)
+
+    mapped = {}
+    for prefix, owner in owners.items():
+        for name, value in vars(owner).items():
+            if not isinstance(value, np.ndarray):
+                continue
+            path = directory / f"{prefix}.{name}.npy"
+            shared = np.load(path, mmap_mode="r") if path.exists() else None
+            if shared is None or shared.shape != value.shape or shared.dtype != value.dtype:
+                logger.warning("Shared model arrays in %s are stale; keeping private copies.", directory)
+                return False
+            mapped[(prefix, name)] = shared
+    for (prefix, name), shared in mapped.items():
+        setattr(owners[prefix], name, shared)
+    return True
+
+
+def freeze_shared_state():
+    """
+    Load the model in the server's master process and move everything allocated
+    so far into the GC's permanent generation. Collections in forked workers
+    then skip those objects instead of writing to their headers, which would
+    copy the shared pages into each worker.
+    """
+    from .services import get_registry
+
+    get_registry().current()
+    gc.collect()
+    gc.freeze()
+
+
+def process_memory(pid="self"):
+    """Memory of one process in KiB, from /proc/<pid>/smaps_rollup when available."""
+    base = Path("/proc") / str(pid)
+    usage = {}
+    try:
+        with open(base / "smaps_rollup", encoding="ascii") as handle:
+            for line in handle:
+                key, _, rest = line.partition(":")
+                if key in MEMORY_FIELDS:
+                    usage[key] = int(rest.split()[0])
+    except OSError:
+        try:
+            with open(base / "status", encoding="ascii") as handle:
+                for line in handle:
+                    if line.startswith("VmRSS:"):
+                        usage["Rss"] = int(line.split()[1])
+        except OSError:
+            return None
+    usage["Shared"] = usage.get("Shared_Clean", 0) + usage.get("Shared_Dirty", 0)
+    usage["Private"] = usage.get("Private_Clean", 0) + usage.get("Private_Dirty", 0)
+    return usage
+
+
+def _parent_pid(pid):
+    try:
+        with open(f"/proc/{pid}/stat", encoding="ascii") as handle:
+            return int(handle.read().rsplit(")", 1)[1].split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def server_processes(master=None, names=SERVER_NAMES):
+    """``(pid, parent_pid)`` of a master and its workers, or of every matching server process."""
+    processes = []
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        pid = int(entry.name)
+        parent = _parent_pid(pid)
+        if master is not None:
+            if pid == master or parent == master:
+                processes.append((pid, parent))
+            continue
+        try:
+            command = (entry / "cmdline").read_bytes().replace(b"\0", b" ").decode(errors="ignore")
+        except OSError:
+            continue
+        if pid != os.getpid() and any(name in command for name in names):
+            processes.append((pid, parent))
+    return sorted(processes)
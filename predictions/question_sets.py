@@ -0,0 +1,292 @@
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+import random
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import counters
+from .models import ExamQuestion, ExamSubject
+
+SUBJECT_FIELDS = (
+    "id",
+    "name",
+    "time_limit_minutes",
+    "pass_percentage",
+    "negative_marking",
+    "questions_per_attempt",
+)
+QUOTA_FIELDS = (("easy", "easy_quota"), ("medium", "medium_quota"), ("hard", "hard_quota"))
+QUESTION_FIELDS = ("id", "text", "option_a", "option_b", "option_c", "option_d")
+ANSWER_FIELDS = ("correct_option", "points")
+
+_random = random.Random()
+
+
+@dataclass(frozen=True)
+class Subject:
+    id: int
+    name: str
+    time_limit_minutes: int
+    pass_percentage: int
+    negative_marking: float
+    questions_per_attempt: int = 0
+    quotas: tuple = ()
+
+
+@dataclass(frozen=True)
+class Question:
+    id: int
+    text: str
+    option_a: str
+    option_b: str
+    option_c: str
+    option_d: str
+
+
+@dataclass(frozen=True)
+class QuestionSet:
+    """
+    The questions of an exam as rendered on the exam page (a subject's
+    whole bank, or one attempt's draw), and a separate answer key of
+    ``{question_id: (correct_option, points)}`` for grading. Neither touches
+    the database once loaded.
+    """
+
+    subject: Subject
+    version: int
+    questions: tuple
+    answer_key: dict
+
+    @cached_property
+    def grading_key(self):
+        from .grading import AnswerKey
+
+        return AnswerKey.from_question_set(self)
+
+
+def version_key(subject_id):
+    return f"{counters.VERSION_PREFIX}question_set:{subject_id}"
+
+
+def bump_versions(subject_ids):
+    """
+    Invalidate the cached question banks of ``subject_ids``. Runs in the
+    caller's transaction, so readers see the new version only once the
+    change it describes has committed.
+    """
+    counters.increment({version_key(subject_id): 1 for subject_id in set(subject_ids) if subject_id})
+
+
+def _question_set(subject, version, rows):
+    questions = []
+    answer_key = {}
+    for *question, correct_option, points in rows:
+        questions.append(Question(*question))
+        answer_key[question[0]] = (correct_option, points)
+    return QuestionSet(subject, version, tuple(questions), answer_key)
+
+
+def _sample(rng, ids, count, exclude):
+    """``count`` distinct ids from ``ids`` that are not in ``exclude``."""
+    available = len(ids) - len(exclude)
+    if count >= available:
+        return [question_id for question_id in ids if question_id not in exclude]
+    if count * 2 > available:
+        return rng.sample([question_id for question_id in ids if question_id not in exclude], count)
+    # Few picks from a big pool: rejection sampling avoids copying the pool.
+    picked = []
+    seen = set(exclude)
+    while len(picked) < count:
+        question_id = ids[rng.randrange(len(ids))]
+        if question_id not in seen:
+            seen.add(question_id)
+            picked.append(question_id)
+    return picked
+
+
+@dataclass(frozen=True)
+class QuestionBank:
+    """
+    A subject's active questions as cached per version. ``pool`` holds the
+    question ids by difficulty; subjects that serve every question also keep
+    the full question set, while sampled subjects keep only the ids and load
+    the questions each attempt draws.
+    """
+
+    subject: Subject
+    version: int
+    pool: dict
+    full_set: QuestionSet = None
+
+    @cached_property
+    def all_ids(self):
+        return array("q", sorted(question_id for ids in self.pool.values() for question_id in ids))
+
+    @property
+    def size(self):
+        return len(self.all_ids)
+
+    @property
+    def samples(self):
+        return self.full_set is None
+
+    def draw(self, rng=None):
+        """
+        Question ids for one attempt, in random order: each difficulty's quota
+        first, then the rest from the whole pool. A difficulty with too few
+        questions gives all it has and the remainder comes from the others.
+        """
+        rng = rng or _random
+        picked = []
+        for difficulty, quota in self.subject.quotas:
+            ids = self.pool.get(difficulty, ())
+            # Pools are disjoint, so nothing picked so far needs excluding.
+            picked += _sample(rng, ids, quota, ())
+        remaining = self.subject.questions_per_attempt - len(picked)
+        if remaining > 0:
+            picked += _sample(rng, self.all_ids, remaining, set(picked))
+        rng.shuffle(picked)
+        return picked
+
+    def question_set(self, question_ids=None):
+        """
+        The questions of one attempt: the whole bank, or ``question_ids`` in
+        the order drawn, fetched by primary key. Ids that were deleted or
+        deactivated since the draw are left out.
+        """
+        if question_ids is None:
+            if self.full_set is not None:
+                return self.full_set
+            # An attempt started before the subject began sampling keeps the whole bank.
+            question_ids = self.all_ids.tolist()
+        questions = (
+            ExamQuestion.objects.filter(subject_id=self.subject.id, is_active=True)
+            .only(*QUESTION_FIELDS, *ANSWER_FIELDS)
+            .in_bulk(question_ids)
+        )
+        rows = (
+            [getattr(questions[question_id], field) for field in QUESTION_FIELDS + ANSWER_FIELDS]
+            for question_id in question_ids
+            if question_id in questions
+        )
+        return _question_set(self.subject, self.version, rows)
+
+
+def build_question_bank(subject_id, version):
+    row = (
+        ExamSubject.objects.filter(pk=subject_id, is_active=True)
+        .values_list(*SUBJECT_FIELDS, *(field for _, field in QUOTA_FIELDS))
+        .first()
+    )
+    if row is None:
+        return None
+    quotas = tuple(
+        (difficulty, quota) for (difficulty, _), quota in zip(QUOTA_FIELDS, row[len(SUBJECT_FIELDS) :]) if quota
+    )
+    subject = Subject(*row[: len(SUBJECT_FIELDS)], quotas=quotas)
+    questions = ExamQuestion.objects.filter(subject_id=subject_id, is_active=True)
+
+    pool = {}
+    if subject.questions_per_attempt:
+        # Served from the (subject, is_active, difficulty) index alone; sorting
+        # here rather than in SQL keeps it that way.
+        for difficulty, question_id in questions.order_by().values_list("difficulty", "id"):
+            pool.setdefault(difficulty, []).append(question_id)
+        if subject.questions_per_attempt < sum(len(ids) for ids in pool.values()):
+            pool = {difficulty: array("q", sorted(ids)) for difficulty, ids in pool.items()}
+            return QuestionBank(subject, version, pool)
+        pool = {}
+
+    rows = list(questions.order_by("id").values_list(*QUESTION_FIELDS, *ANSWER_FIELDS, "difficulty"))
+    for question_id, *_, difficulty in rows:
+        pool.setdefault(difficulty, array("q")).append(question_id)
+    full_set = _question_set(subject, version, (row[:-1] for row in rows))
+    return QuestionBank(subject, version, pool, full_set)
+
+
+class QuestionBankCache:
+    """
+    Question banks per ``(subject, version)``: a small in-process LRU,
+    optionally backed by a shared Django cache. The version is a counter row
+    bumped by signals on every question or subject change, so each lookup
+    costs one primary-key read and stale banks are never served, whichever
+    worker made the change.
+    """
+
+    def __init__(self, max_entries=64, shared_alias=None, shared_timeout=3600):
+        self.max_entries = max_entries
+        self.shared_alias = shared_alias
+        self.shared_timeout = shared_timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def get(self, subject_id):
+        """The active subject's question bank, or ``None`` if there is no such subject."""
+        try:
+            subject_id = int(subject_id)
+        except (TypeError, ValueError):
+            return None
+        version = counters.get_count(version_key(subject_id))
+        key = (subject_id, version)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+        shared_key = f"exam:question_bank:{subject_id}:{version}"
+        if self.shared_alias:
+            bank = caches[self.shared_alias].get(shared_key)
+            if bank is not None:
+                with self._lock:
+                    self.shared_hits += 1
+                self._store(key, bank)
+                return bank
+
+        with self._lock:
+            self.misses += 1
+        bank = build_question_bank(subject_id, version)
+        if bank is not None:
+            self._store(key, bank)
+            if self.shared_alias:
+                caches[self.shared_alias].set(shared_key, bank, self.shared_timeout)
+        return bank
+
+    def _store(self, key, bank):
+        with self._lock:
+            # Older versions of this subject can never be asked for again.
+            for stale in [entry for entry in self._entries if entry[0] == key[0] and entry != key]:
+                del self._entries[stale]
+            self._entries[key] = bank
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_question_banks():
+    return QuestionBankCache(
+        max_entries=settings.EXAM_QUESTION_CACHE_SIZE,
+        shared_alias=settings.EXAM_QUESTION_CACHE_ALIAS or None,
+        shared_timeout=settings.EXAM_QUESTION_CACHE_TIMEOUT,
+    )
@@ -0,0 +1,213 @@
+from dataclasses import dataclass
+from functools import lru_cache
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
+
+ALGORITHMS = ("fixed", "sliding", "token_bucket")
+PRUNE_EVERY = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limit (
+    key TEXT PRIMARY KEY,
+    window_index INTEGER NOT NULL DEFAULT 0,
+    hits INTEGER NOT NULL DEFAULT 0,
+    previous INTEGER NOT NULL DEFAULT 0,
+    tokens REAL NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL DEFAULT 0,
+    allowed INTEGER NOT NULL DEFAULT 1,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+# Each check is one INSERT ... ON CONFLICT DO UPDATE ... RETURNING statement,
+# which SQLite applies atomically (SQLite >= 3.35). Column references in the
+# SET clause read the row as it was before the update.
+FIXED_WINDOW_SQL = """
+INSERT INTO rate_limit (key, window_index, hits, expires_at) VALUES (:key, :window, :cost, :expires)
+ON CONFLICT (key) DO UPDATE SET
+    hits = CASE WHEN window_index = :window THEN hits + :cost ELSE :cost END,
+    window_index = :window,
+    expires_at = :expires
+RETURNING hits
+"""
+
+SLIDING_WINDOW_SQL = """
+INSERT INTO rate_limit (key, window_index, hits, previous, expires_at) VALUES (:key, :window, :cost, 0, :expires)
+ON CONFLICT (key) DO UPDATE SET
+    previous = CASE
+        WHEN window_index = :window THEN previous
+        WHEN window_index = :window - 1 THEN hits
+        ELSE 0
+    END,
+    hits = CASE WHEN window_index = :window THEN hits + :cost ELSE :cost END,
+    window_index = :window,
+    expires_at = :expires
+RETURNING hits, previous
+"""
+
+TOKEN_BUCKET_SQL = """
+INSERT INTO rate_limit (key, tokens, updated_at, allowed, expires_at)
+VALUES (
+    :key, CASE WHEN :cost <= :capacity THEN :capacity - :cost ELSE :capacity END, :now, :cost <= :capacity, :expires
+)
+ON CONFLICT (key) DO UPDATE SET
+    tokens = CASE
+        WHEN MIN(:capacity, tokens + (:now - updated_at) * :rate) >= :cost
+        THEN MIN(:capacity, tokens + (:now - updated_at) * :rate) - :cost
+        ELSE MIN(:capacity, tokens + (:now - updated_at) * :rate)
+    END,
+    allowed = MIN(:capacity, tokens + (:now - updated_at) * :rate) >= :cost,
+    updated_at = :now,
+    expires_at = :expires
+RETURNING allowed, tokens
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    limited: bool
+    count: float
+    limit: int
+    reset_after: float
+
+
+def _window(now, window):
+    index = int(now // window)
+    return index, (index + 1) * window - now
+
+
+class SQLiteRateLimitBackend:
+    """
+    Rate-limit state in a local SQLite file. Every worker process on the host
+    opens the same file, so limits hold across processes without an external
+    service. WAL mode keeps readers and the single writer from blocking each
+    other.
+    """
+
+    def __init__(self, path, timeout=5.0):
+        self.path = str(path)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        local = self._local
+        # Connections must not cross a fork; reopen in the child.
+        if getattr(local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(SCHEMA)
+            local.connection = connection
+            local.pid = os.getpid()
+            local.calls = 0
+        local.calls += 1
+        if local.calls % PRUNE_EVERY == 0:
+            local.connection.execute("DELETE FROM rate_limit WHERE expires_at < ?", (time.time(),))
+        return local.connection
+
+    def fixed(self, key, limit, window, now, cost=1):
+        index, reset_after = _window(now, window)
+        (count,) = self._connection().execute(
+            FIXED_WINDOW_SQL, {"key": key, "window": index, "expires": now + reset_after, "cost": cost}
+        ).fetchone()
+        return RateLimitResult(count > limit, count, limit, reset_after)
+
+    def sliding(self, key, limit, window, now, cost=1):
+        index, reset_after = _window(now, window)
+        count, previous = self._connection().execute(
+            SLIDING_WINDOW_SQL, {"key": key, "window": index, "expires": now + reset_after + window, "cost": cost}
+        ).fetchone()
+        estimate = previous * (reset_after / window) + count
+        return RateLimitResult(estimate > limit, estimate, limit, reset_after)
+
+    def token_bucket(self, key, limit, window, now, cost=1):
+        rate = limit / window
+        allowed, tokens = self._connection().execute(
+            TOKEN_BUCKET_SQL,
+            {"key": key, "capacity": limit, "rate": rate, "now": now, "expires": now + window, "cost": cost},
+        ).fetchone()
+        return RateLimitResult(not allowed, limit - tokens, limit, (cost - tokens) / rate if not allowed else 0.0)
+
+    def clear(self):
+        self._connection().execute("DELETE FROM rate_limit")
+
+
+class CacheRateLimitBackend:
+    """
+    Fixed and sliding windows on a Django cache via ``cache.incr``, which is
+    atomic on Redis and Memcached. LocMemCache is per process, so prefer the
+    SQLite backend unless the cache is shared.
+    """
+
+    def __init__(self, alias="default"):
+        self.cache = caches[alias]
+
+    def _incr(self, key, timeout, delta=1):
+        try:
+            return self.cache.incr(key, delta)
+        except ValueError:
+            if self.cache.add(key, delta, timeout=timeout):
+                return delta
+            return self.cache.incr(key, delta)
+
+    def fixed(self, key, limit, window, now, cost=1):
+        index, reset_after = _window(now, window)
+        count = self._incr(f"rl:{key}:{index}", int(reset_after) + 1, cost)
+        return RateLimitResult(count > limit, count, limit, reset_after)
+
+    def sliding(self, key, limit, window, now, cost=1):
+        index, reset_after = _window(now, window)
+        count = self._incr(f"rl:{key}:{index}", int(reset_after + window) + 1, cost)
+        previous = self.cache.get(f"rl:{key}:{index - 1}", 0)
+        estimate = previous * (reset_after / window) + count
+        return RateLimitResult(estimate > limit, estimate, limit, reset_after)
+
+    def token_bucket(self, key, limit, window, now, cost=1):
+        raise ImproperlyConfigured("The cache rate-limit backend has no atomic token bucket; use 'sqlite'.")
+
+    def clear(self):
+        self.cache.clear()
+
+
+class RateLimiter:
+    def __init__(self, backend, algorithm="fixed"):
+        if algorithm not in ALGORITHMS:
+            raise ImproperlyConfigured(f"Unknown rate-limit algorithm '{algorithm}'. Choose from {ALGORITHMS}.")
+        self.backend = backend
+        self.algorithm = algorithm
+        self._check = getattr(backend, algorithm)
+
+    def hit(self, key, limit, window, now=None, cost=1):
+        """
+        Count one request (or ``cost`` units, such as the records of a batch)
+        against ``key`` and report whether it is over the limit. If the SQLite
+        file is locked past its timeout, unwritable or corrupt, the request is
+        let through rather than failing the caller.
+        """
+        try:
+            return self._check(key, limit, window, time.time() if now is None else now, cost)
+        except sqlite3.Error:
+            logger.exception("Rate-limit check for %r failed; allowing the request.", key)
+            return RateLimitResult(False, 0, limit, 0.0)
+
+
+def build_backend(name):
+    if name == "sqlite":
+        return SQLiteRateLimitBackend(settings.RATE_LIMIT_DB_PATH)
+    if name == "cache":
+        return CacheRateLimitBackend(settings.RATE_LIMIT_CACHE_ALIAS)
+    raise ImproperlyConfigured(f"Unknown RATE_LIMIT_BACKEND '{name}'; use 'sqlite' or 'cache'.")
+
+
+@lru_cache(maxsize=1)
+def get_rate_limiter():
+    return RateLimiter(build_backend(settings.RATE_LIMIT_BACKEND), settings.RATE_LIMIT_ALGORITHM)
@@ -0,0 +1,256 @@
+from dataclasses import dataclass
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+POINTER_FILE = "active.json"
+ARTIFACT_SUFFIX = ".pkl"
+
+
+def artifact_version(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def _check_artifact(data, name):
+    # Unpickling runs arbitrary constructors, so anything can go wrong: a
+    # truncated file, a class that moved, a module that is not installed.
+    try:
+        pickle.loads(data)
+    except Exception as exc:
+        raise ValueError(f"Model artifact '{name}' could not be loaded ({type(exc).__name__}: {exc}).") from exc
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    version: str
+    path: Path
+    engine: object
+    signature: tuple
+    loaded_at: float
+
+    @property
+    def model(self):
+        return self.engine.model
+
+
+class ModelRegistry:
+    """
+    Serves the active model artifact and swaps in a new one without blocking.
+
+    Versioned artifacts live in ``directory`` and ``active.json`` names the one
+    to serve, plus the previously active ones for rollback. Without a pointer
+    the legacy ``fallback_path`` is served. Every ``check_interval`` seconds a
+    caller stats the active artifact; if its path, mtime or size changed, a
+    background thread unpickles and compiles it, then replaces the current
+    model in one reference assignment. In-flight requests keep the model they
+    started with.
+    """
+
+    def __init__(self, directory, fallback_path, engine_factory, check_interval=5.0):
+        self.directory = Path(directory) if directory else None
+        self.fallback_path = Path(fallback_path)
+        self.engine_factory = engine_factory
+        self.check_interval = check_interval
+        self._current = None
+        self._lock = threading.Lock()
+        self._loading = False
+        self._worker = None
+        self._failed_signature = None
+        self._next_check = 0.0
+        self._versions = {}
+
+    @property
+    def pointer_path(self):
+        return self.directory / POINTER_FILE if self.directory else None
+
+    def _pointer(self):
+        path = self.pointer_path
+        if path is None or not path.exists():
+            return {"active": None, "history": []}
+        with open(path, encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def active_path(self):
+        active = self._pointer().get("active")
+        if active:
+            return self.directory / active
+        return self.fallback_path
+
+    @property
+    def loaded(self):
+        return self._current is not None
+
+    def current(self):
+        loaded = self._current
+        if loaded is None:
+            with self._lock:
+                if self._current is None:
+                    self._current = self._load(self.active_path())
+                    self._next_check = time.monotonic() + self.check_interval
+            return self._current
+        if time.monotonic() >= self._next_check:
+            self.check()
+        return loaded
+
+    def check(self, wait=False):
+        """
+        Start a background reload if the active artifact changed on disk. With
+        ``wait``, return only once the artifact on disk has been loaded (or
+        failed to load), joining a reload already in flight.
+        """
+        self._next_check = time.monotonic() + self.check_interval
+        try:
+            path = self.active_path()
+            signature = _signature(path)
+        except (OSError, ValueError) as exc:
+            logger.warning("Model registry check failed: %s", exc)
+            return
+        current = self._current
+        if current is not None and signature == current.signature:
+            return
+        if signature == self._failed_signature:
+            return
+        with self._lock:
+            in_flight = self._loading
+            if not in_flight:
+                self._loading = True
+                self._worker = threading.Thread(target=self._reload, args=(path, signature), daemon=True)
+                self._worker.start()
+            worker = self._worker
+        if wait:
+            worker.join()
+            if in_flight:
+                # The reload we waited for may have been for an older artifact.
+                self.check(wait=True)
+
+    def _reload(self, path, signature):
+        try:
+            loaded = self._load(path)
+        except Exception:
+            logger.exception("Could not load model artifact %s; keeping the current model.", path)
+            self._failed_signature = signature
+        else:
+            previous = self._current
+            self._current = loaded
+            logger.info(
+                "Model %s replaced %s.", loaded.version, previous.version if previous else "nothing"
+            )
+        finally:
+            self._loading = False
+
+    def _load(self, path):
+        signature = _signature(path)
+        with open(path, "rb") as handle:
+            data = handle.read()
+        version = artifact_version(data)
+        engine = self.engine_factory(pickle.loads(data), version)
+        return LoadedModel(
+            version=version, path=Path(path), engine=engine, signature=signature, loaded_at=time.time()
+        )
+
+    def _version_of(self, path):
+        signature = _signature(path)
+        cached = self._versions.get(str(path))
+        if cached and cached[0] == signature:
+            return cached[1]
+        version = artifact_version(Path(path).read_bytes())
+        self._versions[str(path)] = (signature, version)
+        return version
+
+    def versions(self):
+        """Artifacts available to serve, newest first."""
+        paths = []
+        if self.directory and self.directory.is_dir():
+            paths = [path for path in self.directory.iterdir() if path.suffix == ARTIFACT_SUFFIX]
+        if self.fallback_path.exists() and self.fallback_path not in paths:
+            paths.append(self.fallback_path)
+        active = self.active_path()
+        serving = self._current.path if self._current else None
+        entries = []
+        for path in paths:
+            stat = path.stat()
+            entries.append(
+                {
+                    "name": path.name,
+                    "version": self._version_of(path),
+                    "size": stat.st_size,
+                    "modified": stat.st_mtime,
+                    "active": path == active,
+                    "serving": path == serving,
+                    "fallback": path == self.fallback_path,
+                }
+            )
+        entries.sort(key=lambda entry: entry["modified"], reverse=True)
+        return entries
+
+    def history(self):
+        return list(self._pointer().get("history", []))
+
+    def register(self, source):
+        """Copy an artifact into the registry directory under its version name."""
+        if self.directory is None:
+            raise ValueError("MODEL_REGISTRY_DIR is not configured.")
+        data = Path(source).read_bytes()
+        _check_artifact(data, source)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = self.directory / f"model-{artifact_version(data)}{ARTIFACT_SUFFIX}"
+        if not target.exists():
+            temporary = target.with_suffix(".tmp")
+            temporary.write_bytes(data)
+            os.replace(temporary, target)
+        return target
+
+    def activate(self, name, history=None):
+        """
+        Point the registry at ``name`` and reload it in this process. The
+        artifact is checked first, and the pointer, with ``history`` if given
+        (otherwise the current one plus the replaced artifact), is written in
+        one step, so a refused artifact leaves both untouched.
+        """
+        if self.directory is None:
+            raise ValueError("MODEL_REGISTRY_DIR is not configured.")
+        if name == self.fallback_path.name and not (self.directory / name).exists():
+            target_name = None
+        else:
+            target = self.directory / Path(name).name
+            if target.suffix != ARTIFACT_SUFFIX or not target.exists():
+                raise ValueError(f"Unknown model artifact '{name}'.")
+            # Refuse artifacts that cannot be unpickled before any worker sees them.
+            _check_artifact(target.read_bytes(), name)
+            target_name = target.name
+
+        if history is None:
+            pointer = self._pointer()
+            history = pointer.get("history", [])
+            if pointer.get("active") != target_name:
+                history = history + [pointer.get("active")]
+        self._write_pointer({"active": target_name, "history": history[-20:]})
+        self.check(wait=True)
+
+    def rollback(self):
+        """Re-activate the previously active artifact."""
+        history = self.history()
+        if not history:
+            raise ValueError("There is no previous model version to roll back to.")
+        previous = history.pop()
+        self.activate(previous or self.fallback_path.name, history=history)
+        return previous
+
+    def _write_pointer(self, pointer):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temporary = self.pointer_path.with_suffix(".tmp")
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(pointer, handle)
+        os.replace(temporary, self.pointer_path)
@@ -1,8 +1,29 @@
+from collections import OrderedDict
 from functools import lru_cache
-import pickle
+import hashlib
+import json
+import logging
+from pathlib import Path
+import threading
+import time
 
-import pandas as pd
 from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import DatabaseError, connections
+from django.template.loader import get_template
+
+from .instrumentation import record_timings
+from .registry import ModelRegistry
+
+# pandas, numpy and scikit-learn are imported on first use (see warm_up), so
+# management commands and the admin never pay for them.
+
+logger = logging.getLogger(__name__)
+
+WARM_UP_TEMPLATES = ["predictions/student_form.html", "predictions/result.html"]
+_warmed_up = threading.Event()
+# Connections warm-up could not open, by alias; readiness stays down until they answer.
+_warm_up_errors = {}
 
 MODEL_FEATURES = [
     "school",
@@ -39,11 +60,279 @@ MODEL_FEATURES = [
     "G2",
 ]
 
+# Model feature -> StudentPredictionForm field; the rest come from PREDICTION_DEFAULTS.
+FORM_FEATURE_MAP = {
+    "school": "school",
+    "sex": "gender",
+    "age": "age",
+    "address": "address",
+    "famsize": "family_size",
+    "Pstatus": "parental_status",
+    "Medu": "mother_education",
+    "Fedu": "father_education",
+    "guardian": "guardian",
+    "traveltime": "travel_time",
+    "studytime": "study_time",
+    "failures": "failures",
+    "famsup": "family_support",
+    "activities": "activities",
+    "internet": "internet_access",
+    "health": "health",
+    "absences": "absences",
+    "G1": "g1",
+    "G2": "g2",
+}
+
+
+class PredictionCache:
+    """
+    Memoizes (label, confidence) per fully-resolved feature vector and model
+    version: a bounded in-process LRU, optionally backed by a shared Django cache.
+    """
+
+    def __init__(self, max_entries=1024, shared_alias=None, shared_timeout=3600):
+        self.max_entries = max_entries
+        self.shared_alias = shared_alias
+        self.shared_timeout = shared_timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(version, vector):
+        payload = json.dumps([version, vector], separators=(",", ":"), default=str)
+        return "pred:" + hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    def _check_version(self, version):
+        # A new model version makes every local entry unreachable; drop them.
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+    def get(self, version, vector):
+        key = self.make_key(version, vector)
+        with self._lock:
+            self._check_version(version)
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+        if self.shared_alias:
+            value = caches[self.shared_alias].get(key)
+            if value is not None:
+                with self._lock:
+                    self.shared_hits += 1
+                self._store(key, value)
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, version, vector, value):
+        key = self.make_key(version, vector)
+        with self._lock:
+            self._check_version(version)
+        self._store(key, value)
+        if self.shared_alias:
+            caches[self.shared_alias].set(key, value, self.shared_timeout)
+
+    def get_many(self, version, vectors):
+        """``get`` for several vectors, with one shared-cache round trip; ``None`` marks a miss."""
+        keys = [self.make_key(version, vector) for vector in vectors]
+        values = [None] * len(keys)
+        with self._lock:
+            self._check_version(version)
+            for position, key in enumerate(keys):
+                value = self._entries.get(key)
+                if value is not None:
+                    self._entries.move_to_end(key)
+                    values[position] = value
+            self.hits += sum(value is not None for value in values)
+        missing = [key for key, value in zip(keys, values) if value is None]
+        if self.shared_alias and missing:
+            found = caches[self.shared_alias].get_many(missing)
+            for position, key in enumerate(keys):
+                if values[position] is None and key in found:
+                    values[position] = found[key]
+                    self._store(key, found[key])
+            with self._lock:
+                self.shared_hits += len(found)
+        with self._lock:
+            self.misses += sum(value is None for value in values)
+        return values
+
+    def set_many(self, version, entries):
+        """``set`` for ``(vector, value)`` pairs."""
+        entries = {self.make_key(version, vector): value for vector, value in entries}
+        with self._lock:
+            self._check_version(version)
+        for key, value in entries.items():
+            self._store(key, value)
+        if self.shared_alias and entries:
+            caches[self.shared_alias].set_many(entries, self.shared_timeout)
+
+    def _store(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "version": self._version,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def _build_engine(model, version):
+    from .inference import InferenceEngine
+    from .prefork import map_compiled_arrays
+
+    engine = InferenceEngine(
+        model,
+        features=MODEL_FEATURES,
+        defaults=settings.PREDICTION_DEFAULTS,
+        dynamic=list(FORM_FEATURE_MAP),
+        compile=settings.COMPILE_MODEL,
+        compiled_max_batch=settings.COMPILED_MODEL_MAX_BATCH,
+        version=version,
+    )
+    if settings.MODEL_ARRAYS_DIR and engine.compiled is not None:
+        map_compiled_arrays(engine.compiled, Path(settings.MODEL_ARRAYS_DIR) / version)
+    return engine
+
 
 @lru_cache(maxsize=1)
+def get_registry():
+    return ModelRegistry(
+        directory=settings.MODEL_REGISTRY_DIR,
+        fallback_path=settings.MODEL_PATH,
+        engine_factory=_build_engine,
+        check_interval=settings.MODEL_RELOAD_INTERVAL,
+    )
+
+
 def load_model():
-    with open(settings.MODEL_PATH, "rb") as handle:
-        return pickle.load(handle)
+    return get_registry().current().model
+
+
+def model_version():
+    return get_registry().current().version
+
+
+def get_engine():
+    return get_registry().current().engine
+
+
+def prime_connections():
+    """
+    Open every database connection and touch the default cache. Returns the
+    errors, by alias, of the ones that could not be reached; nothing raises,
+    so a database that is down at boot does not stop the worker importing.
+    """
+    errors = {}
+    for alias in connections:
+        try:
+            connections[alias].ensure_connection()
+        except DatabaseError as exc:
+            logger.exception("Warm-up could not connect to database %r.", alias)
+            errors[alias] = str(exc)
+    try:
+        cache.get("warm_up")
+    except Exception as exc:
+        logger.exception("Warm-up could not reach the default cache.")
+        errors["cache"] = str(exc)
+    return errors
+
+
+def _finish_warm_up(errors):
+    global _warm_up_errors
+    _warm_up_errors = errors
+    if not errors:
+        _warmed_up.set()
+    return not errors
+
+
+def warm_up():
+    """
+    Load the model, run synthetic predictions (form values drawn by
+    synthetic.random_form_batch, the rest from PREDICTION_DEFAULTS) through
+    both the compiled and the scikit-learn path, load the hot templates and
+    open the database connection, so the first real request is as fast as
+    later ones. If a connection cannot be opened the process still starts,
+    but stays not ready until retry_warm_up() reaches it.
+    """
+    from .synthetic import random_form_batch
+
+    started = time.perf_counter()
+    engine = get_engine()
+    records = [to_feature_record(data) for data in random_form_batch(engine.compiled_max_batch + 1)]
+    engine.run(records[:1])
+    engine.run(records)
+    get_prediction_cache()
+    for name in WARM_UP_TEMPLATES:
+        get_template(name)
+    if _finish_warm_up(prime_connections()):
+        logger.info("Warm-up finished in %.1f ms (model %s).", (time.perf_counter() - started) * 1000, engine.version)
+    else:
+        logger.error("Warm-up could not reach %s; not ready until it can.", ", ".join(sorted(_warm_up_errors)))
+    return engine
+
+
+def retry_warm_up():
+    """Retry the connections a finished warm-up could not open; True once warm."""
+    if _warmed_up.is_set():
+        return True
+    if not _warm_up_errors:
+        # Warm-up has not run (or is still running).
+        return False
+    if _finish_warm_up(prime_connections()):
+        logger.info("Warm-up connections opened on retry.")
+    return _warmed_up.is_set()
+
+
+def is_warmed_up():
+    return _warmed_up.is_set()
+
+
+def warm_up_errors():
+    return dict(_warm_up_errors)
+
+
+@lru_cache(maxsize=1)
+def get_prediction_cache():
+    return PredictionCache(
+        max_entries=settings.PREDICTION_CACHE_SIZE,
+        shared_alias=settings.PREDICTION_CACHE_ALIAS or None,
+        shared_timeout=settings.PREDICTION_CACHE_TIMEOUT,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_batcher():
+    from .batching import MicroBatcher
+
+    return MicroBatcher(
+        max_batch_size=settings.PREDICTION_BATCH_MAX_SIZE,
+        max_wait_ms=settings.PREDICTION_BATCH_MAX_WAIT_MS,
+    )
 
 
 def _default_features():
@@ -51,31 +340,15 @@ def _default_features():
     return defaults
 
 
+def to_feature_record(cleaned_data):
+    return {feature: cleaned_data[field] for feature, field in FORM_FEATURE_MAP.items()}
+
+
 def build_model_input(cleaned_data):
+    import pandas as pd
+
     payload = _default_features()
-    payload.update(
-        {
-            "school": cleaned_data["school"],
-            "sex": cleaned_data["gender"],
-            "age": cleaned_data["age"],
-            "address": cleaned_data["address"],
-            "famsize": cleaned_data["family_size"],
-            "Pstatus": cleaned_data["parental_status"],
-            "Medu": cleaned_data["mother_education"],
-            "Fedu": cleaned_data["father_education"],
-            "guardian": cleaned_data["guardian"],
-            "traveltime": cleaned_data["travel_time"],
-            "studytime": cleaned_data["study_time"],
-            "failures": cleaned_data["failures"],
-            "famsup": cleaned_data["family_support"],
-            "activities": cleaned_data["activities"],
-            "internet": cleaned_data["internet_access"],
-            "health": cleaned_data["health"],
-            "absences": cleaned_data["absences"],
-            "G1": cleaned_data["g1"],
-            "G2": cleaned_data["g2"],
-        }
-    )
+    payload.update(to_feature_record(cleaned_data))
 
     missing = [name for name in MODEL_FEATURES if name not in payload]
     if missing:
@@ -84,15 +357,101 @@ def build_model_input(cleaned_data):
     return pd.DataFrame([payload], columns=MODEL_FEATURES)
 
 
-def predict(cleaned_data):
-    model = load_model()
-    inputs = build_model_input(cleaned_data)
-    raw_prediction = int(model.predict(inputs)[0])
+def _run_batched(record):
+    engine = get_engine()
+    started = time.perf_counter()
+    row = engine.encode([record])
+    if hasattr(row, "toarray"):
+        row = row.toarray()
+    encode_time = time.perf_counter() - started
+    result = get_batcher().predict(engine, row, timeout=settings.PREDICTION_BATCH_TIMEOUT)
+    result.timings = {"encode": encode_time, **result.timings}
+    return result
+
+
+def feature_vector(record):
+    payload = _default_features()
+    payload.update(record)
+    return [payload[name] for name in MODEL_FEATURES]
+
+
+def run_prediction(cleaned_data):
+    record = to_feature_record(cleaned_data)
+    memo = get_prediction_cache() if settings.PREDICTION_CACHE_SIZE > 0 else None
+    if memo is not None:
+        started = time.perf_counter()
+        version = model_version()
+        vector = feature_vector(record)
+        cached = memo.get(version, vector)
+        if cached is not None:
+            from .inference import InferenceResult
 
-    confidence = None
-    if hasattr(model, "predict_proba"):
-        probability = float(model.predict_proba(inputs)[0][1])
-        confidence = probability if raw_prediction == 1 else 1 - probability
+            label, confidence = cached
+            result = InferenceResult(
+                labels=[label],
+                confidences=[confidence],
+                timings={"cache": time.perf_counter() - started},
+                model_version=version,
+            )
+            record_timings("predict", result.timings)
+            return result
 
-    label = "PASS" if raw_prediction == 1 else "FAIL"
-    return label, confidence
+    if settings.PREDICTION_BATCHING:
+        result = _run_batched(record)
+    else:
+        result = get_engine().run([record])
+    if memo is not None and result.model_version == version:
+        memo.set(version, vector, (result.label, result.confidence))
+    record_timings("predict", result.timings)
+    return result
+
+
+def run_predictions(cleaned_items):
+    """
+    Predictions for several cleaned forms, as run_prediction makes for one:
+    vectors already in the prediction cache are answered from it and the rest
+    run through the engine in one batch, then cached.
+    """
+    from .inference import InferenceResult
+
+    records = [to_feature_record(cleaned) for cleaned in cleaned_items]
+    memo = get_prediction_cache() if settings.PREDICTION_CACHE_SIZE > 0 else None
+    labels = [None] * len(records)
+    confidences = [None] * len(records)
+    timings = {}
+    version = model_version()
+    misses = list(range(len(records)))
+    if memo is not None:
+        started = time.perf_counter()
+        vectors = [feature_vector(record) for record in records]
+        misses = []
+        for position, cached in enumerate(memo.get_many(version, vectors)):
+            if cached is None:
+                misses.append(position)
+            else:
+                labels[position], confidences[position] = cached
+        timings["cache"] = time.perf_counter() - started
+
+    if misses:
+        engine = get_engine()
+        result = engine.run([records[position] for position in misses])
+        if result.model_version != version and len(misses) < len(records):
+            # The model changed under the cached answers; run the whole batch on the new one.
+            misses = list(range(len(records)))
+            result = engine.run(records)
+        for position, label, confidence in zip(misses, result.labels, result.confidences):
+            labels[position], confidences[position] = label, confidence
+        if memo is not None and result.model_version == version:
+            memo.set_many(
+                version, [(vectors[position], (labels[position], confidences[position])) for position in misses]
+            )
+        timings.update(result.timings)
+        version = result.model_version
+
+    record_timings("predict", timings)
+    return InferenceResult(labels=labels, confidences=confidences, timings=timings, model_version=version)
+
+
+def predict(cleaned_data):
+    result = run_prediction(cleaned_data)
+    return result.label, result.confidence
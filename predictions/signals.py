@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import counters
+from .models import ContactMessage, Counter, ExamQuestion, ExamSubject, StudentPrediction
+from .question_sets import bump_versions
+
+
+@receiver(post_save, sender=StudentPrediction)
+def prediction_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.record_predictions([instance])
+
+
+@receiver(post_delete, sender=StudentPrediction)
+def prediction_deleted(sender, instance, **kwargs):
+    counters.record_predictions([instance], sign=-1)
+
+
+@receiver(post_save, sender=ContactMessage)
+def contact_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.increment_on_commit({counters.CONTACT_MESSAGES: 1})
+
+
+@receiver(post_delete, sender=ContactMessage)
+def contact_deleted(sender, instance, **kwargs):
+    counters.increment_on_commit({counters.CONTACT_MESSAGES: -1})
+
+
+@receiver(post_save, sender=get_user_model())
+def user_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.increment_on_commit({counters.USERS: 1})
+
+
+@receiver(post_delete, sender=get_user_model())
+def user_deleted(sender, instance, **kwargs):
+    counters.increment_on_commit({counters.USERS: -1})
+    # The user's predictions are kept with user=NULL, so their count goes too.
+    Counter.objects.filter(key=counters.user_predictions(instance.pk)).delete()
+
+
+# Question sets are cached per subject version; any change bumps it.
+# QuerySet.update() and bulk_create() send no signals; call bump_versions()
+# after them.
+@receiver(pre_save, sender=ExamQuestion)
+def question_moving(sender, instance, raw=False, **kwargs):
+    if instance.pk and not raw:
+        instance._previous_subject_id = (
+            ExamQuestion.objects.filter(pk=instance.pk).values_list("subject_id", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=ExamQuestion)
+@receiver(post_delete, sender=ExamQuestion)
+def question_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_versions([instance.subject_id, getattr(instance, "_previous_subject_id", None)])
+
+
+@receiver(post_save, sender=ExamSubject)
+@receiver(post_delete, sender=ExamSubject)
+def subject_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_versions([instance.pk])
@@ -27,6 +27,71 @@ document.addEventListener("DOMContentLoaded", () => {
     timerEl.textContent = formatTime(remaining);
     setTimeout(tick, 1000);
 
+    // Restore answers saved earlier in this attempt (e.g. after a crash or reload).
+    const savedEl = document.getElementById("saved-answers");
+    const saved = savedEl ? JSON.parse(savedEl.textContent) : {};
+    Object.entries(saved).forEach(([questionId, option]) => {
+        const input = form.querySelector(`input[name="question_${questionId}"][value="${option}"]`);
+        if (input) {
+            input.checked = true;
+        }
+    });
+
+    // Autosave: send only the answers changed since the last successful save.
+    const autosaveUrl = form.dataset.autosaveUrl;
+    const token = form.querySelector("input[name='exam_token']").value;
+    const csrfToken = form.querySelector("input[name='csrfmiddlewaretoken']").value;
+    let pending = {};
+    let saveTimer = null;
+
+    const scheduleSave = (delay) => {
+        if (!saveTimer) {
+            saveTimer = setTimeout(saveAnswers, delay);
+        }
+    };
+
+    const saveAnswers = () => {
+        saveTimer = null;
+        const answers = pending;
+        if (!autosaveUrl || Object.keys(answers).length === 0) {
+            return;
+        }
+        pending = {};
+        fetch(autosaveUrl, {
+            method: "POST",
+            credentials: "same-origin",
+            keepalive: true,
+            headers: { "Content-Type": "application/json", "X-CSRFToken": csrfToken },
+            body: JSON.stringify({ token, answers }),
+        })
+            .then((response) => {
+                if (response.status >= 500) {
+                    throw new Error(`Autosave failed: ${response.status}`);
+                }
+                return response.json();
+            })
+            .then((data) => {
+                if (typeof data.remaining_seconds === "number") {
+                    remaining = Math.min(remaining, data.remaining_seconds);
+                }
+            })
+            .catch(() => {
+                // Keep newer changes, retry the rest.
+                pending = { ...answers, ...pending };
+                scheduleSave(5000);
+            });
+    };
+
+    form.addEventListener("change", (event) => {
+        const match = /^question_(\d+)$/.exec(event.target.name || "");
+        if (match) {
+            pending[match[1]] = event.target.value;
+            scheduleSave(1000);
+        }
+    });
+
+    window.addEventListener("pagehide", saveAnswers);
+
     form.addEventListener("submit", (event) => {
         const questions = form.querySelectorAll(".question-card");
         let unanswered = 0;
@@ -0,0 +1,24 @@
+import random
+
+from django import forms
+
+from .forms import StudentPredictionForm
+
+
+def random_form_data(rng=None, index=0):
+    """Cleaned-data shaped record drawn from StudentPredictionForm's own limits."""
+    rng = rng or random.Random()
+    data = {}
+    for name, field in StudentPredictionForm.base_fields.items():
+        if isinstance(field, forms.ChoiceField):
+            data[name] = rng.choice(field.choices)[0]
+        elif isinstance(field, forms.IntegerField):
+            data[name] = rng.randint(field.min_value, field.max_value)
+        else:
+            data[name] = f"Student {index}"
+    return data
+
+
+def random_form_batch(count, seed=0):
+    rng = random.Random(seed)
+    return [random_form_data(rng, index) for index in range(count)]
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .attempts import get_attempts
+from .models import ExamAttempt, ExamQuestion, ExamResult, ExamSubject
+
+TWO_WORKERS = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "default"},
+    "worker_a": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "worker-a"},
+    "worker_b": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "worker-b"},
+}
+
+
+@override_settings(CACHES=TWO_WORKERS)
+class AttemptStoreAcrossWorkersTests(TestCase):
+    """Two gunicorn workers, each with its own LocMem cache, serving one attempt."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("student", password="pw")
+        self.subject = ExamSubject.objects.create(name="Science", time_limit_minutes=10)
+        self.questions = [
+            ExamQuestion.objects.create(
+                subject=self.subject,
+                text=f"Q{index}",
+                option_a="a",
+                option_b="b",
+                option_c="c",
+                option_d="d",
+                correct_option="A",
+            )
+            for index in range(3)
+        ]
+        self.addCleanup(get_attempts.cache_clear)
+
+    def worker(self, alias):
+        get_attempts.cache_clear()
+        with self.settings(EXAM_ATTEMPT_CACHE_ALIAS=alias):
+            return get_attempts()
+
+    def test_per_process_cache_is_not_used(self):
+        self.assertIsNone(self.worker("worker_a").alias)
+
+    def test_each_worker_sees_the_others_autosaves(self):
+        worker_a, worker_b = self.worker("worker_a"), self.worker("worker_b")
+        first, second = (str(question.pk) for question in self.questions[:2])
+        attempt = worker_a.start(self.user.pk, self.subject)
+        worker_a.get(attempt.token)
+
+        worker_b.save_answers(worker_b.get(attempt.token), {first: "A"})
+        self.assertEqual(worker_a.get(attempt.token).answers, {first: "A"})
+
+        worker_a.save_answers(worker_a.get(attempt.token), {second: "B"})
+        self.assertEqual(ExamAttempt.objects.get().answers, {first: "A", second: "B"})
+        self.assertEqual(worker_b.get(attempt.token).answers, {first: "A", second: "B"})
+
+    def test_expired_attempt_is_graded_on_every_workers_answers(self):
+        self.client.force_login(self.user)
+        self.client.get("/exam/", {"subject": self.subject.pk, "start": "1"})
+        token = self.client.session["exam_attempt"]
+        # Saved through another worker.
+        other = self.worker("worker_b")
+        other.save_answers(other.get(token), {str(question.pk): "A" for question in self.questions})
+        ExamAttempt.objects.filter(token=token).update(deadline=timezone.now() - timedelta(minutes=1))
+
+        get_attempts.cache_clear()
+        response = self.client.get("/exam/")
+
+        result = ExamResult.objects.get()
+        self.assertRedirects(response, f"/exam/result/{result.pk}/")
+        self.assertEqual(result.correct_count, len(self.questions))
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import api, views
 
 app_name = "predictions"
 
@@ -11,6 +11,7 @@ urlpatterns = [
     path("model-details/", views.model_details, name="model_details"),
     path("exam/instructions/", views.exam_instructions, name="exam_instructions"),
     path("exam/", views.exam, name="exam"),
+    path("exam/autosave/", views.exam_autosave, name="exam_autosave"),
     path("exam/result/<int:pk>/", views.exam_result, name="exam_result"),
     path("exam/history/", views.exam_history, name="exam_history"),
     path("analytics/", views.analytics, name="analytics"),
@@ -25,4 +26,5 @@ urlpatterns = [
     path("logout/", views.logout_view, name="logout"),
     path("student/", views.student_dashboard, name="student_dashboard"),
     path("profile/", views.profile, name="profile"),
+    path("api/predict/", api.predict, name="api_predict"),
 ]
@@ -1,15 +1,31 @@
-import uuid
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+import json
 
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model, login, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.core.cache import cache
-from django.db.models import Count, Q
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils.dateparse import parse_date
 from django.utils import timezone
-
+from django.views.decorators.http import require_POST
+
+from . import item_analysis
+from .attempts import clean_answers, get_attempts
+from .counters import (
+    CONTACT_MESSAGES,
+    PREDICTIONS,
+    USERS,
+    get_count,
+    get_counts,
+    prediction_label,
+    user_predictions,
+)
+from .exports import FORMATS, ExportError, filename, filtered_queryset, gzip_chunks, render_chunks
 from .forms import (
     ContactForm,
     ExamQuestionForm,
@@ -18,8 +34,11 @@ from .forms import (
     RegisterForm,
     StudentPredictionForm,
 )
-from .models import ContactMessage, ExamQuestion, ExamResult, ExamSubject, StudentPrediction
-from .services import predict
+from .models import DailyPredictionRollup, ExamQuestion, ExamResult, ExamSubject, StudentPrediction
+from .pagination import paginate
+from .question_sets import get_question_banks
+from .services import get_batcher, get_prediction_cache, get_registry, run_prediction
+from .instrumentation import metrics, stage
 from .utils import is_rate_limited
 
 
@@ -34,54 +53,61 @@ def home(request):
 @login_required(login_url="predictions:login")
 def student_form(request):
     if request.method == "POST":
-        if is_rate_limited(request, "predict", limit=12, window=300):
+        with stage("form.rate_limit"):
+            limited = is_rate_limited(request, "predict", limit=12, window=300)
+        if limited:
             messages.error(request, "Too many prediction requests. Please wait a few minutes.")
             form = StudentPredictionForm(request.POST)
             return render(request, "predictions/student_form.html", {"form": form})
         form = StudentPredictionForm(request.POST)
-        if form.is_valid():
+        with stage("form.validate"):
+            valid = form.is_valid()
+        if valid:
             try:
-                label, confidence = predict(form.cleaned_data)
+                with stage("form.predict"):
+                    outcome = run_prediction(form.cleaned_data)
             except Exception:
                 messages.error(request, "Prediction service unavailable. Please try again.")
                 return render(request, "predictions/student_form.html", {"form": form})
-            record = StudentPrediction.objects.create(
-                user=request.user if request.user.is_authenticated else None,
-                full_name=form.cleaned_data["full_name"],
-                age=form.cleaned_data["age"],
-                gender=form.cleaned_data["gender"],
-                school=form.cleaned_data["school"],
-                address=form.cleaned_data["address"],
-                family_size=form.cleaned_data["family_size"],
-                parental_status=form.cleaned_data["parental_status"],
-                mother_education=form.cleaned_data["mother_education"],
-                father_education=form.cleaned_data["father_education"],
-                guardian=form.cleaned_data["guardian"],
-                family_support=form.cleaned_data["family_support"],
-                internet_access=form.cleaned_data["internet_access"],
-                study_time=form.cleaned_data["study_time"],
-                travel_time=form.cleaned_data["travel_time"],
-                failures=form.cleaned_data["failures"],
-                absences=form.cleaned_data["absences"],
-                g1=form.cleaned_data["g1"],
-                g2=form.cleaned_data["g2"],
-                activities=form.cleaned_data["activities"],
-                health=form.cleaned_data["health"],
-                prediction=label,
-                confidence=confidence,
-            )
-            cache.delete("staff_dashboard_stats")
+            with stage("form.db_insert"), transaction.atomic():
+                record = StudentPrediction.objects.create(
+                    user=request.user if request.user.is_authenticated else None,
+                    full_name=form.cleaned_data["full_name"],
+                    age=form.cleaned_data["age"],
+                    gender=form.cleaned_data["gender"],
+                    school=form.cleaned_data["school"],
+                    address=form.cleaned_data["address"],
+                    family_size=form.cleaned_data["family_size"],
+                    parental_status=form.cleaned_data["parental_status"],
+                    mother_education=form.cleaned_data["mother_education"],
+                    father_education=form.cleaned_data["father_education"],
+                    guardian=form.cleaned_data["guardian"],
+                    family_support=form.cleaned_data["family_support"],
+                    internet_access=form.cleaned_data["internet_access"],
+                    study_time=form.cleaned_data["study_time"],
+                    travel_time=form.cleaned_data["travel_time"],
+                    failures=form.cleaned_data["failures"],
+                    absences=form.cleaned_data["absences"],
+                    g1=form.cleaned_data["g1"],
+                    g2=form.cleaned_data["g2"],
+                    activities=form.cleaned_data["activities"],
+                    health=form.cleaned_data["health"],
+                    prediction=outcome.label,
+                    confidence=outcome.confidence,
+                    model_version=outcome.model_version or "",
+                )
             request.session["last_prediction_id"] = record.id
             return redirect("predictions:result", pk=record.id)
     else:
         form = StudentPredictionForm()
 
     exam_score = request.session.get("last_exam_percentage")
-    return render(
-        request,
-        "predictions/student_form.html",
-        {"form": form, "exam_score": exam_score},
-    )
+    with stage("form.render"):
+        return render(
+            request,
+            "predictions/student_form.html",
+            {"form": form, "exam_score": exam_score},
+        )
 
 
 @login_required(login_url="predictions:login")
@@ -115,7 +141,11 @@ def records(request):
         "prediction",
         "created_at",
     )
-    return render(request, "predictions/records.html", {"records": history})
+    return render(
+        request,
+        "predictions/records.html",
+        {"records": paginate(request, history), "total": get_count(PREDICTIONS)},
+    )
 
 
 def about(request):
@@ -137,7 +167,7 @@ def exam_instructions(request):
     time_limit = settings.EXAM_TIME_LIMIT_MINUTES
     pass_percentage = settings.EXAM_PASS_PERCENTAGE
     negative_marking = settings.EXAM_NEGATIVE_MARKING
-    exam_in_progress = request.session.get("exam_in_progress", False)
+    exam_in_progress = _current_attempt(request) is not None
     last_result_id = request.session.get("exam_last_result_id")
 
     return render(
@@ -155,108 +185,147 @@ def exam_instructions(request):
     )
 
 
+def _current_attempt(request):
+    attempt = get_attempts().get(request.session.get("exam_attempt"))
+    return attempt if attempt and attempt.user_id == request.user.id else None
+
+
+def _submit_attempt(request, attempt, bank, answers):
+    """Grade ``answers`` on the attempt's questions and close it; ``None`` if it was already submitted."""
+    # Only the questions this attempt was shown are scored.
+    answer_key = bank.question_set(attempt.question_ids).grading_key
+    (grade,) = answer_key.grade(answer_key.encode_answers(answers))
+    with transaction.atomic():
+        if not get_attempts().finish(attempt):
+            return None
+        result = ExamResult.objects.create(
+            user=request.user, subject_id=attempt.subject_id, **grade.as_result_fields()
+        )
+
+    request.session["exam_last_result_id"] = result.id
+    request.session["exam_submitted"] = True
+    request.session.pop("exam_attempt", None)
+    request.session["last_exam_percentage"] = grade.percentage
+    return result
+
+
 @login_required(login_url="predictions:login")
 def exam(request):
-    subject_id = request.GET.get("subject") or request.POST.get("subject_id") or request.session.get("exam_subject_id")
-    subject = None
-    if subject_id:
-        subject = ExamSubject.objects.filter(pk=subject_id, is_active=True).first()
+    attempt = _current_attempt(request)
+    # An attempt in progress keeps its subject.
+    subject_id = attempt.subject_id if attempt else request.GET.get("subject") or request.POST.get("subject_id")
+    bank = get_question_banks().get(subject_id) if subject_id else None
+
+    if not bank and attempt is not None:
+        # The subject was deactivated mid-exam; without its questions the attempt cannot be graded.
+        get_attempts().discard(attempt)
+        request.session.pop("exam_attempt", None)
+        messages.error(request, "This exam's subject is no longer available, so your attempt was discarded.")
+        return redirect("predictions:exam_instructions")
 
-    if not subject:
+    if not bank:
         messages.error(request, "Please select a valid exam subject.")
         return redirect("predictions:exam_instructions")
 
-    questions = list(ExamQuestion.objects.filter(is_active=True, subject=subject))
-    if not questions:
+    subject = bank.subject
+    if not bank.size:
         messages.error(request, "No questions available for the selected subject.")
         return redirect("predictions:exam_instructions")
 
-    time_limit_seconds = subject.time_limit_minutes * 60
-
     if request.method == "GET":
         if request.session.get("exam_submitted") and request.session.get("exam_last_result_id"):
             if request.GET.get("start") != "1":
                 return redirect("predictions:exam_result", pk=request.session["exam_last_result_id"])
             request.session["exam_submitted"] = False
 
-        if not request.session.get("exam_in_progress"):
-            if request.GET.get("start") == "1":
-                request.session["exam_in_progress"] = True
-                request.session["exam_started_at"] = timezone.now().timestamp()
-                request.session["exam_token"] = uuid.uuid4().hex
-                request.session["exam_subject_id"] = subject.id
-            else:
+        if attempt is None:
+            if request.GET.get("start") != "1":
                 return redirect("predictions:exam_instructions")
-
-        started_at = request.session.get("exam_started_at")
-        if started_at and (timezone.now().timestamp() - started_at) > time_limit_seconds:
-            request.session["exam_in_progress"] = False
-            request.session.pop("exam_started_at", None)
-            request.session.pop("exam_token", None)
-            messages.error(request, "Exam time expired. Please start again.")
-            return redirect("predictions:exam_instructions")
+            attempt = get_attempts().start(request.user.id, subject, bank.draw() if bank.samples else None)
+            request.session["exam_attempt"] = attempt.token
+
+        if attempt.expired():
+            # As on submission: write pending autosaves and grade the row.
+            attempt = get_attempts().flush(attempt)
+            if attempt is None:
+                messages.error(request, "This exam was already submitted.")
+                return redirect("predictions:exam_instructions")
+            result = _submit_attempt(request, attempt, bank, attempt.answers)
+            messages.error(request, "Exam time expired. Your saved answers were submitted.")
+            if result is None:
+                return redirect("predictions:exam_instructions")
+            return redirect("predictions:exam_result", pk=result.id)
 
         return render(
             request,
             "predictions/exam.html",
             {
-                "questions": questions,
-                "time_limit_seconds": time_limit_seconds,
-                "exam_token": request.session.get("exam_token"),
+                "questions": bank.question_set(attempt.question_ids).questions,
+                "question_set_version": bank.version,
+                # Drawn sets are per attempt, so only the full bank's markup is worth
+                # caching; the scope keeps a drawn set from ever reading the bank's entry.
+                "question_cache_timeout": 0 if attempt.question_ids else 3600,
+                "question_cache_scope": attempt.token if attempt.question_ids else "bank",
+                "remaining_seconds": int(attempt.remaining()),
+                "saved_answers": attempt.answers,
+                "exam_token": attempt.token,
                 "subject": subject,
             },
         )
 
     # POST: Submit exam
-    if not request.session.get("exam_in_progress"):
+    if attempt is None:
         messages.error(request, "No active exam session found.")
         return redirect("predictions:exam_instructions")
 
-    token = request.POST.get("exam_token")
-    if token != request.session.get("exam_token"):
+    if request.POST.get("exam_token") != attempt.token:
         messages.error(request, "Invalid exam session. Please start again.")
         return redirect("predictions:exam_instructions")
 
-    correct_count = 0
-    wrong_count = 0
-    total_marks = 0
-    score = 0
-    for q in questions:
-        total_marks += q.points
-        answer = request.POST.get(f"question_{q.id}")
-        if answer == q.correct_option:
-            correct_count += 1
-            score += q.points
-        else:
-            wrong_count += 1
-            if subject.negative_marking:
-                score -= subject.negative_marking
-    score = max(0, score)
-    percentage = round((score / total_marks) * 100, 2) if total_marks else 0
-    passed = percentage >= subject.pass_percentage
-
-    result = ExamResult.objects.create(
-        user=request.user,
-        subject=subject,
-        score=round(float(score), 2),
-        total_questions=len(questions),
-        correct_count=correct_count,
-        wrong_count=wrong_count,
-        percentage=percentage,
-        passed=passed,
-    )
-
-    request.session["exam_last_result_id"] = result.id
-    request.session["exam_submitted"] = True
-    request.session["exam_in_progress"] = False
-    request.session.pop("exam_started_at", None)
-    request.session.pop("exam_token", None)
-    request.session.pop("exam_subject_id", None)
-    request.session["last_exam_percentage"] = percentage
+    # Write pending autosaves, then grade the row: it has every worker's changes.
+    attempt = get_attempts().flush(attempt) or attempt
+    answers = dict(attempt.answers)
+    if attempt.expired(settings.EXAM_DEADLINE_GRACE_SECONDS):
+        messages.error(request, "Submitted after the time limit; only answers saved in time were graded.")
+    else:
+        for name, value in request.POST.items():
+            question_id = name.removeprefix("question_")
+            if name.startswith("question_") and question_id.isdigit():
+                answers[question_id] = value
+    result = _submit_attempt(request, attempt, bank, answers)
+    if result is None:
+        messages.error(request, "This exam was already submitted.")
+        return redirect("predictions:exam_instructions")
 
     return redirect("predictions:exam_result", pk=result.id)
 
 
+@login_required(login_url="predictions:login")
+@require_POST
+def exam_autosave(request):
+    """Save changed answers (``{"token": ..., "answers": {"<question_id>": "A"}}``) during an exam."""
+    try:
+        payload = json.loads(request.body or b"null")
+    except (ValueError, UnicodeDecodeError):
+        return JsonResponse({"error": "Request body must be JSON."}, status=400)
+    attempt = _current_attempt(request)
+    if attempt is None or not isinstance(payload, dict) or payload.get("token") != attempt.token:
+        return JsonResponse({"error": "No active exam session found."}, status=409)
+    if attempt.expired(settings.EXAM_DEADLINE_GRACE_SECONDS):
+        return JsonResponse({"error": "Exam time expired."}, status=409)
+    try:
+        delta = clean_answers(payload.get("answers"), attempt.question_ids)
+    except ValueError as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+
+    attempt = get_attempts().save_answers(attempt, delta) if delta else attempt
+    if attempt is None:
+        return JsonResponse({"error": "This exam was already submitted."}, status=409)
+    return JsonResponse(
+        {"saved": len(delta), "revision": attempt.revision, "remaining_seconds": int(attempt.remaining())}
+    )
+
+
 @login_required(login_url="predictions:login")
 def exam_result(request, pk):
     result = get_object_or_404(ExamResult, pk=pk, user=request.user)
@@ -265,7 +334,7 @@ def exam_result(request, pk):
 
 @login_required(login_url="predictions:login")
 def exam_history(request):
-    results = ExamResult.objects.filter(user=request.user).select_related("subject")
+    results = ExamResult.objects.filter(user=request.user).select_related("subject").defer("question_ids", "answers")
     return render(request, "predictions/exam_history.html", {"results": results})
 
 
@@ -278,7 +347,6 @@ def contact(request):
         form = ContactForm(request.POST)
         if form.is_valid():
             form.save()
-            cache.delete("staff_dashboard_stats")
             messages.success(request, "Thank you! Your message has been received.")
             return redirect("predictions:contact")
     else:
@@ -286,9 +354,14 @@ def contact(request):
     return render(request, "predictions/contact.html", {"form": form})
 
 
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
 @login_required(login_url="predictions:login")
 def analytics(request):
     qs = StudentPrediction.objects.filter(user=request.user)
+    rollups = DailyPredictionRollup.objects.filter(user=request.user)
     result_filter = request.GET.get("result", "").upper()
     if result_filter in {"PASS", "FAIL"}:
         qs = qs.filter(prediction=result_filter)
@@ -296,24 +369,21 @@ def analytics(request):
     start_date = parse_date(request.GET.get("start", "")) if request.GET.get("start") else None
     end_date = parse_date(request.GET.get("end", "")) if request.GET.get("end") else None
 
+    # Local-day bounds as aware datetimes, so created_at is compared as stored.
     if start_date:
-        qs = qs.filter(created_at__date__gte=start_date)
+        qs = qs.filter(created_at__gte=_start_of_day(start_date))
+        rollups = rollups.filter(day__gte=start_date)
     if end_date:
-        qs = qs.filter(created_at__date__lte=end_date)
-
-    cache_key = f"analytics:{request.user.id}:{result_filter}:{start_date}:{end_date}"
-    stats = cache.get(cache_key)
-    if not stats:
-        stats = qs.aggregate(
-            totals=Count("id"),
-            pass_count=Count("id", filter=Q(prediction="PASS")),
-            fail_count=Count("id", filter=Q(prediction="FAIL")),
-        )
-        cache.set(cache_key, stats, 30)
+        qs = qs.filter(created_at__lt=_start_of_day(end_date + timedelta(days=1)))
+        rollups = rollups.filter(day__lte=end_date)
 
-    totals = stats["totals"]
-    pass_count = stats["pass_count"]
-    fail_count = stats["fail_count"]
+    stats = rollups.aggregate(
+        pass_count=Coalesce(Sum("pass_count"), 0),
+        fail_count=Coalesce(Sum("fail_count"), 0),
+    )
+    pass_count = stats["pass_count"] if result_filter != "FAIL" else 0
+    fail_count = stats["fail_count"] if result_filter != "PASS" else 0
+    totals = pass_count + fail_count
     pass_rate = round((pass_count / totals) * 100, 2) if totals else 0
 
     recent = qs.only(
@@ -334,7 +404,6 @@ def analytics(request):
         request,
         "predictions/analytics.html",
         {
-            "records": qs,
             "totals": totals,
             "pass_count": pass_count,
             "fail_count": fail_count,
@@ -347,21 +416,12 @@ def analytics(request):
 
 @user_passes_test(lambda u: u.is_staff, login_url="predictions:login")
 def dashboard(request):
-    cache_key = "staff_dashboard_stats"
-    stats = cache.get(cache_key)
-    if not stats:
-        stats = StudentPrediction.objects.aggregate(
-            totals=Count("id"),
-            pass_count=Count("id", filter=Q(prediction="PASS")),
-            fail_count=Count("id", filter=Q(prediction="FAIL")),
-        )
-        stats["user_count"] = get_user_model().objects.count()
-        stats["contact_count"] = ContactMessage.objects.count()
-        cache.set(cache_key, stats, 30)
-
-    totals = stats["totals"]
-    pass_count = stats["pass_count"]
-    fail_count = stats["fail_count"]
+    counts = get_counts(
+        [PREDICTIONS, prediction_label("PASS"), prediction_label("FAIL"), USERS, CONTACT_MESSAGES]
+    )
+    totals = counts[PREDICTIONS]
+    pass_count = counts[prediction_label("PASS")]
+    fail_count = counts[prediction_label("FAIL")]
     pass_rate = round((pass_count / totals) * 100, 2) if totals else 0
     recent = StudentPrediction.objects.only(
         "full_name",
@@ -372,8 +432,8 @@ def dashboard(request):
         "prediction",
         "created_at",
     ).order_by("-created_at")[:6]
-    user_count = stats["user_count"]
-    contact_count = stats["contact_count"]
+    user_count = counts[USERS]
+    contact_count = counts[CONTACT_MESSAGES]
 
     return render(
         request,
@@ -431,8 +491,80 @@ def user_management(request):
         "is_superuser",
         "is_active",
         "date_joined",
-    ).order_by("-date_joined")
-    return render(request, "predictions/user_management.html", {"users": users})
+    )
+    return render(
+        request,
+        "predictions/user_management.html",
+        {"users": paginate(request, users, fields=("date_joined", "id")), "total": get_count(USERS)},
+    )
+
+
+@user_passes_test(lambda u: u.is_staff, login_url="predictions:login")
+def export_records(request, kind):
+    fmt = request.GET.get("format", "csv")
+    gzipped = request.GET.get("gzip") == "1"
+    try:
+        queryset = filtered_queryset(
+            kind,
+            result=request.GET.get("result", ""),
+            start=request.GET.get("start"),
+            end=request.GET.get("end"),
+            user=request.GET.get("user"),
+            subject=request.GET.get("subject"),
+        )
+        chunks = render_chunks(kind, queryset, fmt, chunk_size=settings.EXPORT_CHUNK_SIZE)
+    except ExportError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    if gzipped:
+        response = StreamingHttpResponse(gzip_chunks(chunks), content_type="application/gzip")
+    else:
+        response = StreamingHttpResponse(chunks, content_type=f"{FORMATS[fmt]}; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{filename(kind, fmt, gzipped)}"'
+    response["Cache-Control"] = "no-store"
+    return response
+
+
+@user_passes_test(lambda u: u.is_staff, login_url="predictions:login")
+def model_registry(request):
+    registry = get_registry()
+    if request.method == "POST":
+        action = request.POST.get("action")
+        try:
+            if action == "promote":
+                registry.activate(request.POST.get("name", ""))
+                messages.success(request, f"{request.POST.get('name')} is now the active model.")
+            elif action == "rollback":
+                previous = registry.rollback()
+                messages.success(request, f"Rolled back to {previous or settings.MODEL_PATH.name}.")
+        except (OSError, ValueError) as exc:
+            messages.error(request, f"Model change failed: {exc}")
+        return redirect("superadmin_models")
+
+    current = registry.current()
+    return render(
+        request,
+        "predictions/model_registry.html",
+        {
+            "versions": registry.versions(),
+            "current": current,
+            "loaded_at": datetime.fromtimestamp(current.loaded_at, tz=dt_timezone.utc),
+            "history": registry.history(),
+            "registry_dir": registry.directory,
+        },
+    )
+
+
+@user_passes_test(lambda u: u.is_staff, login_url="predictions:login")
+def metrics_view(request):
+    return JsonResponse(
+        {
+            "model_version": get_registry().current().version,
+            "stages": metrics.snapshot(),
+            "prediction_cache": get_prediction_cache().stats(),
+            "batcher": get_batcher().stats.snapshot() if settings.PREDICTION_BATCHING else None,
+        }
+    )
 
 
 @user_passes_test(lambda u: u.is_staff, login_url="predictions:login")
@@ -456,7 +588,22 @@ def exam_management(request):
                 return redirect("superadmin_exams")
 
     subjects = ExamSubject.objects.order_by("name")
-    results = ExamResult.objects.select_related("user", "subject").order_by("-created_at")[:30]
+    results = (
+        ExamResult.objects.select_related("user", "subject")
+        .defer("question_ids", "answers")
+        .order_by("-created_at")[:30]
+    )
+
+    refresh_limit = min(settings.ITEM_ANALYSIS_REFRESH_LIMIT, item_analysis.VIEW_REFRESH_MAX)
+    if refresh_limit > 0:
+        item_analysis.refresh(
+            max_results=refresh_limit, chunk_size=refresh_limit, settle_seconds=settings.ITEM_ANALYSIS_SETTLE_SECONDS
+        )
+    analysis_subject = next(
+        (subject for subject in subjects if str(subject.id) == request.GET.get("analysis_subject")),
+        subjects[0] if subjects else None,
+    )
+    items, analysed = item_analysis.report(analysis_subject.id) if analysis_subject else ([], 0)
 
     return render(
         request,
@@ -466,6 +613,10 @@ def exam_management(request):
             "question_form": question_form,
             "subjects": subjects,
             "results": results,
+            "analysis_subject": analysis_subject,
+            "items": items,
+            "analysed": analysed,
+            "analysis_pending": item_analysis.pending(),
         },
     )
 
@@ -519,7 +670,7 @@ def logout_view(request):
 
 @login_required(login_url="predictions:login")
 def student_dashboard(request):
-    prediction_count = StudentPrediction.objects.filter(user=request.user).count()
+    prediction_count = get_count(user_predictions(request.user.id))
     return render(
         request,
         "predictions/student_dashboard.html",
@@ -529,7 +680,7 @@ def student_dashboard(request):
 
 @login_required(login_url="predictions:login")
 def profile(request):
-    prediction_count = StudentPrediction.objects.filter(user=request.user).count()
+    prediction_count = get_count(user_predictions(request.user.id))
     return render(
         request,
         "predictions/profile.html",
@@ -548,4 +699,8 @@ def student_history(request):
         "prediction",
         "created_at",
     )
-    return render(request, "predictions/history.html", {"records": records})
+    return render(
+        request,
+        "predictions/history.html",
+        {"records": paginate(request, records), "total": get_count(user_predictions(request.user.id))},
+    )
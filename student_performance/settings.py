@@ -22,6 +22,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "predictions.instrumentation.RequestTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -93,13 +94,100 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 MODEL_PATH = BASE_DIR / "best_student_model.pkl"
+# Versioned model artifacts; active.json in this directory selects the one served,
+# otherwise MODEL_PATH is used. Workers re-check the active artifact every
+# MODEL_RELOAD_INTERVAL seconds and swap it in the background.
+MODEL_REGISTRY_DIR = Path(os.getenv("MODEL_REGISTRY_DIR", BASE_DIR / "model_registry"))
+MODEL_RELOAD_INTERVAL = float(os.getenv("MODEL_RELOAD_INTERVAL", "5"))
+# When set, compiled model arrays are stored here per version and memory-mapped,
+# so pre-forked workers share one copy of the pages
+MODEL_ARRAYS_DIR = os.getenv("MODEL_ARRAYS_DIR", "")
 LOAD_MODEL_ON_STARTUP = os.getenv("LOAD_MODEL_ON_STARTUP", "1") == "1"
+COMPILE_MODEL = os.getenv("COMPILE_MODEL", "1") == "1"
+COMPILED_MODEL_MAX_BATCH = int(os.getenv("COMPILED_MODEL_MAX_BATCH", "256"))
+
+# Cross-request micro-batching of predictions (useful with threaded workers)
+PREDICTION_BATCHING = os.getenv("PREDICTION_BATCHING", "0") == "1"
+PREDICTION_BATCH_MAX_SIZE = int(os.getenv("PREDICTION_BATCH_MAX_SIZE", "32"))
+PREDICTION_BATCH_MAX_WAIT_MS = float(os.getenv("PREDICTION_BATCH_MAX_WAIT_MS", "2"))
+PREDICTION_BATCH_TIMEOUT = float(os.getenv("PREDICTION_BATCH_TIMEOUT", "5"))
+
+# Memoized predictions: in-process LRU entries (0 disables) and an optional
+# shared Django cache alias for a second tier across workers
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "1024"))
+PREDICTION_CACHE_ALIAS = os.getenv("PREDICTION_CACHE_ALIAS", "")
+PREDICTION_CACHE_TIMEOUT = int(os.getenv("PREDICTION_CACHE_TIMEOUT", "3600"))
+
+# JSON prediction API: records per request, and per user every 5 minutes
+# both requests and records (keep the record limit above API_MAX_BATCH)
+API_MAX_BATCH = int(os.getenv("API_MAX_BATCH", "500"))
+API_RATE_LIMIT = int(os.getenv("API_RATE_LIMIT", "60"))
+API_RECORD_RATE_LIMIT = int(os.getenv("API_RECORD_RATE_LIMIT", "5000"))
+
+# Rate limiting: "sqlite" shares counters between worker processes through a
+# local file; "cache" uses cache.incr on CACHES[RATE_LIMIT_CACHE_ALIAS].
+# Algorithms: fixed, sliding, token_bucket (sqlite only)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "sqlite")
+RATE_LIMIT_ALGORITHM = os.getenv("RATE_LIMIT_ALGORITHM", "fixed")
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH", str(BASE_DIR / "ratelimit.sqlite3"))
+RATE_LIMIT_CACHE_ALIAS = os.getenv("RATE_LIMIT_CACHE_ALIAS", "default")
+
+# Keyset pagination for the records, history and user lists; ?limit= is
+# clamped to PAGINATION_MAX_PAGE_SIZE
+PAGINATION_PAGE_SIZE = int(os.getenv("PAGINATION_PAGE_SIZE", "50"))
+PAGINATION_MAX_PAGE_SIZE = int(os.getenv("PAGINATION_MAX_PAGE_SIZE", "200"))
+
+# Rows fetched per query by the streaming CSV/NDJSON exports
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+
+# Per-stage latency histograms (served at /superadmin/metrics/); set
+# LOG_REQUEST_TIMINGS=1 to also write one JSON line per request
+INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION_ENABLED", "1") == "1"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "predictions.timing": {
+            "handlers": ["console"],
+            "level": "INFO" if os.getenv("LOG_REQUEST_TIMINGS", "0") == "1" else "WARNING",
+            "propagate": False,
+        },
+    },
+}
 
 # Exam module settings
 EXAM_TIME_LIMIT_MINUTES = int(os.getenv("EXAM_TIME_LIMIT_MINUTES", "15"))
 EXAM_PASS_PERCENTAGE = int(os.getenv("EXAM_PASS_PERCENTAGE", "40"))
 EXAM_NEGATIVE_MARKING = float(os.getenv("EXAM_NEGATIVE_MARKING", "0"))
 
+# Per-subject question sets cached in process, optionally also in a shared
+# Django cache alias; entries are keyed by a version bumped on every change
+EXAM_QUESTION_CACHE_SIZE = int(os.getenv("EXAM_QUESTION_CACHE_SIZE", "64"))
+EXAM_QUESTION_CACHE_ALIAS = os.getenv("EXAM_QUESTION_CACHE_ALIAS", "")
+EXAM_QUESTION_CACHE_TIMEOUT = int(os.getenv("EXAM_QUESTION_CACHE_TIMEOUT", "3600"))
+
+# Exams in progress live in this cache alias, written through to the
+# ExamAttempt table; a per-process cache (LocMem, Dummy) is not used and every
+# read goes to the table. Submissions and autosaves are accepted this many
+# seconds past the deadline to cover network latency
+EXAM_ATTEMPT_CACHE_ALIAS = os.getenv("EXAM_ATTEMPT_CACHE_ALIAS", "default")
+EXAM_DEADLINE_GRACE_SECONDS = int(os.getenv("EXAM_DEADLINE_GRACE_SECONDS", "15"))
+
+# Autosaved answers are written to the table at most this often (and always
+# before grading); without a shared attempt cache every autosave is written
+EXAM_AUTOSAVE_FLUSH_SECONDS = int(os.getenv("EXAM_AUTOSAVE_FLUSH_SECONDS", "10"))
+
+# Item analysis: `manage.py item_analysis`, run from cron, folds attempts into
+# the per-question statistics; exam management only reads them, optionally
+# folding in up to ITEM_ANALYSIS_REFRESH_LIMIT (at most 500) attempts per page
+# view. Also how old an attempt must be before it is counted
+ITEM_ANALYSIS_REFRESH_LIMIT = int(os.getenv("ITEM_ANALYSIS_REFRESH_LIMIT", "0"))
+ITEM_ANALYSIS_SETTLE_SECONDS = int(os.getenv("ITEM_ANALYSIS_SETTLE_SECONDS", "30"))
+
 # Security defaults (enable in production via env flags)
 SECURE_SSL_REDIRECT = os.getenv("SECURE_SSL_REDIRECT", "0") == "1"
 SESSION_COOKIE_SECURE = os.getenv("SESSION_COOKIE_SECURE", "0") == "1"
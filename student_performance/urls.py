@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.urls import include, path
 
+from predictions import health
 from predictions import views as prediction_views
 
 admin.site.site_header = "Student Performance Admin"
@@ -8,9 +9,14 @@ admin.site.site_title = "Student Performance Admin"
 admin.site.index_title = "Administration"
 
 urlpatterns = [
+    path("healthz", health.healthz, name="healthz"),
+    path("readyz", health.readyz, name="readyz"),
     path("superadmin/", prediction_views.dashboard, name="superadmin"),
     path("superadmin/users/", prediction_views.user_management, name="superadmin_users"),
     path("superadmin/exams/", prediction_views.exam_management, name="superadmin_exams"),
+    path("superadmin/models/", prediction_views.model_registry, name="superadmin_models"),
+    path("superadmin/metrics/", prediction_views.metrics_view, name="superadmin_metrics"),
+    path("superadmin/export/<str:kind>/", prediction_views.export_records, name="superadmin_export"),
     path("django-admin/", admin.site.urls),
     path("", include("predictions.urls")),
 ]
@@ -1,7 +1,15 @@
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "student_performance.settings")
 
 application = get_wsgi_application()
+
+if settings.LOAD_MODEL_ON_STARTUP:
+    # Warm-up hook: servers import this module before taking traffic (and a
+    # preloading master before forking), management commands never do.
+    from predictions.services import warm_up
+
+    warm_up()